@@ -59,37 +59,34 @@ def _init_facebook_config_from_env():
             return
         
         # Connect to MySQL
-        mysql_config = config_manager.get_destination_config('mysql_main')
-        loader = MySQLLoader(mysql_config)
-        loader.ensure_connection()
-        
-        cursor = loader.connection.cursor()
-        
-        # Check if facebook_ads source already exists
-        cursor.execute("SELECT COUNT(*) FROM config_sources WHERE source_name = 'facebook_ads'")
-        exists = cursor.fetchone()[0] > 0
-        
-        if not exists:
-            logger.info("Initializing Facebook Ads configuration from environment variables...")
+        mysql_config = config_manager.get_destination('mysql_main').get('config', {})
+        with MySQLLoader(mysql_config) as loader:
+            cursor = loader.connection.cursor()
             
-            # Insert Facebook Ads configuration
-            cursor.execute("""
-                INSERT INTO config_sources (source_name, source_type, config, is_active)
-                VALUES ('facebook_ads', 'facebook_ads', %s, 1)
-            """, (yaml.dump({
-                'app_id': app_id,
-                'app_secret': app_secret,
-                'access_token': access_token,
-                'ad_account_id': ad_account_id
-            }),))
+            # Check if facebook_ads source already exists
+            cursor.execute("SELECT COUNT(*) FROM config_sources WHERE source_name = 'facebook_ads'")
+            exists = cursor.fetchone()[0] > 0
             
-            loader.connection.commit()
-            logger.info("✅ Facebook Ads configuration initialized successfully")
-        else:
-            logger.info("Facebook Ads configuration already exists in database")
-        
-        cursor.close()
-        loader.close()
+            if not exists:
+                logger.info("Initializing Facebook Ads configuration from environment variables...")
+                
+                # Insert Facebook Ads configuration
+                cursor.execute("""
+                    INSERT INTO config_sources (source_name, source_type, config, is_active)
+                    VALUES ('facebook_ads', 'facebook_ads', %s, 1)
+                """, (yaml.dump({
+                    'app_id': app_id,
+                    'app_secret': app_secret,
+                    'access_token': access_token,
+                    'ad_account_id': ad_account_id
+                }),))
+                
+                loader.connection.commit()
+                logger.info("✅ Facebook Ads configuration initialized successfully")
+            else:
+                logger.info("Facebook Ads configuration already exists in database")
+            
+            cursor.close()
         
     except Exception as e:
         logger.warning(f"Could not initialize Facebook configuration from environment: {e}")
@@ -940,6 +937,8 @@ def export_data():
             results = cursor.fetchall()
             
             if not results:
+                cursor.close()
+                loader.disconnect()
                 return jsonify({
                     'success': False,
                     'error': 'No data found with the specified filters'
@@ -991,6 +990,24 @@ def export_data():
         }), 500
 
 
+@app.route('/api/pools', methods=['GET'])
+def get_connection_pools():
+    """Get usage and borrow/return counters of the MySQL connection pools"""
+    try:
+        from src.loaders.connection_pool import pool_status
+        
+        return jsonify({
+            'success': True,
+            'data': pool_status()
+        })
+    except Exception as e:
+        logger.error(f"Error getting connection pools: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @app.route('/api/tables/<table_name>/columns', methods=['GET'])
 def get_table_columns(table_name):
     """Get columns from a specific table"""
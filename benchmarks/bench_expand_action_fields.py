@@ -0,0 +1,111 @@
+"""
+Benchmark for FacebookAdsExtractor._expand_action_fields
+
+Compares the batched (explode + pivot) expansion against the previous
+row-by-row implementation on synthetic insights rows.
+
+Usage:
+    python benchmarks/bench_expand_action_fields.py --rows 100000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.extractors.facebook_ads_extractor import FacebookAdsExtractor
+
+ACTION_TYPES = [
+    'lead', 'landing_page_view', 'link_click', 'post_engagement', 'page_engagement',
+    'purchase', 'add_to_cart', 'initiate_checkout', 'complete_registration', 'video_view',
+    'offsite_conversion.fb_pixel_lead', 'onsite_conversion.messaging_first_reply',
+]
+
+
+def make_insights(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic insights DataFrame with JSON encoded action lists"""
+    rng = random.Random(seed)
+    data = []
+    for i in range(rows):
+        actions = [
+            {'action_type': action_type, 'value': str(rng.randint(1, 500))}
+            for action_type in rng.sample(ACTION_TYPES, rng.randint(0, 8))
+        ]
+        costs = [
+            {'action_type': action['action_type'], 'value': f"{rng.uniform(0.1, 20):.2f}"}
+            for action in actions
+        ]
+        videos = [{'action_type': 'video_view', 'value': str(rng.randint(0, 900))}] if rng.random() < 0.5 else []
+        data.append({
+            'date_start': '2025-01-01',
+            'campaign_id': str(1000 + i % 250),
+            'impressions': str(rng.randint(100, 100000)),
+            'actions': json.dumps(actions),
+            'cost_per_action_type': json.dumps(costs),
+            'video_play_actions': json.dumps(videos),
+        })
+    return pd.DataFrame(data)
+
+
+def legacy_expand_action_fields(df: pd.DataFrame) -> pd.DataFrame:
+    """Row-by-row implementation used before the batched expansion"""
+    fields_to_expand = {
+        'actions': 'action',
+        'cost_per_action_type': 'cost_per',
+        'video_play_actions': 'video',
+    }
+    for field_name, prefix in fields_to_expand.items():
+        if field_name not in df.columns:
+            continue
+        for idx, row_value in df[field_name].items():
+            if pd.isna(row_value) or not row_value:
+                continue
+            actions_list = json.loads(row_value) if isinstance(row_value, str) else row_value
+            for action in actions_list:
+                col_name = f"{prefix}_{action.get('action_type', '')}"
+                if col_name not in df.columns:
+                    df[col_name] = None
+                df.at[idx, col_name] = action.get('value', 0)
+    return df
+
+
+def timed(func, df: pd.DataFrame):
+    """Run func on a copy of df and return (result, seconds)"""
+    df = df.copy()
+    started = time.perf_counter()
+    result = func(df)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark action field expansion")
+    parser.add_argument('--rows', type=int, default=100000, help='Synthetic insights rows')
+    parser.add_argument('--skip-legacy', action='store_true', help='Only time the batched expansion')
+    args = parser.parse_args()
+
+    df = make_insights(args.rows)
+    extractor = FacebookAdsExtractor.__new__(FacebookAdsExtractor)
+
+    batched, batched_seconds = timed(extractor._expand_action_fields, df)
+    print(f"rows={args.rows} batched:  {batched_seconds:8.2f}s  ({batched.shape[1]} columns)")
+
+    if not args.skip_legacy:
+        legacy, legacy_seconds = timed(legacy_expand_action_fields, df)
+        print(f"rows={args.rows} legacy:   {legacy_seconds:8.2f}s  ({legacy.shape[1]} columns)")
+        print(f"speedup: {legacy_seconds / batched_seconds:.1f}x")
+
+        expanded = [col for col in legacy.columns if col not in df.columns]
+        same = (
+            sorted(expanded) == sorted(col for col in batched.columns if col not in df.columns) and
+            legacy[expanded].fillna(0).astype(str).equals(batched[expanded].fillna(0).astype(str))
+        )
+        print(f"results match: {same}")
+
+
+if __name__ == "__main__":
+    main()
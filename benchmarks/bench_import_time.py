@@ -0,0 +1,95 @@
+"""
+Import-time budget check for the CLI and web API entry points
+
+Imports each entry module in a fresh interpreter with `python -X importtime`,
+reports its cumulative import time and fails when it exceeds its budget or
+pulls in a heavy dependency that should only load on first extractor/loader
+use (pandas, numpy, the Facebook SDK, the MySQL driver, APScheduler).
+
+Usage:
+    python benchmarks/bench_import_time.py             # exit code 1 on regression
+    python benchmarks/bench_import_time.py --repeat 5 --scale 2
+"""
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Entry module -> cumulative import time budget (ms)
+BUDGETS_MS = {
+    'main': 200,
+    'src.orchestrator': 200,
+    'api': 500,
+}
+
+# Top-level packages that must not be imported by just importing an entry module
+LAZY_MODULES = ('pandas', 'numpy', 'facebook_business', 'mysql', 'apscheduler')
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+
+
+def measure(module: str):
+    """
+    Import a module in a fresh interpreter
+
+    Returns:
+        Tuple of (cumulative import time in ms, names of every imported module)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    cumulative_us = None
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name)
+        if name == module and not indent:
+            cumulative_us = int(cumulative)
+    return (cumulative_us or 0) / 1000, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--repeat', type=int, default=3, help='Imports per module (the fastest counts)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier for every budget (slow machines)')
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS_MS))
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'module':<20} {'import ms':>10} {'budget ms':>10}  heavy modules imported")
+    for module in args.modules:
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        elapsed_ms = min(ms for ms, _ in runs)
+        imported = runs[0][1]
+        heavy = sorted(
+            name for name in LAZY_MODULES
+            if any(imported_name == name or imported_name.startswith(name + '.') for imported_name in imported)
+        )
+        budget_ms = BUDGETS_MS.get(module, max(BUDGETS_MS.values())) * args.scale
+
+        print(f"{module:<20} {elapsed_ms:>10.1f} {budget_ms:>10.0f}  {', '.join(heavy) or '-'}")
+        if elapsed_ms > budget_ms:
+            failures.append(f"{module} took {elapsed_ms:.0f} ms to import (budget {budget_ms:.0f} ms)")
+        if heavy:
+            failures.append(f"{module} imports {', '.join(heavy)} eagerly")
+
+    if failures:
+        print('\nImport-time regressions:')
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print('\nAll entry points within budget')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark for building the insights DataFrame from raw API rows
+
+Compares the single-pass ColumnarAccumulator against the previous
+three-step build (cleaned dicts -> normalized dicts -> DataFrame). Each
+implementation runs in its own subprocess so peak RSS is measured cleanly.
+
+Usage:
+    python benchmarks/bench_insights_frame_builder.py --rows 500000
+"""
+import argparse
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.extractors.facebook_ads_extractor import ColumnarAccumulator
+
+ACTION_TYPES = ['lead', 'link_click', 'landing_page_view', 'post_engagement', 'purchase', 'video_view']
+
+
+def make_payload(rows: int, seed: int = 42) -> list:
+    """Build synthetic ad-level insights rows as returned by the Graph API"""
+    rng = random.Random(seed)
+    payload = []
+    for i in range(rows):
+        record = {
+            'date_start': '2025-01-01',
+            'date_stop': '2025-01-01',
+            'campaign_id': str(1000 + i % 50),
+            'adset_id': str(5000 + i % 400),
+            'ad_id': str(90000 + i),
+            'ad_name': f"Ad {i}",
+            'impressions': str(rng.randint(100, 100000)),
+            'clicks': str(rng.randint(0, 5000)),
+            'spend': f"{rng.uniform(0, 900):.2f}",
+            'reach': str(rng.randint(50, 90000)),
+            'actions': [
+                {'action_type': action_type, 'value': str(rng.randint(1, 300))}
+                for action_type in rng.sample(ACTION_TYPES, rng.randint(0, 4))
+            ],
+        }
+        # Some keys only show up on later rows
+        if i % 7 == 0:
+            record['inline_link_clicks'] = str(rng.randint(0, 900))
+        payload.append(record)
+    return payload
+
+
+def legacy_build(insights_list: list) -> pd.DataFrame:
+    """Three-step build used before the columnar accumulator"""
+    data = []
+    all_keys = set()
+    for insight in insights_list:
+        cleaned_dict = {}
+        for key, value in dict(insight).items():
+            if value is None or key is None or str(key).lower() == 'nan':
+                continue
+            cleaned_dict[key] = value
+        if cleaned_dict:
+            data.append(cleaned_dict)
+            all_keys.update(cleaned_dict.keys())
+
+    normalized_data = []
+    for record in data:
+        normalized_record = {}
+        for key in all_keys:
+            normalized_record[key] = record.get(key, None)
+        normalized_data.append(normalized_record)
+
+    return pd.DataFrame(normalized_data)
+
+
+def columnar_build(insights_list: list) -> pd.DataFrame:
+    """Single-pass build through ColumnarAccumulator"""
+    columns = ColumnarAccumulator()
+    for insight in insights_list:
+        columns.append(insight if isinstance(insight, dict) else dict(insight))
+    return columns.to_dataframe()
+
+
+def current_rss_mb() -> float:
+    """Current resident set size in MB (Linux)"""
+    with open('/proc/self/statm') as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 1024 / 1024
+
+
+def run_single(implementation: str, rows: int):
+    """Run one implementation and print its timing and memory"""
+    payload = make_payload(rows)
+    rss_before = current_rss_mb()
+
+    build = legacy_build if implementation == 'legacy' else columnar_build
+    started = time.perf_counter()
+    df = build(payload)
+    seconds = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{implementation:9s} rows={len(df)} cols={df.shape[1]} "
+        f"time={seconds:6.2f}s peak_rss={peak_mb:7.1f}MB "
+        f"build_overhead={peak_mb - rss_before:7.1f}MB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark insights DataFrame building")
+    parser.add_argument('--rows', type=int, default=500000, help='Synthetic insights rows')
+    parser.add_argument('--impl', choices=['legacy', 'columnar'], help='Run a single implementation')
+    args = parser.parse_args()
+
+    if args.impl:
+        run_single(args.impl, args.rows)
+        return
+
+    for implementation in ('legacy', 'columnar'):
+        subprocess.run(
+            [sys.executable, __file__, '--rows', str(args.rows), '--impl', implementation],
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark for the MySQLLoader load paths
+
+Loads the same synthetic insights frame with each path and reports rows/s:
+  insert      load_dataframe / upsert_dataframe with executemany
+  load_data   LOAD DATA LOCAL INFILE straight into the table (append)
+  staging     LOAD DATA LOCAL INFILE into a staging table merged with
+              INSERT ... SELECT ... ON DUPLICATE KEY UPDATE (upsert)
+
+Each upsert runs twice (first insert, then update of every row). The server
+must allow local_infile (SET GLOBAL local_infile = 1). Connection settings
+come from the MYSQL_* environment variables; tables are named bench_load_*.
+With --file-only only the TSV writing is timed and no database is needed.
+
+Usage:
+    MYSQL_HOST=127.0.0.1 MYSQL_USER=root MYSQL_PASSWORD=... MYSQL_DATABASE=bench \\
+        python benchmarks/bench_mysql_load.py --rows 1000000
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.loaders.mysql_loader import MySQLLoader
+
+ACTION_TYPES = ['lead', 'link_click', 'landing_page_view', 'post_engagement', 'purchase', 'video_view']
+KEY_COLUMNS = ['date_start', 'ad_id']
+
+
+def make_frame(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Synthetic ad-level daily insights with sparse action columns and some NULLs"""
+    rng = np.random.default_rng(seed)
+    ads = max(1, rows // 30)
+    days = pd.date_range('2025-01-01', periods=-(-rows // ads)).strftime('%Y-%m-%d')
+
+    frame = pd.DataFrame({
+        'date_start': np.repeat(days, ads)[:rows],
+        'ad_id': np.tile(np.arange(90000, 90000 + ads).astype(str), len(days))[:rows],
+    })
+    frame['ad_name'] = 'Ad\t' + frame['ad_id']
+    frame['impressions'] = rng.integers(100, 100000, rows)
+    frame['clicks'] = rng.integers(0, 5000, rows)
+    frame['spend'] = rng.uniform(0, 900, rows).round(2)
+    frame['reach'] = pd.array(rng.integers(50, 90000, rows), dtype='Int64')
+    frame.loc[frame.index % 11 == 0, 'reach'] = pd.NA
+    for action_type in ACTION_TYPES:
+        values = rng.integers(1, 300, rows).astype(float)
+        values[rng.random(rows) < 0.6] = np.nan
+        frame[f"action_{action_type}"] = values
+    return frame
+
+
+def mysql_config(load_method: str) -> dict:
+    """Destination config from the MYSQL_* environment variables"""
+    return {
+        'host': os.environ.get('MYSQL_HOST', '127.0.0.1'),
+        'port': int(os.environ.get('MYSQL_PORT', 3306)),
+        'user': os.environ.get('MYSQL_USER', 'root'),
+        'password': os.environ.get('MYSQL_PASSWORD', ''),
+        'database': os.environ.get('MYSQL_DATABASE', 'facebook_ads_bench'),
+        'load_method': load_method,
+    }
+
+
+def report(label: str, rows: int, seconds: float):
+    print(f"{label:22s} rows={rows:>9,} time={seconds:7.2f}s {rows / seconds:>12,.0f} rows/s")
+
+
+def run_file_only(df: pd.DataFrame):
+    """Time TSV writing against building the executemany tuples"""
+    loader = MySQLLoader({'load_method': 'load_data'})
+    cleaned = loader._clean_dataframe(df)
+
+    started = time.perf_counter()
+    data = [tuple(row) for row in cleaned.values]
+    report('tuples (insert)', len(data), time.perf_counter() - started)
+
+    started = time.perf_counter()
+    path = loader._write_load_file(df)
+    seconds = time.perf_counter() - started
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    os.remove(path)
+    report(f"tsv file ({size_mb:.0f} MB)", len(df), seconds)
+
+
+def run_loads(df: pd.DataFrame):
+    """Load the frame with every path and check the row counts match"""
+    paths = [
+        ('insert append', 'insert', 'bench_load_insert', None),
+        ('load_data append', 'load_data', 'bench_load_infile', None),
+        ('insert upsert', 'insert', 'bench_upsert_insert', KEY_COLUMNS),
+        ('staging upsert', 'load_data', 'bench_upsert_staging', KEY_COLUMNS),
+    ]
+    counts = {}
+    for label, load_method, table_name, key_columns in paths:
+        with MySQLLoader(mysql_config(load_method)) as loader:
+            cursor = loader.connection.cursor()
+            cursor.execute(f"DROP TABLE IF EXISTS `{table_name}`")
+            cursor.close()
+            runs = 1 if key_columns is None else 2
+            for run in range(runs):
+                started = time.perf_counter()
+                if key_columns is None:
+                    loader.load_dataframe(df, table_name)
+                else:
+                    loader.upsert_dataframe(df, table_name, key_columns)
+                suffix = '' if runs == 1 else (' (insert)', ' (update)')[run]
+                report(label + suffix, len(df), time.perf_counter() - started)
+            counts[label] = loader.execute_query(f"SELECT COUNT(*) AS n FROM `{table_name}`")[0]['n']
+
+    print(f"\nRow counts: {counts}")
+    if len(set(counts.values())) != 1:
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark MySQLLoader load paths")
+    parser.add_argument('--rows', type=int, default=200000, help='Synthetic insights rows')
+    parser.add_argument('--file-only', action='store_true', help='Only time writing the LOAD DATA file')
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    df = make_frame(args.rows)
+    print(f"Frame: {df.shape[0]:,} rows x {df.shape[1]} columns\n")
+
+    if args.file_only:
+        run_file_only(df)
+    else:
+        run_loads(df)
+
+
+if __name__ == "__main__":
+    main()
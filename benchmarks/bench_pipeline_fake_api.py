@@ -0,0 +1,154 @@
+"""
+Load test of the full pipeline against the fake Graph API
+
+Starts benchmarks/fake_graph_api.py in-process, writes a temporary config
+whose source points at it (graph_url) and runs Orchestrator.run_all into the
+MySQL database given by the MYSQL_* environment variables. Nothing is sent
+to Facebook.
+
+Usage:
+    MYSQL_HOST=127.0.0.1 MYSQL_USER=root MYSQL_PASSWORD=... MYSQL_DATABASE=bench \\
+        python benchmarks/bench_pipeline_fake_api.py --campaigns 200 --days 90 --level ad
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fake_graph_api import FakeGraphAPI
+from src.core import ConfigManager
+from src.orchestrator import Orchestrator
+
+INSIGHTS_FIELDS = [
+    'impressions', 'reach', 'frequency', 'clicks', 'inline_link_clicks', 'spend',
+    'ctr', 'cpc', 'cpm', 'actions', 'cost_per_action_type', 'video_play_actions',
+]
+
+
+def build_config(args, graph_url: str, workdir: str) -> dict:
+    """Pipeline config for one fake account (or every fake account with --accounts > 1)"""
+    until = date.today() - timedelta(days=1)
+    since = until - timedelta(days=args.days - 1)
+
+    source_config = {
+        'graph_url': graph_url,
+        'access_token': 'fake-token',
+        'app_id': 'fake-app',
+        'app_secret': 'fake-secret',
+    }
+    if args.accounts > 1:
+        source_config['business_id'] = '1'
+    else:
+        source_config['ad_account_id'] = 'act_10000000'
+
+    return {
+        'logging': {'level': args.log_level, 'file': os.path.join(workdir, 'elt.log')},
+        'destinations': [{
+            'name': 'mysql_bench',
+            'type': 'mysql',
+            'enabled': True,
+            'config': {
+                'host': os.environ.get('MYSQL_HOST', '127.0.0.1'),
+                'port': int(os.environ.get('MYSQL_PORT', 3306)),
+                'user': os.environ.get('MYSQL_USER', 'root'),
+                'password': os.environ.get('MYSQL_PASSWORD', ''),
+                'database': os.environ.get('MYSQL_DATABASE', 'facebook_ads_bench'),
+            },
+        }],
+        'sources': [{
+            'name': 'fake_facebook_ads',
+            'type': 'facebook_ads',
+            'enabled': True,
+            'destination': 'mysql_bench',
+            'config': source_config,
+            'sync': {
+                'state_file': os.path.join(workdir, 'sync_state.json'),
+                'account_workers': args.account_workers,
+                'tables': [
+                    {'name': 'campaigns', 'fields': ['id', 'name', 'status', 'objective', 'created_time', 'updated_time']},
+                    {'name': 'adsets', 'fields': ['id', 'name', 'status', 'campaign_id', 'daily_budget', 'lifetime_budget']},
+                    {'name': 'ads', 'fields': ['id', 'name', 'status', 'adset_id']},
+                    {
+                        'name': 'insights',
+                        'level': args.level,
+                        'start_date': since.isoformat(),
+                        'end_date': until.isoformat(),
+                        'time_increment': 'daily',
+                        'fields': INSIGHTS_FIELDS,
+                        'window_size': args.window_size,
+                        'max_workers': args.max_workers,
+                        'async_mode': args.async_mode,
+                        'async_poll_interval': 1,
+                    },
+                ],
+            },
+        }],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--accounts', type=int, default=1)
+    parser.add_argument('--campaigns', type=int, default=50)
+    parser.add_argument('--adsets-per-campaign', type=int, default=5)
+    parser.add_argument('--ads-per-adset', type=int, default=4)
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--level', default='ad', choices=['account', 'campaign', 'adset', 'ad'])
+    parser.add_argument('--window-size', type=int, default=7)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--account-workers', type=int, default=4)
+    parser.add_argument('--async-mode', default='never', choices=['auto', 'always', 'never'])
+    parser.add_argument('--latency-ms', type=int, default=50)
+    parser.add_argument('--report-run-seconds', type=float, default=3.0)
+    parser.add_argument('--calls-per-minute', type=int, default=0)
+    parser.add_argument('--throttle-error-rate', type=float, default=0.0)
+    parser.add_argument('--transient-error-rate', type=float, default=0.0)
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    fake_api = FakeGraphAPI(
+        accounts=args.accounts,
+        campaigns=args.campaigns,
+        adsets_per_campaign=args.adsets_per_campaign,
+        ads_per_adset=args.ads_per_adset,
+        latency_ms=args.latency_ms,
+        report_run_seconds=args.report_run_seconds,
+        calls_per_minute=args.calls_per_minute,
+        throttle_error_rate=args.throttle_error_rate,
+        transient_error_rate=args.transient_error_rate,
+    )
+
+    with fake_api, tempfile.TemporaryDirectory() as workdir:
+        config_path = os.path.join(workdir, 'config.yaml')
+        with open(config_path, 'w') as f:
+            yaml.safe_dump(build_config(args, fake_api.url, workdir), f)
+
+        logging.basicConfig(level=args.log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        print(f"Fake Graph API at {fake_api.url}: {args.accounts} account(s), {args.campaigns} campaigns, "
+              f"{args.campaigns * args.adsets_per_campaign * args.ads_per_adset} ads per account, "
+              f"{args.days} days at {args.level} level")
+
+        started = time.perf_counter()
+        results = Orchestrator(ConfigManager(config_path)).run_all()
+        elapsed = time.perf_counter() - started
+
+    rows = sum(result.get('rows', 0) for result in results)
+    failed = [result for result in results if not result.get('success')]
+    print(f"\nLoaded {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Fake API: {fake_api.stats['requests']:,} requests, {fake_api.stats['rows']:,} rows served, "
+          f"{fake_api.stats['throttled']} throttled, {fake_api.stats['errors']} errors")
+    for result in failed:
+        print(f"FAILED {result['source']} -> {result['destination']}: {result.get('error')}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
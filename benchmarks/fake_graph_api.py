@@ -0,0 +1,692 @@
+"""
+Fake Graph API
+Local stand-in for the Facebook Graph API used to load-test the pipeline offline
+
+Serves synthetic ad accounts, campaigns, adsets, ads and insights with cursor
+paging, async report runs (AdReportRun), usage headers, throttling and
+transient errors, "reduce the amount of data" errors and configurable
+latency. Every value is derived from the object IDs and the seed, so the same
+request always returns the same rows (timestamps are relative to server start).
+
+Point an extractor at it with the source's `graph_url` config:
+
+    sources:
+    - config:
+        graph_url: http://127.0.0.1:8765
+        access_token: fake
+        ad_account_id: act_10000000
+
+Usage:
+    python benchmarks/fake_graph_api.py --port 8765 --campaigns 50 --latency-ms 80
+"""
+import argparse
+import base64
+import gzip
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Default server settings, overridable with FakeGraphAPI(**options) or the CLI
+FAKE_API_DEFAULTS = {
+    # Synthetic volumes
+    'accounts': 1,                   # Ad accounts listed under any business ID
+    'campaigns': 20,                 # Campaigns per ad account
+    'adsets_per_campaign': 5,        # Ad sets per campaign
+    'ads_per_adset': 4,              # Ads per ad set
+    'deleted_pct': 10,               # Objects archived or deleted (hidden unless requested)
+    'seed': 42,                      # Seed of every synthetic value
+    # Latency
+    'latency_ms': 50,                # Base latency of every response
+    'latency_per_1000_rows_ms': 20,  # Extra latency per 1000 rows in a response
+    # Async report runs
+    'report_run_seconds': 3.0,       # Seconds a report run takes to complete
+    # Limits and errors
+    'calls_per_minute': 600,         # Calls per account and minute before throttling (0 = unlimited)
+    'regain_access_minutes': 0,      # estimated_time_to_regain_access reported while throttled
+    'throttle_error_rate': 0.0,      # Share of calls failing with a throttling error (code 17)
+    'transient_error_rate': 0.0,     # Share of calls failing with a transient error (code 2, HTTP 500)
+    'max_rows_per_request': 50000,   # Sync insights requests above this fail with "reduce the amount of data"
+    'max_page_size': 5000,           # Largest `limit` honoured per page
+}
+
+ACCOUNT_ID_BASE = 10000000
+
+# Values returned for each breakdown (unknown breakdowns return 'unknown')
+BREAKDOWN_VALUES = {
+    'age': ['18-24', '25-34', '35-44', '45-54', '55-64', '65+'],
+    'gender': ['female', 'male', 'unknown'],
+    'country': ['US', 'MX', 'ES', 'AR', 'CO'],
+    'region': ['California', 'Texas', 'Madrid', 'Jalisco'],
+    'publisher_platform': ['facebook', 'instagram', 'audience_network', 'messenger'],
+    'platform_position': ['feed', 'story', 'reels', 'right_hand_column'],
+    'device_platform': ['mobile_app', 'mobile_web', 'desktop'],
+    'impression_device': ['android_smartphone', 'iphone', 'desktop', 'ipad'],
+}
+
+ACTION_TYPES = [
+    'link_click', 'landing_page_view', 'post_engagement', 'page_engagement',
+    'lead', 'purchase', 'add_to_cart', 'video_view',
+]
+
+OBJECTIVES = ['OUTCOME_TRAFFIC', 'OUTCOME_LEADS', 'OUTCOME_SALES', 'OUTCOME_AWARENESS']
+LIVE_STATUSES = ['ACTIVE', 'PAUSED']
+HIDDEN_STATUSES = ['ARCHIVED', 'DELETED']
+
+# Object ID prefixes keep campaigns, adsets, ads and report runs apart
+ID_PREFIX = {'campaign': 1, 'adset': 2, 'ad': 3, 'report_run': 9}
+
+VERSION_PREFIX = re.compile(r'^/v\d+\.\d+')
+
+
+class GraphError(Exception):
+    """Error response in the Graph API format"""
+
+    def __init__(self, code: int, message: str, status: int = 400, transient: bool = False, headers=None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.status = status
+        self.transient = transient
+        self.headers = headers or {}
+
+    def body(self) -> Dict[str, Any]:
+        return {'error': {
+            'message': self.message,
+            'type': 'OAuthException',
+            'code': self.code,
+            'is_transient': self.transient,
+            'fbtrace_id': 'FakeGraphApi',
+        }}
+
+
+def _stable_random(*parts: Any) -> random.Random:
+    """Random generator seeded from the given parts (stable across processes)"""
+    return random.Random(zlib.crc32('|'.join(str(part) for part in parts).encode('utf-8')))
+
+
+def _encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(str(offset).encode('ascii')).decode('ascii')
+
+
+def _decode_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii'))
+    except ValueError:
+        raise GraphError(100, f"Invalid cursor: {cursor}")
+
+
+def _object_id(kind: str, account_index: int, index: int) -> str:
+    return str(ID_PREFIX[kind] * 10 ** 15 + account_index * 10 ** 9 + index)
+
+
+def _timestamp(dt: datetime) -> str:
+    return dt.strftime('%Y-%m-%dT%H:%M:%S+0000')
+
+
+class FakeAccount:
+    """Synthetic object tree of one ad account"""
+
+    def __init__(self, account_index: int, options: Dict[str, Any]):
+        self.index = account_index
+        self.id = str(ACCOUNT_ID_BASE + account_index)
+        self.options = options
+        self._objects: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def objects(self, kind: str) -> List[Dict[str, Any]]:
+        """Campaigns, adsets or ads of the account, built on first use"""
+        with self._lock:
+            if not self._objects:
+                self._build()
+            return self._objects[kind]
+
+    def _build(self):
+        options = self.options
+        seed = options['seed']
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        campaigns, adsets, ads = [], [], []
+
+        def make(kind: str, index: int, parent: Dict[str, Any] = None) -> Dict[str, Any]:
+            rng = _stable_random(seed, kind, self.index, index)
+            created = now - timedelta(days=rng.randint(30, 720), seconds=rng.randint(0, 86400))
+            updated = min(now, created + timedelta(days=rng.randint(0, 400), seconds=rng.randint(0, 86400)))
+            hidden = rng.uniform(0, 100) < options['deleted_pct']
+            status = rng.choice(HIDDEN_STATUSES if hidden else LIVE_STATUSES)
+            if parent and parent['status'] in HIDDEN_STATUSES:
+                # Children of archived or deleted objects are hidden with them
+                status = parent['status']
+            record = {
+                'id': _object_id(kind, self.index, index),
+                'account_id': self.id,
+                'name': f"{kind.capitalize()} {index}",
+                'status': status,
+                'configured_status': status,
+                'effective_status': status,
+                'created_time': _timestamp(created),
+                'updated_time': _timestamp(updated),
+                '_updated_epoch': int(updated.timestamp()),
+            }
+            if kind == 'campaign':
+                record['objective'] = rng.choice(OBJECTIVES)
+                record['buying_type'] = 'AUCTION'
+            else:
+                record['campaign_id'] = parent['campaign_id'] if kind == 'ad' else parent['id']
+                record['campaign_name'] = parent.get('campaign_name', parent['name'])
+            if kind == 'adset':
+                record['daily_budget'] = str(rng.randint(10, 500) * 100)
+                record['lifetime_budget'] = '0'
+                record['optimization_goal'] = 'LINK_CLICKS'
+                record['billing_event'] = 'IMPRESSIONS'
+            if kind == 'ad':
+                record['adset_id'] = parent['id']
+                record['adset_name'] = parent['name']
+            return record
+
+        for c in range(options['campaigns']):
+            campaign = make('campaign', c)
+            campaigns.append(campaign)
+            for s in range(options['adsets_per_campaign']):
+                adset = make('adset', c * options['adsets_per_campaign'] + s, campaign)
+                adsets.append(adset)
+                for a in range(options['ads_per_adset']):
+                    index = (c * options['adsets_per_campaign'] + s) * options['ads_per_adset'] + a
+                    ads.append(make('ad', index, adset))
+
+        self._objects = {'campaign': campaigns, 'adset': adsets, 'ad': ads}
+
+
+class InsightsQuery:
+    """
+    Rows of an insights request, generated on demand
+
+    Rows are ordered by day, entity and breakdown values; any row can be
+    built from its position, so pages are generated without materializing
+    the whole result.
+    """
+
+    def __init__(self, account: FakeAccount, fields: List[str], params: Dict[str, Any], seed: int):
+        self.account = account
+        self.fields = fields
+        self.seed = seed
+        self.level = params.get('level') or 'account'
+        if self.level not in ('account', 'campaign', 'adset', 'ad'):
+            raise GraphError(100, "(#100) level must be one of account, campaign, adset, ad")
+
+        time_range = params.get('time_range') or {}
+        try:
+            self.since = date.fromisoformat(time_range['since'])
+            self.until = date.fromisoformat(time_range['until'])
+        except (KeyError, TypeError, ValueError):
+            until = date.today() - timedelta(days=1)
+            self.since, self.until = until - timedelta(days=29), until
+        if self.until < self.since:
+            raise GraphError(100, "(#100) time_range.until must be on or after time_range.since")
+
+        self.periods = self._periods(params.get('time_increment', 'all_days'))
+        self.entities = self._entities(params.get('filtering') or [])
+
+        breakdowns = params.get('breakdowns') or []
+        if isinstance(breakdowns, str):
+            breakdowns = [name for name in breakdowns.split(',') if name]
+        self.breakdowns = breakdowns
+        self.combinations = list(itertools.product(
+            *(BREAKDOWN_VALUES.get(name, ['unknown']) for name in breakdowns)
+        )) or [()]
+
+    def _periods(self, time_increment: Any) -> List[Tuple[date, date]]:
+        if str(time_increment) == 'all_days':
+            return [(self.since, self.until)]
+        if str(time_increment) == 'monthly':
+            periods, start = [], self.since
+            while start <= self.until:
+                next_month = (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+                end = min(self.until, next_month - timedelta(days=1))
+                periods.append((start, end))
+                start = end + timedelta(days=1)
+            return periods
+        try:
+            step = max(1, int(time_increment))
+        except (TypeError, ValueError):
+            raise GraphError(100, f"(#100) Invalid time_increment: {time_increment}")
+        periods, start = [], self.since
+        while start <= self.until:
+            end = min(self.until, start + timedelta(days=step - 1))
+            periods.append((start, end))
+            start = end + timedelta(days=1)
+        return periods
+
+    def _entities(self, filtering: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        if self.level == 'account':
+            return [None]
+        entities = [
+            record for record in self.account.objects(self.level)
+            if record['status'] in LIVE_STATUSES
+        ]
+        for condition in filtering:
+            field = str(condition.get('field', '')).replace('.', '_')
+            values = condition.get('value')
+            if condition.get('operator') == 'IN' and field in ('campaign_id', 'adset_id', 'ad_id'):
+                wanted = {str(value) for value in values or []}
+                key = 'id' if field == f"{self.level}_id" else field
+                entities = [record for record in entities if str(record.get(key)) in wanted]
+        return entities
+
+    def __len__(self) -> int:
+        return len(self.periods) * len(self.entities) * len(self.combinations)
+
+    def rows(self, offset: int, limit: int) -> List[Dict[str, Any]]:
+        """Build the rows at positions offset..offset+limit"""
+        per_period = len(self.entities) * len(self.combinations)
+        rows = []
+        for position in range(offset, min(offset + limit, len(self))):
+            period, rest = divmod(position, per_period)
+            entity, combination = divmod(rest, len(self.combinations))
+            rows.append(self._row(
+                self.periods[period], self.entities[entity], self.combinations[combination]
+            ))
+        return rows
+
+    def _row(self, period: Tuple[date, date], entity: Optional[Dict[str, Any]], values: tuple) -> Dict[str, Any]:
+        since, until = period
+        entity_id = entity['id'] if entity else self.account.id
+        rng = _stable_random(self.seed, 'insights', entity_id, since, until, *values)
+        days = (until - since).days + 1
+
+        impressions = rng.randint(200, 20000) * days
+        reach = max(1, int(impressions / rng.uniform(1.1, 2.5)))
+        clicks = int(impressions * rng.uniform(0.002, 0.04))
+        link_clicks = int(clicks * rng.uniform(0.4, 0.9))
+        spend = round(impressions / 1000 * rng.uniform(2.0, 15.0), 2)
+        actions = {
+            action_type: rng.randint(1, max(1, link_clicks))
+            for action_type in rng.sample(ACTION_TYPES, rng.randint(1, 5))
+        }
+
+        metrics = {
+            'date_start': since.isoformat(),
+            'date_stop': until.isoformat(),
+            'account_id': self.account.id,
+            'account_name': f"Account {self.account.index}",
+            'impressions': str(impressions),
+            'reach': str(reach),
+            'frequency': f"{impressions / reach:.6f}",
+            'clicks': str(clicks),
+            'unique_clicks': str(int(clicks * 0.9)),
+            'inline_link_clicks': str(link_clicks),
+            'spend': f"{spend:.2f}",
+            'ctr': f"{clicks / impressions * 100:.6f}",
+            'cpc': f"{spend / clicks:.6f}" if clicks else None,
+            'cpm': f"{spend / impressions * 1000:.6f}",
+            'cost_per_inline_link_click': f"{spend / link_clicks:.6f}" if link_clicks else None,
+            'actions': [
+                {'action_type': action_type, 'value': str(count)}
+                for action_type, count in actions.items()
+            ],
+            'cost_per_action_type': [
+                {'action_type': action_type, 'value': f"{spend / count:.6f}"}
+                for action_type, count in actions.items()
+            ],
+            'video_play_actions': [
+                {'action_type': 'video_view', 'value': str(actions.get('video_view', 0))}
+            ],
+        }
+        if entity:
+            for key in ('campaign_id', 'campaign_name', 'adset_id', 'adset_name'):
+                if key in entity:
+                    metrics[key] = entity[key]
+            metrics[f"{self.level}_id"] = entity['id']
+            metrics[f"{self.level}_name"] = entity['name']
+
+        row = {field: metrics[field] for field in self.fields if metrics.get(field) is not None}
+        row.update(zip(self.breakdowns, values))
+        row.setdefault('date_start', metrics['date_start'])
+        row.setdefault('date_stop', metrics['date_stop'])
+        return row
+
+
+class FakeGraphAPI:
+    """
+    Fake Graph API server running in a background thread
+
+    Example:
+        with FakeGraphAPI(campaigns=100, latency_ms=20) as api:
+            config['graph_url'] = api.url
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, **options):
+        """
+        Initialize server
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 = any free port)
+            **options: Settings from FAKE_API_DEFAULTS
+        """
+        unknown = set(options) - set(FAKE_API_DEFAULTS)
+        if unknown:
+            raise ValueError(f"Unknown fake API options: {', '.join(sorted(unknown))}")
+        self.options = {**FAKE_API_DEFAULTS, **options}
+        self.accounts = [FakeAccount(index, self.options) for index in range(self.options['accounts'])]
+        self.report_runs: Dict[str, Dict[str, Any]] = {}
+        self.stats = {'requests': 0, 'rows': 0, 'throttled': 0, 'errors': 0}
+        self._calls: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(self.options['seed'])
+        self._report_run_ids = itertools.count(1)
+
+        handler = type('FakeGraphHandler', (_Handler,), {'api': self})
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as the extractor's graph_url"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeGraphAPI':
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'FakeGraphAPI':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Request handling
+
+    def handle(self, method: str, path: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str], int]:
+        """
+        Answer one request
+
+        Args:
+            method: HTTP method
+            path: URL path without the API version
+            params: Decoded query or form params
+
+        Returns:
+            Tuple of (body, extra headers, number of rows)
+        """
+        parts = [part for part in path.split('/') if part]
+        if not parts:
+            raise GraphError(100, "(#100) Unsupported request")
+
+        account = self._account(parts[0]) if parts[0].startswith('act_') else None
+        headers = self._register_call(account.id if account else parts[0])
+        self._inject_errors(headers)
+
+        if account and len(parts) == 2 and method == 'GET':
+            kind = {'campaigns': 'campaign', 'adsets': 'adset', 'ads': 'ad'}.get(parts[1])
+            if kind:
+                return self._with_headers(self._list_objects(account, kind, params), headers)
+            if parts[1] == 'insights':
+                return self._with_headers(self._sync_insights(account, params), headers)
+        if account and len(parts) == 2 and method == 'POST' and parts[1] == 'insights':
+            return self._with_headers(self._submit_report_run(account, params), headers)
+        if len(parts) == 2 and parts[1] in ('owned_ad_accounts', 'client_ad_accounts') and method == 'GET':
+            return self._with_headers(self._list_accounts(parts[1], params), headers)
+        if parts[0] in self.report_runs and method == 'GET':
+            if len(parts) == 1:
+                return self._with_headers((self._report_run_status(parts[0]), 0), headers)
+            if parts[1] == 'insights':
+                return self._with_headers(self._report_run_insights(parts[0], params), headers)
+
+        raise GraphError(100, f"(#100) Unsupported {method} request: /{'/'.join(parts)}")
+
+    @staticmethod
+    def _with_headers(result: Tuple[Dict[str, Any], int], headers: Dict[str, str]):
+        body, rows = result
+        return body, headers, rows
+
+    def _account(self, node: str) -> FakeAccount:
+        try:
+            index = int(node[len('act_'):]) - ACCOUNT_ID_BASE
+        except ValueError:
+            index = -1
+        if not 0 <= index < len(self.accounts):
+            raise GraphError(100, f"(#100) Unknown ad account: {node}")
+        return self.accounts[index]
+
+    def _register_call(self, node: str) -> Dict[str, str]:
+        """Count the call against its account and build the usage headers"""
+        limit = self.options['calls_per_minute']
+        now = time.monotonic()
+        with self._lock:
+            calls = self._calls.setdefault(node, deque())
+            while calls and now - calls[0] > 60:
+                calls.popleft()
+            calls.append(now)
+            pct = min(100, int(len(calls) * 100 / limit)) if limit else 0
+            self.stats['requests'] += 1
+
+        throttled = bool(limit) and len(calls) > limit
+        regain = self.options['regain_access_minutes'] if throttled else 0
+        headers = {
+            'x-business-use-case-usage': json.dumps({node: [{
+                'type': 'ads_insights',
+                'call_count': pct,
+                'total_cputime': pct // 2,
+                'total_time': pct // 2,
+                'estimated_time_to_regain_access': regain,
+            }]}),
+            'x-ad-account-usage': json.dumps({
+                'acc_id_util_pct': pct, 'reset_time_duration': 60 if throttled else 0,
+            }),
+        }
+        if throttled:
+            with self._lock:
+                self.stats['throttled'] += 1
+            raise GraphError(
+                80004, "There have been too many calls to this ad-account. Wait a bit and try again.",
+                headers=headers
+            )
+        return headers
+
+    def _inject_errors(self, headers: Dict[str, str]):
+        with self._lock:
+            roll = self._rng.random()
+        throttle_rate = self.options['throttle_error_rate']
+        if roll < throttle_rate:
+            with self._lock:
+                self.stats['throttled'] += 1
+            raise GraphError(17, "(#17) User request limit reached", headers=headers)
+        if roll < throttle_rate + self.options['transient_error_rate']:
+            with self._lock:
+                self.stats['errors'] += 1
+            raise GraphError(
+                2, "An unexpected error has occurred. Please retry your request later.",
+                status=500, transient=True, headers=headers
+            )
+
+    def _page(self, params: Dict[str, Any], total: int, default_limit: int = 25) -> Tuple[int, int]:
+        offset = _decode_cursor(params.get('after'))
+        limit = int(params.get('limit') or default_limit)
+        return offset, max(1, min(limit, self.options['max_page_size']))
+
+    def _paged(self, data: List[Dict[str, Any]], offset: int, total: int) -> Dict[str, Any]:
+        end = offset + len(data)
+        paging = {'cursors': {'before': _encode_cursor(offset), 'after': _encode_cursor(end)}}
+        if end < total:
+            paging['next'] = f"{self.url}/next?after={_encode_cursor(end)}"
+        return {'data': data, 'paging': paging, 'summary': {'total_count': total}}
+
+    @staticmethod
+    def _fields(params: Dict[str, Any], default: List[str]) -> List[str]:
+        fields = params.get('fields')
+        if not fields:
+            return default
+        if isinstance(fields, list):
+            return [str(field) for field in fields]
+        return [field for field in str(fields).split(',') if field]
+
+    def _list_objects(self, account: FakeAccount, kind: str, params: Dict[str, Any]):
+        records = account.objects(kind)
+        statuses = set(LIVE_STATUSES)
+        for condition in params.get('filtering') or []:
+            if condition.get('field') == 'effective_status' and condition.get('operator') == 'IN':
+                statuses = set(condition.get('value') or [])
+            elif condition.get('field') == 'updated_time' and condition.get('operator') == 'GREATER_THAN':
+                since = int(condition.get('value') or 0)
+                records = [record for record in records if record['_updated_epoch'] > since]
+        records = [record for record in records if record['effective_status'] in statuses]
+
+        fields = self._fields(params, ['id'])
+        offset, limit = self._page(params, len(records))
+        data = [
+            {field: record[field] for field in fields if field in record}
+            for record in records[offset:offset + limit]
+        ]
+        return self._paged(data, offset, len(records)), len(data)
+
+    def _list_accounts(self, edge: str, params: Dict[str, Any]):
+        # Every account is "owned"; client accounts are empty
+        accounts = self.accounts if edge == 'owned_ad_accounts' else []
+        offset, limit = self._page(params, len(accounts))
+        data = [
+            {'id': f"act_{account.id}", 'account_id': account.id}
+            for account in accounts[offset:offset + limit]
+        ]
+        return self._paged(data, offset, len(accounts)), len(data)
+
+    def _sync_insights(self, account: FakeAccount, params: Dict[str, Any]):
+        query = InsightsQuery(account, self._fields(params, ['impressions', 'spend']), params, self.options['seed'])
+        if len(query) > self.options['max_rows_per_request']:
+            raise GraphError(
+                1, "Please reduce the amount of data you're asking for, then retry your request",
+                status=500
+            )
+        return self._insights_page(query, params)
+
+    def _insights_page(self, query: InsightsQuery, params: Dict[str, Any]):
+        total = len(query)
+        offset, limit = self._page(params, total)
+        data = query.rows(offset, limit) if offset < total else []
+        body = self._paged(data, offset, total)
+        del body['summary']
+        return body, len(data)
+
+    def _submit_report_run(self, account: FakeAccount, params: Dict[str, Any]):
+        query = InsightsQuery(account, self._fields(params, ['impressions', 'spend']), params, self.options['seed'])
+        run_id = str(ID_PREFIX['report_run'] * 10 ** 15 + next(self._report_run_ids))
+        with self._lock:
+            self.report_runs[run_id] = {'query': query, 'submitted_at': time.monotonic()}
+        return {'report_run_id': run_id}, 0
+
+    def _report_run_status(self, run_id: str) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.report_runs[run_id]['submitted_at']
+        duration = self.options['report_run_seconds']
+        percent = 100 if duration <= 0 else min(100, int(elapsed * 100 / duration))
+        return {
+            'id': run_id,
+            'async_status': 'Job Completed' if percent >= 100 else 'Job Running',
+            'async_percent_completion': percent,
+        }
+
+    def _report_run_insights(self, run_id: str, params: Dict[str, Any]):
+        if self._report_run_status(run_id)['async_status'] != 'Job Completed':
+            raise GraphError(100, f"(#100) Report run {run_id} is not complete")
+        return self._insights_page(self.report_runs[run_id]['query'], params)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive handler delegating to FakeGraphAPI.handle"""
+
+    protocol_version = 'HTTP/1.1'
+    api: FakeGraphAPI = None
+
+    def do_GET(self):
+        self._respond('GET', parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8')) if length else {}
+        query = parse_qs(urlparse(self.path).query)
+        self._respond('POST', {**query, **form})
+
+    def _respond(self, method: str, raw_params: Dict[str, List[str]]):
+        api = self.api
+        path = VERSION_PREFIX.sub('', urlparse(self.path).path)
+        params = {name: _decode_param(values[-1]) for name, values in raw_params.items()}
+
+        started = time.monotonic()
+        try:
+            body, headers, rows = api.handle(method, path, params)
+            status = 200
+        except GraphError as e:
+            body, headers, rows, status = e.body(), e.headers, 0, e.status
+
+        latency = api.options['latency_ms'] + rows * api.options['latency_per_1000_rows_ms'] / 1000
+        remaining = latency / 1000 - (time.monotonic() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+        payload = json.dumps(body, separators=(',', ':')).encode('utf-8')
+        gzipped = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+        if gzipped:
+            payload = gzip.compress(payload, compresslevel=1)
+
+        with api._lock:
+            api.stats['rows'] += rows
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(payload)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _decode_param(value: str) -> Any:
+    """The SDK JSON-encodes dict and list params; plain values stay strings"""
+    if value[:1] in ('{', '['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    for name, default in FAKE_API_DEFAULTS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = vars(parser.parse_args())
+
+    host, port = args.pop('host'), args.pop('port')
+    api = FakeGraphAPI(host, port, **args).start()
+    print(f"Fake Graph API listening on {api.url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"  {api.stats}")
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == '__main__':
+    main()
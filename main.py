@@ -3,8 +3,6 @@ Main entry point for the ELT system
 """
 import logging
 import argparse
-from apscheduler.schedulers.blocking import BlockingScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 
 from src.core import ConfigManager, setup_logger
 from src.orchestrator import Orchestrator
@@ -44,6 +42,10 @@ def run_scheduled(config_path: str = "config/config.yaml"):
     Args:
         config_path: Path to configuration file
     """
+    # Only the scheduled mode needs APScheduler
+    from apscheduler.schedulers.blocking import BlockingScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+    
     # Load configuration
     config_manager = ConfigManager(config_path)
     
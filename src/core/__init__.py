@@ -1,5 +1,7 @@
 """Core module initialization"""
 from .config_manager import ConfigManager
 from .logger import setup_logger
+from .json_codec import json_dumps, json_loads
+from .state_store import StateStore
 
-__all__ = ['ConfigManager', 'setup_logger']
+__all__ = ['ConfigManager', 'setup_logger', 'json_dumps', 'json_loads', 'StateStore']
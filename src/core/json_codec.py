@@ -0,0 +1,45 @@
+"""
+JSON Codec Module
+JSON encoding helpers that use orjson when it is installed
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(value: Any) -> str:
+    """
+    Serialize a value to a JSON string
+    
+    Args:
+        value: Value to serialize
+        
+    Returns:
+        Compact JSON string, the same with or without orjson
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value).decode('utf-8')
+        except TypeError:
+            pass
+    # Same output as orjson, so keys hashed from it don't depend on the install
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def json_loads(value: Any) -> Any:
+    """
+    Parse a JSON string or bytes
+    
+    Args:
+        value: JSON document
+        
+    Returns:
+        Parsed value
+    """
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
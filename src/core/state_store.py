@@ -0,0 +1,73 @@
+"""
+State Store Module
+Persists small pieces of pipeline state (such as sync watermarks) between runs
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class StateStore:
+    """Key/value state persisted to a local JSON file"""
+
+    def __init__(self, path: str = "state/sync_state.json"):
+        """
+        Initialize state store
+
+        Args:
+            path: Path to the JSON state file (created on first write)
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        """Load state from disk (an unreadable file starts a fresh state)"""
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read state file {self.path}, starting fresh: {e}")
+            return {}
+
+    def _save(self):
+        """Write state to disk atomically"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._state, f, indent=2, sort_keys=True, default=str)
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get a stored value
+
+        Args:
+            key: State key
+            default: Value returned when the key is not set
+
+        Returns:
+            Stored value or default
+        """
+        with self._lock:
+            return self._state.get(key, default)
+
+    def set(self, key: str, value: Any):
+        """
+        Store a value and persist the state file
+
+        Args:
+            key: State key
+            value: JSON serializable value
+        """
+        with self._lock:
+            self._state[key] = value
+            self._save()
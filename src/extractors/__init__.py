@@ -1,4 +1,11 @@
 """Extractors module initialization"""
-from .facebook_ads_extractor import FacebookAdsExtractor
 
 __all__ = ['FacebookAdsExtractor']
+
+
+def __getattr__(name):
+    # Imported on first use: the extractor pulls in pandas and the Facebook SDK
+    if name == 'FacebookAdsExtractor':
+        from .facebook_ads_extractor import FacebookAdsExtractor
+        return FacebookAdsExtractor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,246 @@
+"""
+Checkpoint
+Local spool of fetched insights pages so interrupted extractions can resume
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from src.core.json_codec import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+
+def make_run_id(
+    account_id: Any,
+    fields: Iterable[str],
+    params: Dict[str, Any],
+    date_preset: Optional[str] = None
+) -> str:
+    """
+    Build a run ID that is stable across retries of the same request
+
+    A relative date range is keyed by its preset instead of the dates it
+    resolved to, so a run retried on the next day keeps its ID; windows that
+    no longer match the new dates are simply not reused.
+
+    Args:
+        account_id: Ad account ID
+        fields: Requested fields
+        params: Insights params, including the time range
+        date_preset: Relative range the time range was resolved from (e.g. 'last_30_days')
+
+    Returns:
+        Hex digest identifying the request
+    """
+    excluded = {'limit', 'time_range'} if date_preset else {'limit'}
+    request = {name: params[name] for name in sorted(params) if name not in excluded}
+    if date_preset:
+        request['date_preset'] = date_preset
+    payload = json_dumps({
+        'account_id': str(account_id),
+        'fields': sorted(str(field) for field in fields),
+        'params': request,
+    })
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def prune_checkpoints(directory: str, max_age_hours: float) -> int:
+    """
+    Remove the spools of runs that were abandoned instead of resumed
+
+    Args:
+        directory: Checkpoint root directory
+        max_age_hours: Age of the newest page of a run above which it is removed
+
+    Returns:
+        Number of runs removed
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        return 0
+    cutoff = time.time() - float(max_age_hours) * 3600
+    removed = 0
+    for run_path in root.iterdir():
+        if not run_path.is_dir():
+            continue
+        # Pages are written inside window directories, which don't touch the run's own mtime
+        last_write = max(
+            [run_path.stat().st_mtime] + [state.stat().st_mtime for state in run_path.glob('*/state.json')]
+        )
+        if last_write < cutoff:
+            shutil.rmtree(run_path, ignore_errors=True)
+            removed += 1
+    if removed:
+        logger.info(f"Removed {removed} stale checkpoint runs from {directory}")
+    return removed
+
+
+def _write_atomic(path: Path, write):
+    tmp_path = path.with_name(path.name + '.tmp')
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class InsightsCheckpoint:
+    """
+    Spool of the pages fetched by one extraction run
+
+    Each date window has its own directory with one gzip JSON-lines file per
+    page and a state file holding the paging cursor of the next page.
+    """
+
+    def __init__(self, directory: str, run_id: str):
+        """
+        Initialize checkpoint
+
+        Args:
+            directory: Checkpoint root directory
+            run_id: Run ID (the same ID resumes the same run)
+        """
+        self.run_id = run_id
+        self.path = Path(directory) / run_id
+
+    def exists(self) -> bool:
+        """Check if an earlier attempt of this run left checkpoints"""
+        return self.path.exists()
+
+    def window(self, since: date, until: date, filtering: Any = None) -> 'WindowCheckpoint':
+        """
+        Get the checkpoint of a date window
+
+        Args:
+            since: Window start date
+            until: Window end date
+            filtering: Request filters (e.g. a campaign batch of a split window)
+
+        Returns:
+            WindowCheckpoint for the window
+        """
+        name = f"{since.isoformat()}_{until.isoformat()}"
+        if filtering:
+            name += '_' + hashlib.sha1(json_dumps(filtering).encode('utf-8')).hexdigest()[:12]
+        return WindowCheckpoint(self.path / name)
+
+    def clear(self):
+        """Remove the run's spool once the extraction has finished"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class WindowCheckpoint:
+    """Pages fetched for one date window and the cursor to continue from"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        try:
+            with open(self.path / 'state.json') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'pages': 0, 'rows': 0, 'after': None, 'done': False, 'fetched_on': None}
+
+    @property
+    def done(self) -> bool:
+        """Whether every page of the window was fetched"""
+        return self.state['done']
+
+    @property
+    def after(self) -> Optional[str]:
+        """Paging cursor of the next page to fetch (None = start from the first page)"""
+        return self.state['after']
+
+    @property
+    def pages(self) -> int:
+        return self.state['pages']
+
+    @property
+    def fetched_on(self) -> Optional[str]:
+        """Date the first page was fetched (ISO format)"""
+        return self.state.get('fetched_on')
+
+    def is_current(self, until: date, today: Optional[date] = None) -> bool:
+        """
+        Check if the spooled pages can be combined with pages fetched today
+
+        Pages fetched on an earlier day are only still valid when the window
+        had already ended by then; otherwise its last days were incomplete.
+
+        Args:
+            until: Window end date
+            today: Current date (defaults to date.today())
+
+        Returns:
+            True if the window's pages are still valid
+        """
+        if not self.pages:
+            return True
+        if not self.fetched_on:
+            return False
+        fetched_on = date.fromisoformat(self.fetched_on)
+        return fetched_on == (today or date.today()) or fetched_on > until
+
+    @property
+    def rows(self) -> int:
+        return self.state['rows']
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Read the rows of the pages already fetched"""
+        for page in range(1, self.state['pages'] + 1):
+            with gzip.open(self.path / f"page_{page:05d}.jsonl.gz", 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json_loads(line)
+
+    def add_page(self, rows: List[Dict[str, Any]], after: Optional[str], done: bool = False):
+        """
+        Store a fetched page and the cursor of the page after it
+
+        Args:
+            rows: Row dicts of the page
+            after: Paging cursor of the next page
+            done: Whether this was the last page
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+        page = self.state['pages'] + 1
+
+        def write_page(tmp_path):
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                for row in rows:
+                    f.write(json_dumps(row))
+                    f.write('\n')
+
+        _write_atomic(self.path / f"page_{page:05d}.jsonl.gz", write_page)
+        self._save_state({
+            'pages': page,
+            'rows': self.state['rows'] + len(rows),
+            'after': after,
+            'done': done,
+            'fetched_on': self.state.get('fetched_on') or date.today().isoformat(),
+        })
+
+    def complete(self):
+        """Mark the window as fully fetched"""
+        self._save_state({**self.state, 'done': True})
+
+    def reset(self):
+        """Discard the window's pages (its fetch can't be resumed)"""
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.state = self._load_state()
+
+    def _save_state(self, state: Dict[str, Any]):
+        def write_state(tmp_path):
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        _write_atomic(self.path / 'state.json', write_state)
+        self.state = state
@@ -0,0 +1,129 @@
+"""
+Derived Metrics
+Ratio metrics computed locally from the base counters of insights rows
+"""
+import logging
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Derived field -> base fields requested instead (in the API's definition of each ratio)
+DERIVED_METRICS: Dict[str, List[str]] = {
+    'ctr': ['clicks', 'impressions'],                           # clicks / impressions * 100
+    'cpc': ['spend', 'clicks'],                                 # spend / clicks
+    'cpm': ['spend', 'impressions'],                            # spend / impressions * 1000
+    'cost_per_inline_link_click': ['spend', 'inline_link_clicks'],  # spend / inline link clicks
+    'cost_per_action_type': ['spend', 'actions'],               # spend / action_<type> -> cost_per_<type>
+}
+
+# Insights list fields named like expanded action columns
+ACTION_LIST_FIELDS = frozenset({'action_values'})
+
+
+def split_derived_metrics(fields: List[Any]) -> Tuple[List[Any], List[str]]:
+    """
+    Replace derived fields in an insights request with their base counters
+
+    Args:
+        fields: Requested fields
+
+    Returns:
+        Tuple of (fields to request, derived fields to compute after extraction)
+    """
+    request_fields = []
+    derived = []
+    for field in fields:
+        name = str(field)
+        if name in DERIVED_METRICS:
+            if name not in derived:
+                derived.append(name)
+            continue
+        if name not in request_fields:
+            request_fields.append(name)
+
+    for name in derived:
+        for base_field in DERIVED_METRICS[name]:
+            if base_field not in request_fields:
+                request_fields.append(base_field)
+
+    return request_fields, derived
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as a float array (missing columns and values are NaN)"""
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _action_count_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Numeric action_<type> columns expanded from actions
+
+    Raw list fields with the same prefix (action_values, stored as JSON text) are skipped.
+    """
+    return [
+        str(column) for column in df.columns
+        if str(column).startswith('action_')
+        and str(column) not in ACTION_LIST_FIELDS
+        and pd.api.types.is_numeric_dtype(df[column])
+    ]
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """
+    Divide element-wise, leaving NaN where the denominator is zero or missing
+
+    Args:
+        numerator: Numerator values
+        denominator: Denominator values
+        scale: Factor applied to the quotient (100 for percentages, 1000 for per-mille)
+
+    Returns:
+        Quotients as float64
+    """
+    result = np.full(len(numerator), np.nan)
+    valid = (denominator > 0) & ~np.isnan(numerator)
+    np.divide(numerator, denominator, out=result, where=valid)
+    if scale != 1.0:
+        result *= scale
+    return result
+
+
+def add_derived_metrics(df: pd.DataFrame, derived: List[str]) -> pd.DataFrame:
+    """
+    Compute derived ratio metrics from the base counters of a DataFrame
+
+    Args:
+        df: Insights DataFrame with base counters (and expanded action_* columns)
+        derived: Derived fields from split_derived_metrics
+
+    Returns:
+        DataFrame with the derived columns added (NaN where a denominator is 0)
+    """
+    if not derived or df.empty:
+        return df
+
+    spend = _column(df, 'spend')
+    computed = {}
+
+    if 'ctr' in derived:
+        computed['ctr'] = safe_divide(_column(df, 'clicks'), _column(df, 'impressions'), 100.0)
+    if 'cpc' in derived:
+        computed['cpc'] = safe_divide(spend, _column(df, 'clicks'))
+    if 'cpm' in derived:
+        computed['cpm'] = safe_divide(spend, _column(df, 'impressions'), 1000.0)
+    if 'cost_per_inline_link_click' in derived:
+        computed['cost_per_inline_link_click'] = safe_divide(spend, _column(df, 'inline_link_clicks'))
+    if 'cost_per_action_type' in derived:
+        # Same column names as the expansion of the API's cost_per_action_type
+        for column in _action_count_columns(df):
+            action_type = column[len('action_'):]
+            computed[f"cost_per_{action_type}"] = safe_divide(spend, _column(df, column))
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Computed {len(computed)} derived metric columns: {list(computed)}")
+    return df.assign(**computed)
@@ -3,19 +3,263 @@ Facebook Ads Extractor
 Extracts data from Facebook Ads API
 """
 import logging
-import json
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+from datetime import datetime, timedelta, date
 import pandas as pd
-from facebook_business.api import FacebookAdsApi
+from facebook_business.session import FacebookSession
 from facebook_business.adobjects.adaccount import AdAccount
+from facebook_business.adobjects.adreportrun import AdReportRun
 from facebook_business.adobjects.campaign import Campaign
 from facebook_business.adobjects.adset import AdSet
 from facebook_business.adobjects.ad import Ad
 from facebook_business.adobjects.adsinsights import AdsInsights
+from facebook_business.adobjects.business import Business
+from facebook_business.exceptions import FacebookRequestError
+
+from src.core.json_codec import json_dumps, json_loads
+from .field_types import apply_field_types, EXPANDED_FIELD_TYPE
+from .derived_metrics import add_derived_metrics, split_derived_metrics
+from .rate_limiter import rate_limiter
+from .retry_policy import ThrottledFacebookAdsApi, is_reduce_data_error, retry_policy
+from .insights_cache import InsightsCache, get_insights_cache
+from .http_session import configure_session
+from .checkpoint import InsightsCheckpoint, WindowCheckpoint, make_run_id, prune_checkpoints
 
 logger = logging.getLogger(__name__)
 
+# Rows requested per page for campaigns, adsets and ads (the Graph API default is 25)
+DIMENSION_PAGE_SIZE = 500
+
+# Dimension tables fetched concurrently by extract_dimensions
+DIMENSION_TABLES = ('campaigns', 'adsets', 'ads')
+
+# Insights table whose breakdown sets are each extracted into a narrow table of their own
+BREAKDOWNS_TABLE = 'insights_breakdowns'
+
+# Metrics of breakdown tables when the table config lists no fields
+BREAKDOWN_DEFAULT_FIELDS = ['impressions', 'reach', 'clicks', 'inline_link_clicks', 'spend', 'actions']
+
+# Insights levels, from coarsest to finest
+INSIGHTS_LEVELS = ('account', 'campaign', 'adset', 'ad')
+
+# ID and name columns identifying the rows of each insights level
+LEVEL_COLUMNS = {
+    'account': [],
+    'campaign': ['campaign_id', 'campaign_name'],
+    'adset': ['campaign_id', 'campaign_name', 'adset_id', 'adset_name'],
+    'ad': ['campaign_id', 'campaign_name', 'adset_id', 'adset_name', 'ad_id', 'ad_name'],
+}
+
+# Insights fields that add up across ads, adsets and campaigns (rolled up locally).
+# Other list fields (action_values, conversions, outbound_clicks, video_p*_watched_actions)
+# are not expanded into numeric columns, so they are requested per level instead.
+ADDITIVE_INSIGHTS_FIELDS = frozenset({
+    'impressions', 'clicks', 'spend', 'inline_link_clicks', 'actions', 'video_play_actions',
+})
+
+# Expanded columns of additive list fields (actions -> action_*, video_play_actions -> video_*)
+ADDITIVE_COLUMN_PREFIXES = ('action_', 'video_')
+
+# Default settings for insights fetching, overridable from the insights table config
+INSIGHTS_OPTION_DEFAULTS = {
+    # Date-window sharding
+    'window_size': None,             # Days per window (e.g. 7) or 'month'; None = single request
+    'max_workers': 4,                # Windows fetched concurrently
+    'page_size': 500,                # Rows per API page (sync requests and report results)
+    # Async report runs (AdReportRun)
+    'async_mode': 'auto',            # 'auto', 'always' or 'never'
+    'async_threshold_days': 90,      # Use async reports above this many days
+    'async_threshold_rows': None,    # Use async reports above this many estimated rows
+    'async_chunk_days': 31,          # Days covered by each report run
+    'async_max_jobs': 3,             # Report runs in flight at the same time
+    'async_poll_interval': 5,        # Seconds between status checks
+    'async_timeout': 3600,           # Seconds before a report run is abandoned
+    # Local cache of settled days (daily increments only)
+    'cache_dir': None,               # Cache directory; None = no cache
+    'cache_settling_days': 28,       # Recent days always fetched from the API (attribution window)
+    'cache_max_mb': 1024,            # Cache size limit; least recently used days are evicted
+    # Resumable extractions
+    'checkpoint_dir': None,          # Spool directory for fetched pages; None = no checkpoints
+    'run_id': None,                  # Checkpoint run ID; None = derived from the request
+    'checkpoint_max_age_hours': 168, # Spools of runs not resumed within this time are removed
+    # Local metrics
+    'derived_metrics': False,        # Compute ctr, cpc, cpm and cost-per metrics from base counters
+}
+
+# Longest range of uncached days fetched (and committed to the cache) at once
+CACHE_SEGMENT_DAYS = 31
+
+
+def normalize_account_id(account_id: Any) -> str:
+    """Return an ad account ID in 'act_<id>' form"""
+    account_id = str(account_id).strip()
+    return account_id if account_id.startswith('act_') else f"act_{account_id}"
+
+
+def breakdown_sets(table_config: Dict[str, Any]) -> List[List[str]]:
+    """
+    Get the breakdown sets of an insights_breakdowns table config
+    
+    A flat list (e.g. [age, gender]) is a single set; a list of lists holds
+    one set per destination table.
+    
+    Args:
+        table_config: Table configuration
+        
+    Returns:
+        Breakdown sets, each a list of breakdown names
+    """
+    breakdowns = table_config.get('breakdowns') or []
+    if all(isinstance(breakdown, str) for breakdown in breakdowns):
+        return [list(breakdowns)] if breakdowns else []
+    return [[entry] if isinstance(entry, str) else list(entry) for entry in breakdowns]
+
+
+def breakdown_table_name(breakdowns: List[str]) -> str:
+    """Source table name of a breakdown set, e.g. 'insights_age_gender'"""
+    return 'insights_' + '_'.join(breakdowns)
+
+
+def breakdown_key_columns(level: str, breakdowns: List[str]) -> List[str]:
+    """Columns identifying a row of a breakdown table: date, entity and breakdown values"""
+    keys = ['date_start']
+    if level != 'account':
+        keys.append(f"{level}_id")
+    return keys + list(breakdowns)
+
+
+def rollup_key_columns(level: str) -> List[str]:
+    """Columns identifying a row of a rolled-up insights table"""
+    return ['date_start'] if level == 'account' else ['date_start', f"{level}_id"]
+
+
+def breakdown_table_config(table_config: Dict[str, Any], breakdowns: List[str]) -> Dict[str, Any]:
+    """
+    Build the insights table config of one breakdown set
+    
+    Args:
+        table_config: insights_breakdowns table configuration
+        breakdowns: Breakdown set
+        
+    Returns:
+        Insights table config requesting that breakdown set
+    """
+    config = {
+        **table_config,
+        'name': 'insights',
+        'breakdowns': list(breakdowns),
+        'fields': table_config.get('fields') or BREAKDOWN_DEFAULT_FIELDS,
+    }
+    if config.get('run_id'):
+        # Each set is a separate run; a shared run ID would mix their checkpoints
+        config['run_id'] = f"{config['run_id']}_{breakdown_table_name(breakdowns)}"
+    return config
+
+
+class ColumnarAccumulator:
+    """Accumulates API records directly into per-column lists"""
+    
+    def __init__(self):
+        """Initialize an empty accumulator"""
+        self.columns: Dict[str, List[Any]] = {}
+        self.complex_keys = set()
+        self.rows = 0
+        self._valid_keys: Dict[Any, bool] = {}
+    
+    def append(self, record: Dict[str, Any]):
+        """
+        Append one record, skipping None values and invalid column names
+        
+        Columns that first appear in a later record are back-filled with None
+        for the earlier rows; columns missing from a record are padded lazily.
+        Records without any valid value are ignored.
+        
+        Args:
+            record: Field name to value mapping
+        """
+        appended = False
+        for key, value in record.items():
+            if value is None:
+                continue
+            
+            valid = self._valid_keys.get(key)
+            if valid is None:
+                valid = self._valid_keys[key] = key is not None and str(key).lower() != 'nan'
+            if not valid:
+                continue
+            
+            column = self.columns.get(key)
+            if column is None:
+                column = self.columns[key] = []
+            if len(column) < self.rows:
+                column.extend([None] * (self.rows - len(column)))
+            
+            if isinstance(value, (list, dict)):
+                self.complex_keys.add(key)
+            column.append(value)
+            appended = True
+        
+        if appended:
+            self.rows += 1
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Build the DataFrame in one step
+        
+        Returns:
+            DataFrame with one column per accumulated key, in first-seen order
+        """
+        for column in self.columns.values():
+            if len(column) < self.rows:
+                column.extend([None] * (self.rows - len(column)))
+        return pd.DataFrame(self.columns)
+
+
+class ReportRunSlots:
+    """
+    Counts the async report runs in flight for one extractor
+    
+    Date windows, breakdown sets and roll-up levels fetch concurrently, so the
+    async_max_jobs limit is enforced across all of them instead of per call.
+    """
+    
+    def __init__(self):
+        """Initialize with no report runs in flight"""
+        self._condition = threading.Condition()
+        self.in_flight = 0
+    
+    def acquire(self, limit: int, blocking: bool = True) -> bool:
+        """
+        Take a slot for a new report run
+        
+        Args:
+            limit: Report runs allowed in flight (async_max_jobs of the caller)
+            blocking: Wait for a free slot instead of returning False
+            
+        Returns:
+            True if a slot was taken
+        """
+        with self._condition:
+            while self.in_flight >= limit:
+                if not blocking:
+                    return False
+                self._condition.wait()
+            self.in_flight += 1
+            return True
+    
+    def release(self, count: int = 1):
+        """Free the slots of finished (or abandoned) report runs"""
+        if not count:
+            return
+        with self._condition:
+            self.in_flight -= count
+            self._condition.notify_all()
+
 
 class FacebookAdsExtractor:
     """Extracts data from Facebook Ads API"""
@@ -30,6 +274,9 @@ class FacebookAdsExtractor:
         self.config = config
         self.api = None
         self.ad_account = None
+        self.http_stats = None
+        self._campaign_ids = None
+        self._report_run_slots = ReportRunSlots()
         self._initialize_api()
     
     def _initialize_api(self):
@@ -39,12 +286,25 @@ class FacebookAdsExtractor:
             app_secret = self.config.get('app_secret')
             access_token = self.config.get('access_token')
             
-            # Initialize API with latest version (v22.0)
-            FacebookAdsApi.init(app_id, app_secret, access_token, api_version='v22.0')
-            self.api = FacebookAdsApi.get_default_api()
+            # Throttling and retry settings are shared by every extractor in the process
+            rate_limiter.configure(self.config.get('rate_limit'))
+            retry_policy.configure(self.config.get('retry'))
+            
+            # Each extractor gets its own session instead of the global default API,
+            # so several accounts can be extracted side by side (API version v22.0)
+            session = FacebookSession(app_id, app_secret, access_token)
+            self.http_stats = configure_session(session, self.config.get('http'))
+            
+            # Base-URL override, e.g. the fake Graph API used for offline load tests
+            graph_url = self.config.get('graph_url')
+            if graph_url:
+                session.GRAPH = graph_url.rstrip('/')
+                logger.info(f"Using Graph API at {session.GRAPH}")
+            self.api = ThrottledFacebookAdsApi(session, api_version='v22.0')
             
             ad_account_id = self.config.get('ad_account_id')
-            self.ad_account = AdAccount(ad_account_id)
+            if ad_account_id:
+                self.ad_account = AdAccount(normalize_account_id(ad_account_id), api=self.api)
             
             logger.info(f"Facebook Ads API initialized for account: {ad_account_id}")
             
@@ -52,13 +312,36 @@ class FacebookAdsExtractor:
             logger.error(f"Error initializing Facebook Ads API: {e}")
             raise
     
+    def discover_ad_accounts(self, business_id: str) -> List[str]:
+        """
+        List the ad accounts owned by or shared with a business
+        
+        Args:
+            business_id: Business Manager ID
+            
+        Returns:
+            Ad account IDs in 'act_<id>' form
+        """
+        business = Business(business_id, api=self.api)
+        params = {'limit': DIMENSION_PAGE_SIZE}
+        
+        account_ids = []
+        for edge in (business.get_owned_ad_accounts, business.get_client_ad_accounts):
+            for account in edge(fields=['id'], params=params):
+                account_id = normalize_account_id(account['id'])
+                if account_id not in account_ids:
+                    account_ids.append(account_id)
+        
+        logger.info(f"Discovered {len(account_ids)} ad accounts for business {business_id}")
+        return account_ids
+    
     def _expand_action_fields(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Expand complex action fields (actions, cost_per_action_type, video_play_actions, etc.)
         into individual columns
         
         Args:
-            df: DataFrame with JSON string columns
+            df: DataFrame with action list columns (native lists or JSON strings)
             
         Returns:
             DataFrame with expanded action columns
@@ -92,59 +375,156 @@ class FacebookAdsExtractor:
             'video_play_actions': 'video',  # Generates: video_play, video_view, etc.
         }
         
+        expanded_frames = []
+        
         for field_name, prefix in fields_to_expand.items():
             if field_name not in df.columns:
                 continue
             
             logger.info(f"Expanding field: {field_name}")
             
-            # Extract and expand
-            for idx, row_value in df[field_name].items():
-                if pd.isna(row_value) or not row_value:
-                    continue
-                
-                try:
-                    # Parse JSON string
-                    if isinstance(row_value, str):
-                        actions_list = json.loads(row_value)
-                    elif isinstance(row_value, list):
-                        actions_list = row_value
-                    else:
+            # Parse every cell once and explode into a long (row, action_type, value) frame
+            rows, action_types, values = [], [], []
+            for position, row_value in enumerate(df[field_name].tolist()):
+                for action in self._parse_action_list(row_value):
+                    if not isinstance(action, dict):
                         continue
-                    
-                    # Extract each action type
-                    for action in actions_list:
-                        if not isinstance(action, dict):
-                            continue
-                        
-                        action_type = action.get('action_type', '')
-                        action_value = action.get('value', 0)
-                        
-                        # Create column name
-                        col_name = f"{prefix}_{action_type}"
-                        
-                        # Initialize column if it doesn't exist
-                        if col_name not in df.columns:
-                            df[col_name] = None
-                        
-                        # Set value
-                        df.at[idx, col_name] = action_value
-                        
-                except Exception as e:
-                    logger.debug(f"Error expanding {field_name} at row {idx}: {e}")
-                    continue
+                    rows.append(position)
+                    action_types.append(action.get('action_type', ''))
+                    values.append(action.get('value', 0))
+            
+            if not rows:
+                continue
+            
+            long_df = pd.DataFrame({'row': rows, 'action_type': action_types, 'value': values})
+            long_df = long_df.drop_duplicates(subset=['row', 'action_type'], keep='last')
+            
+            # Pivot back to one column per action type, keeping first-seen column order
+            wide = long_df.pivot(index='row', columns='action_type', values='value')
+            wide = wide.reindex(index=range(len(df)), columns=pd.unique(long_df['action_type']))
+            wide.columns = [f"{prefix}_{action_type}" for action_type in wide.columns]
+            wide.index = df.index
+            
+            # Columns that already exist keep their values where this field has none
+            for col_name in [col for col in wide.columns if col in df.columns]:
+                new_values = wide.pop(col_name)
+                df[col_name] = new_values.where(new_values.notna(), df[col_name])
+            
+            expanded_frames.append(wide)
+        
+        if expanded_frames:
+            df = pd.concat([df] + expanded_frames, axis=1)
         
         return df
     
-    def extract_campaigns(self, fields: List[str] = None) -> pd.DataFrame:
+    @staticmethod
+    def _encode_complex_columns(df: pd.DataFrame, columns: Iterable[str]) -> pd.DataFrame:
         """
-        Extract campaigns from Facebook Ads
+        JSON encode list/dict values in the given columns
         
         Args:
-            fields: List of fields to extract
+            df: DataFrame with native list/dict values
+            columns: Columns that may contain lists or dicts
             
         Returns:
-            DataFrame with campaigns data
+            DataFrame where those values are JSON strings
+        """
+        def encode(value):
+            if isinstance(value, (list, dict)):
+                try:
+                    return json_dumps(value)
+                except (TypeError, ValueError):
+                    return str(value)
+            return value
+        
+        for col in columns:
+            if col in df.columns:
+                df[col] = df[col].map(encode)
+        return df
+    
+    @staticmethod
+    def _parse_action_list(value: Any) -> List[Any]:
+        """
+        Parse an action field cell into a list of action dicts
+        
+        Args:
+            value: JSON string, list or empty value
+            
+        Returns:
+            List of actions (empty if the cell can't be parsed)
+        """
+        if isinstance(value, list):
+            return value
+        if isinstance(value, str) and value:
+            try:
+                parsed = json_loads(value)
+            except ValueError:
+                return []
+            return parsed if isinstance(parsed, list) else []
+        return []
+    
+    @staticmethod
+    def _dimension_params(
+        object_class: Any,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Build the request params for a campaigns, adsets or ads listing
+        
+        Args:
+            object_class: SDK class of the listed objects (Campaign, AdSet, Ad)
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
+            
+        Returns:
+            Params dict for the AdAccount edge
+        """
+        params = {'limit': page_size or DIMENSION_PAGE_SIZE}
+        filtering = []
+        
+        if updated_since:
+            watermark = pd.Timestamp(updated_since)
+            if watermark.tzinfo is None:
+                watermark = watermark.tz_localize('UTC')
+            filtering.append({
+                'field': 'updated_time',
+                'operator': 'GREATER_THAN',
+                'value': int(watermark.timestamp()),
+            })
+        
+        if include_deleted:
+            # The API hides archived and deleted objects unless every status is requested
+            statuses = [
+                value for name, value in vars(object_class.EffectiveStatus).items()
+                if not name.startswith('_')
+            ]
+            filtering.append({'field': 'effective_status', 'operator': 'IN', 'value': statuses})
+        
+        if filtering:
+            params['filtering'] = filtering
+        return params
+    
+    def _iter_campaigns(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate campaign records as API pages arrive
+        
+        Args:
+            fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
+            
+        Yields:
+            One dict per campaign
         """
         if fields is None:
             fields = [
@@ -156,15 +536,33 @@ class FacebookAdsExtractor:
                 Campaign.Field.updated_time,
             ]
         
+        params = self._dimension_params(Campaign, page_size, updated_since, include_deleted)
+        for record in self.ad_account.get_campaigns(fields=fields, params=params):
+            yield dict(record)
+    
+    def extract_campaigns(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> pd.DataFrame:
+        """
+        Extract campaigns from Facebook Ads
+        
+        Args:
+            fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
+            
+        Returns:
+            DataFrame with campaigns data
+        """
         try:
             logger.info("Extracting campaigns from Facebook Ads...")
-            campaigns = self.ad_account.get_campaigns(fields=fields)
-            
-            data = []
-            for campaign in campaigns:
-                data.append(dict(campaign))
-            
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(self._iter_campaigns(fields, page_size, updated_since, include_deleted)))
+            df = apply_field_types(df, 'campaigns')
             logger.info(f"Extracted {len(df)} campaigns")
             
             return df
@@ -173,15 +571,24 @@ class FacebookAdsExtractor:
             logger.error(f"Error extracting campaigns: {e}")
             raise
     
-    def extract_adsets(self, fields: List[str] = None) -> pd.DataFrame:
+    def _iter_adsets(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Extract ad sets from Facebook Ads
+        Iterate ad set records as API pages arrive
         
         Args:
             fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
             
-        Returns:
-            DataFrame with ad sets data
+        Yields:
+            One dict per ad set
         """
         if fields is None:
             fields = [
@@ -195,15 +602,33 @@ class FacebookAdsExtractor:
                 AdSet.Field.updated_time,
             ]
         
+        params = self._dimension_params(AdSet, page_size, updated_since, include_deleted)
+        for record in self.ad_account.get_ad_sets(fields=fields, params=params):
+            yield dict(record)
+    
+    def extract_adsets(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> pd.DataFrame:
+        """
+        Extract ad sets from Facebook Ads
+        
+        Args:
+            fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
+            
+        Returns:
+            DataFrame with ad sets data
+        """
         try:
             logger.info("Extracting ad sets from Facebook Ads...")
-            adsets = self.ad_account.get_ad_sets(fields=fields)
-            
-            data = []
-            for adset in adsets:
-                data.append(dict(adset))
-            
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(self._iter_adsets(fields, page_size, updated_since, include_deleted)))
+            df = apply_field_types(df, 'adsets')
             logger.info(f"Extracted {len(df)} ad sets")
             
             return df
@@ -212,15 +637,24 @@ class FacebookAdsExtractor:
             logger.error(f"Error extracting ad sets: {e}")
             raise
     
-    def extract_ads(self, fields: List[str] = None) -> pd.DataFrame:
+    def _iter_ads(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Extract ads from Facebook Ads
+        Iterate ad records as API pages arrive
         
         Args:
             fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
             
-        Returns:
-            DataFrame with ads data
+        Yields:
+            One dict per ad
         """
         if fields is None:
             fields = [
@@ -228,20 +662,39 @@ class FacebookAdsExtractor:
                 Ad.Field.name,
                 Ad.Field.status,
                 Ad.Field.adset_id,
+                Ad.Field.updated_time,
             ]
         
+        params = self._dimension_params(Ad, page_size, updated_since, include_deleted)
+        for record in self.ad_account.get_ads(fields=fields, params=params):
+            ad_dict = dict(record)
+            # Remove complex objects that can't be stored in MySQL
+            ad_dict.pop('creative', None)
+            yield ad_dict
+    
+    def extract_ads(
+        self,
+        fields: List[str] = None,
+        page_size: int = None,
+        updated_since: str = None,
+        include_deleted: bool = False
+    ) -> pd.DataFrame:
+        """
+        Extract ads from Facebook Ads
+        
+        Args:
+            fields: List of fields to extract
+            page_size: Rows per API page (default DIMENSION_PAGE_SIZE)
+            updated_since: Only return objects updated after this timestamp
+            include_deleted: Also return archived and deleted objects
+            
+        Returns:
+            DataFrame with ads data
+        """
         try:
             logger.info("Extracting ads from Facebook Ads...")
-            ads = self.ad_account.get_ads(fields=fields)
-            
-            data = []
-            for ad in ads:
-                ad_dict = dict(ad)
-                # Remove complex objects that can't be stored in MySQL
-                ad_dict.pop('creative', None)
-                data.append(ad_dict)
-            
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(list(self._iter_ads(fields, page_size, updated_since, include_deleted)))
+            df = apply_field_types(df, 'ads')
             logger.info(f"Extracted {len(df)} ads")
             
             return df
@@ -257,7 +710,9 @@ class FacebookAdsExtractor:
         start_date: str = None,
         end_date: str = None,
         time_increment: str = 'daily',
-        fields: List[str] = None
+        fields: List[str] = None,
+        options: Dict[str, Any] = None,
+        breakdowns: List[str] = None
     ) -> pd.DataFrame:
         """
         Extract insights (metrics) from Facebook Ads
@@ -269,10 +724,59 @@ class FacebookAdsExtractor:
             end_date: End date in YYYY-MM-DD format
             time_increment: 'daily' (1) or 'monthly' (all_days)
             fields: List of fields to extract
+            options: Overrides for INSIGHTS_OPTION_DEFAULTS (sharding, async report runs)
+            breakdowns: Breakdown set, e.g. ['age', 'gender'] (one row per combination)
             
         Returns:
             DataFrame with insights data
         """
+        fields, params = self._prepare_insights_request(
+            level, date_range, start_date, end_date, time_increment, fields, breakdowns
+        )
+        fields, derived = self._split_derived_fields(fields, options)
+        date_preset = self._date_preset(date_range, start_date, end_date)
+        
+        try:
+            insights_list = list(self._iter_insights(fields, params, options, date_preset))
+            
+            # Debug: contar resultados
+            logger.info(f"  Facebook API returned {len(insights_list)} raw records")
+            
+            if not insights_list:
+                logger.warning("No data returned from Facebook API")
+                return pd.DataFrame()
+            
+            return add_derived_metrics(self._insights_to_dataframe(insights_list), derived)
+            
+        except Exception as e:
+            logger.error(f"Error extracting insights: {e}")
+            raise
+    
+    def _prepare_insights_request(
+        self,
+        level: str,
+        date_range: int,
+        start_date: str,
+        end_date: str,
+        time_increment: str,
+        fields: List[str],
+        breakdowns: List[str] = None
+    ) -> Tuple[List[str], Dict[str, Any]]:
+        """
+        Build the fields list and request params for an insights request
+        
+        Args:
+            level: Aggregation level ('account', 'campaign', 'adset', 'ad')
+            date_range: Number of days to look back (alternative to start_date/end_date)
+            start_date: Start date in YYYY-MM-DD format
+            end_date: End date in YYYY-MM-DD format
+            time_increment: 'daily' (1) or 'monthly' (all_days)
+            fields: List of fields to extract
+            breakdowns: Breakdown set (rows are only keyed by the level's ID, no names)
+            
+        Returns:
+            Tuple of (fields, params)
+        """
         # Prepare fields list
         if fields is None:
             # Default fields if none specified
@@ -302,7 +806,11 @@ class FacebookAdsExtractor:
                 fields.insert(1, 'date_stop')
             
             # Add ID and name fields based on level (for grouping/identification)
-            if level == 'campaign':
+            if breakdowns:
+                # Breakdown tables are narrow: names and parent IDs live in the dimension tables
+                if level != 'account' and f"{level}_id" not in fields_str:
+                    fields.append(f"{level}_id")
+            elif level == 'campaign':
                 if 'campaign_id' not in fields_str:
                     fields.append('campaign_id')
                 if 'campaign_name' not in fields_str:
@@ -354,149 +862,1428 @@ class FacebookAdsExtractor:
             },
             'time_increment': time_increment_value,
         }
+        if breakdowns:
+            params['breakdowns'] = list(breakdowns)
         
-        try:
-            logger.info(f"Extracting insights from Facebook Ads...")
-            logger.info(f"  Level: {level}")
-            logger.info(f"  Date range: {start_dt} to {end_dt} ({(end_dt - start_dt).days + 1} days)")
-            logger.info(f"  Time increment: {time_increment_value}")
-            logger.info(f"  Fields ({len(fields)}): {fields}")
-            
-            insights = self.ad_account.get_insights(fields=fields, params=params)
-            
-            # Debug: contar resultados
-            insights_list = list(insights)
-            logger.info(f"  Facebook API returned {len(insights_list)} raw records")
-            
-            if not insights_list:
-                logger.warning("No data returned from Facebook API")
-                return pd.DataFrame()
-            
-            data = []
-            all_keys = set()  # Track all unique keys
-            
-            # First pass: collect all insights and identify all keys
-            for insight in insights_list:
-                insight_dict = dict(insight)
-                
-                # Clean up complex types (lists, dicts) - convert to JSON strings
-                # Also remove any None values that might cause issues
-                cleaned_dict = {}
-                for key, value in insight_dict.items():
-                    # Skip None values and invalid column names
-                    if value is None or key is None or str(key).lower() == 'nan':
-                        continue
-                    
-                    if isinstance(value, (list, dict)):
-                        # Convert complex types to JSON string
-                        try:
-                            cleaned_dict[key] = json.dumps(value)
-                        except:
-                            cleaned_dict[key] = str(value)
-                    else:
-                        cleaned_dict[key] = value
-                
-                if cleaned_dict:  # Only add if there are valid fields
-                    data.append(cleaned_dict)
-                    all_keys.update(cleaned_dict.keys())
-            
-            if not data:
-                logger.warning("No valid data extracted from insights")
-                return pd.DataFrame()
-            
-            # Second pass: normalize all dicts to have the same keys (fill missing with None)
-            normalized_data = []
-            for record in data:
-                normalized_record = {}
-                for key in all_keys:
-                    normalized_record[key] = record.get(key, None)
-                normalized_data.append(normalized_record)
-            
-            df = pd.DataFrame(normalized_data)
-            
-            # Expand complex action fields BEFORE cleaning
-            df = self._expand_action_fields(df)
-            
-            # Final cleanup: Remove any NaN column names and invalid names
-            # First remove columns where the name itself is NaN/None
-            df = df.loc[:, ~df.columns.isna()]
-            
-            # Then filter out columns with invalid string names
-            invalid_names = {'nan', 'none', 'nat', 'null', 'undefined'}
-            valid_columns = [
-                col for col in df.columns 
-                if str(col).strip().lower() not in invalid_names
-            ]
-            df = df[valid_columns]
-            
-            logger.info(f"DataFrame columns after cleaning: {list(df.columns)}")
-            
-            # Convert numeric columns
-            numeric_columns = ['impressions', 'clicks', 'spend', 'reach', 'frequency']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Convert percentage columns
-            percentage_columns = ['ctr', 'cpc', 'cpm']
-            for col in percentage_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Convert date columns
-            if 'date_start' in df.columns:
-                df['date_start'] = pd.to_datetime(df['date_start'])
-            if 'date_stop' in df.columns:
-                df['date_stop'] = pd.to_datetime(df['date_stop'])
-            
-            logger.info(f"Extracted {len(df)} insights records")
-            logger.info(f"DataFrame columns from extractor: {list(df.columns)}")
-            logger.info(f"DataFrame dtypes from extractor: {df.dtypes.to_dict()}")
-            
-            # Final check for 'nan' column
-            if 'nan' in [str(col).lower() for col in df.columns]:
-                logger.error(f"❌ FOUND 'nan' column in DataFrame! Columns: {list(df.columns)}")
-            
-            return df
-            
-        except Exception as e:
-            logger.error(f"Error extracting insights: {e}")
-            raise
+        return fields, params
     
-    def extract_table(self, table_config: Dict[str, Any]) -> pd.DataFrame:
+    def _iter_insights(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        options: Dict[str, Any] = None,
+        date_preset: Optional[str] = None
+    ) -> Iterator[Any]:
         """
-        Extract data based on table configuration
+        Iterate raw insights rows for a prepared request
         
         Args:
-            table_config: Table configuration from config file
+            fields: Fields to request
+            params: Insights params from _prepare_insights_request
+            options: Overrides for INSIGHTS_OPTION_DEFAULTS
+            date_preset: Relative range the params were resolved from (keys checkpoints)
             
-        Returns:
-            DataFrame with extracted data
+        Yields:
+            AdsInsights objects, in date order
         """
-        table_name = table_config.get('name')
-        fields = table_config.get('fields', [])
+        level = params['level']
+        time_increment_value = params['time_increment']
+        start_dt = datetime.strptime(params['time_range']['since'], '%Y-%m-%d').date()
+        end_dt = datetime.strptime(params['time_range']['until'], '%Y-%m-%d').date()
         
-        if table_name == 'campaigns':
-            return self.extract_campaigns(fields=fields if fields else None)
-        elif table_name == 'adsets':
-            return self.extract_adsets(fields=fields if fields else None)
-        elif table_name == 'ads':
-            return self.extract_ads(fields=fields if fields else None)
-        elif table_name == 'insights':
-            # Extract insights with configuration
-            date_range = table_config.get('date_range')
-            start_date = table_config.get('start_date')
-            end_date = table_config.get('end_date')
-            level = table_config.get('level', 'account')
-            time_increment = table_config.get('time_increment', 'daily')
-            
-            return self.extract_insights(
-                level=level,
-                date_range=date_range,
-                start_date=start_date,
-                end_date=end_date,
-                time_increment=time_increment,
-                fields=fields if fields else None
-            )
+        logger.info(f"Extracting insights from Facebook Ads...")
+        logger.info(f"  Level: {level}")
+        logger.info(f"  Date range: {start_dt} to {end_dt} ({(end_dt - start_dt).days + 1} days)")
+        logger.info(f"  Time increment: {time_increment_value}")
+        logger.info(f"  Fields ({len(fields)}): {fields}")
+        
+        options = {**INSIGHTS_OPTION_DEFAULTS, **(options or {})}
+        
+        checkpoint = None
+        if options.get('checkpoint_dir'):
+            if options.get('checkpoint_max_age_hours'):
+                prune_checkpoints(options['checkpoint_dir'], options['checkpoint_max_age_hours'])
+            run_id = self._insights_run_id(fields, params, options, date_preset)
+            checkpoint = InsightsCheckpoint(options['checkpoint_dir'], run_id)
+            if checkpoint.exists():
+                logger.info(f"  Resuming insights run {run_id} from checkpoints")
+            else:
+                logger.info(f"  Checkpointing insights run {run_id}")
+            options['_checkpoint'] = checkpoint
+        
+        if options.get('async_mode', 'auto') == 'auto' and options.get('async_threshold_rows'):
+            # Counted once per request; every date window reuses it for its row estimate
+            options['_level_entities'] = self._count_level_entities(level)
+        
+        if options.get('cache_dir') and time_increment_value == 1:
+            cache = get_insights_cache(options['cache_dir'], options['cache_max_mb'])
+            yield from self._iter_insights_cached(cache, fields, params, level, start_dt, end_dt, options)
         else:
-            raise ValueError(f"Unknown table name: {table_name}")
+            yield from self._iter_insights_range(fields, params, level, start_dt, end_dt, options)
+        
+        if checkpoint is not None:
+            # The run finished, nothing left to resume
+            checkpoint.clear()
+    
+    def _insights_run_id(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        options: Dict[str, Any],
+        date_preset: Optional[str] = None
+    ) -> str:
+        """Checkpoint run ID of an insights request (the configured run_id, or one derived from the request)"""
+        return options.get('run_id') or make_run_id(self.config.get('ad_account_id'), fields, params, date_preset)
+    
+    @staticmethod
+    def _date_preset(date_range: Optional[int], start_date: Optional[str], end_date: Optional[str]) -> Optional[str]:
+        """Relative range an insights request is resolved from (None for fixed dates)"""
+        if start_date is None or end_date is None:
+            return f"last_{date_range or 30}_days"
+        return None
+    
+    def _iter_insights_range(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        start_dt: date,
+        end_dt: date,
+        options: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """
+        Iterate insights rows for a date range from the API
+        
+        Args:
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            start_dt: Range start date
+            end_dt: Range end date
+            options: Insights options
+            
+        Yields:
+            AdsInsights objects, in date order
+        """
+        windows = self._build_date_windows(
+            start_dt, end_dt, options.get('window_size'), params['time_increment']
+        )
+        if len(windows) > 1:
+            yield from self._iter_insights_sharded(fields, params, level, windows, options)
+        else:
+            yield from self._iter_window_adaptive(fields, params, level, start_dt, end_dt, options)
+    
+    def _iter_insights_cached(
+        self,
+        cache: InsightsCache,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        start_dt: date,
+        end_dt: date,
+        options: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """
+        Iterate daily insights rows, serving settled days from the local cache
+        
+        Days older than cache_settling_days no longer change, so they are read
+        from the cache when present and stored after being fetched. Recent
+        days are always fetched from the API.
+        
+        Args:
+            cache: Insights cache
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            start_dt: Range start date
+            end_dt: Range end date
+            options: Insights options
+            
+        Yields:
+            Row dicts (cached days) or AdsInsights objects, in date order
+        """
+        key = cache.make_key(self.config.get('ad_account_id'), fields, params)
+        settled_until = min(end_dt, date.today() - timedelta(days=int(options['cache_settling_days'])))
+        
+        # Group settled days into runs of cached and missing days
+        segments = []  # [since, until, cached]
+        day = start_dt
+        while day <= settled_until:
+            cached = cache.has(key, day)
+            if (segments and segments[-1][2] == cached and
+                    (cached or (day - segments[-1][0]).days < CACHE_SEGMENT_DAYS)):
+                segments[-1][1] = day
+            else:
+                segments.append([day, day, cached])
+            day += timedelta(days=1)
+        
+        cached_days = sum((until - since).days + 1 for since, until, cached in segments if cached)
+        total_days = (end_dt - start_dt).days + 1
+        logger.info(f"  Insights cache: {cached_days} of {total_days} days served from cache")
+        
+        for since, until, cached in segments:
+            if not cached:
+                yield from self._iter_and_cache(cache, key, fields, params, level, since, until, options)
+                continue
+            
+            day = since
+            while day <= until:
+                rows = cache.get(key, day)
+                if rows is None:
+                    # Evicted since the lookup
+                    yield from self._iter_and_cache(cache, key, fields, params, level, day, day, options)
+                else:
+                    yield from rows
+                day += timedelta(days=1)
+        
+        if settled_until < end_dt:
+            recent_start = max(start_dt, settled_until + timedelta(days=1))
+            yield from self._iter_insights_range(fields, params, level, recent_start, end_dt, options)
+    
+    def _iter_and_cache(
+        self,
+        cache: InsightsCache,
+        key: str,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        since: date,
+        until: date,
+        options: Dict[str, Any]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch settled days from the API and store them in the cache
+        
+        The days are only stored once the whole range has been read.
+        
+        Args:
+            cache: Insights cache
+            key: Request key from InsightsCache.make_key
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            since: First day to fetch
+            until: Last day to fetch
+            options: Insights options
+            
+        Yields:
+            Row dicts, in date order
+        """
+        with cache.writer(key) as writer:
+            for insight in self._iter_insights_range(fields, params, level, since, until, options):
+                record = insight if isinstance(insight, dict) else dict(insight)
+                writer.add(date.fromisoformat(record['date_start']), record)
+                yield record
+            
+            writer.commit(since + timedelta(days=offset) for offset in range((until - since).days + 1))
+    
+    @staticmethod
+    def _split_derived_fields(fields: List[Any], options: Dict[str, Any] = None) -> Tuple[List[Any], List[str]]:
+        """
+        Request base counters instead of ratio metrics when derived_metrics is on
+        
+        Args:
+            fields: Prepared insights fields
+            options: Insights options
+            
+        Returns:
+            Tuple of (fields to request, derived fields to compute locally)
+        """
+        if not (options or {}).get('derived_metrics'):
+            return fields, []
+        request_fields, derived = split_derived_metrics(fields)
+        if derived:
+            logger.info(f"  Computing {derived} locally from base counters")
+        return request_fields, derived
+    
+    def _insights_to_dataframe(self, insights_list: List[Any]) -> pd.DataFrame:
+        """
+        Build a clean insights DataFrame from raw API rows
+        
+        Args:
+            insights_list: AdsInsights objects (or dicts)
+            
+        Returns:
+            DataFrame with expanded action columns and typed metrics
+        """
+        # Single pass: append every value straight into its column
+        # Complex types (lists, dicts) stay native until the action fields are expanded
+        columns = ColumnarAccumulator()
+        for insight in insights_list:
+            columns.append(insight if isinstance(insight, dict) else dict(insight))
+        
+        if not columns.rows:
+            logger.warning("No valid data extracted from insights")
+            return pd.DataFrame()
+        
+        df = columns.to_dataframe()
+        complex_keys = columns.complex_keys  # Keys holding lists/dicts (JSON encoded after expansion)
+        
+        # Expand complex action fields BEFORE cleaning
+        source_columns = set(df.columns)
+        df = self._expand_action_fields(df)
+        expanded_columns = [col for col in df.columns if col not in source_columns]
+        
+        # Columns that still hold lists/dicts are stored as JSON TEXT
+        df = self._encode_complex_columns(df, complex_keys)
+        
+        # Final cleanup: Remove any NaN column names and invalid names
+        # First remove columns where the name itself is NaN/None
+        df = df.loc[:, ~df.columns.isna()]
+        
+        # Then filter out columns with invalid string names
+        invalid_names = {'nan', 'none', 'nat', 'null', 'undefined'}
+        valid_columns = [
+            col for col in df.columns 
+            if str(col).strip().lower() not in invalid_names
+        ]
+        df = df[valid_columns]
+        
+        logger.info(f"DataFrame columns after cleaning: {list(df.columns)}")
+        
+        # Convert metrics, IDs, names and dates to compact dtypes in one step
+        df = apply_field_types(
+            df, 'insights', extra_types={col: EXPANDED_FIELD_TYPE for col in expanded_columns}
+        )
+        
+        logger.info(f"Extracted {len(df)} insights records")
+        logger.info(f"DataFrame columns from extractor: {list(df.columns)}")
+        logger.info(f"DataFrame dtypes from extractor: {df.dtypes.to_dict()}")
+        
+        # Final check for 'nan' column
+        if 'nan' in [str(col).lower() for col in df.columns]:
+            logger.error(f"❌ FOUND 'nan' column in DataFrame! Columns: {list(df.columns)}")
+        
+        return df
+    
+    def _should_use_async_report(
+        self,
+        level: str,
+        start_dt: date,
+        end_dt: date,
+        time_increment_value: Any,
+        options: Dict[str, Any]
+    ) -> bool:
+        """
+        Decide whether insights should be requested through async report runs
+        
+        Args:
+            level: Aggregation level
+            start_dt: Start date
+            end_dt: End date
+            time_increment_value: time_increment value sent to the API
+            options: Insights options
+            
+        Returns:
+            True if the request is large enough to use AdReportRun jobs
+        """
+        mode = options.get('async_mode', 'auto')
+        if mode == 'always':
+            return True
+        if mode == 'never':
+            return False
+        
+        days = (end_dt - start_dt).days + 1
+        threshold_days = options.get('async_threshold_days')
+        if threshold_days and days > threshold_days:
+            logger.info(f"  Using async report runs: {days} days > {threshold_days} day threshold")
+            return True
+        
+        threshold_rows = options.get('async_threshold_rows')
+        if threshold_rows:
+            entities = options.get('_level_entities')
+            if entities is None:
+                entities = self._count_level_entities(level)
+            estimated_rows = self._estimate_insights_rows(days, time_increment_value, entities)
+            if estimated_rows > threshold_rows:
+                logger.info(
+                    f"  Using async report runs: ~{estimated_rows} rows > {threshold_rows} row threshold"
+                )
+                return True
+        
+        return False
+    
+    @staticmethod
+    def _estimate_insights_rows(days: int, time_increment_value: Any, entities: int) -> int:
+        """
+        Estimate the number of rows an insights request will return
+        
+        Uses the number of time buckets in the range times the number of
+        entities at the requested level.
+        
+        Args:
+            days: Number of days in the range
+            time_increment_value: time_increment value sent to the API
+            entities: Entities at the requested level (from _count_level_entities)
+            
+        Returns:
+            Estimated number of rows
+        """
+        if time_increment_value == 1:
+            buckets = days
+        elif time_increment_value == 'monthly':
+            buckets = max(1, round(days / 30))
+        else:
+            buckets = 1
+        
+        return buckets * entities
+    
+    def _count_level_entities(self, level: str) -> int:
+        """
+        Count the campaigns, adsets or ads of the account for row estimates
+        
+        Reads the edge's total_count from a one-row request (the cursor loads
+        its first page, with the summary, when it is created).
+        
+        Args:
+            level: Aggregation level
+            
+        Returns:
+            Number of entities at the level (1 for the account level or if unknown)
+        """
+        entity_edges = {
+            'campaign': self.ad_account.get_campaigns,
+            'adset': self.ad_account.get_ad_sets,
+            'ad': self.ad_account.get_ads,
+        }
+        if level not in entity_edges:
+            return 1
+        try:
+            cursor = entity_edges[level](params={'summary': 'total_count', 'limit': 1})
+            return max(1, cursor.total())
+        except Exception as e:
+            logger.debug(f"Could not count {level} entities for row estimate: {e}")
+            return 1
+    
+    @staticmethod
+    def _build_date_windows(
+        start_dt: date,
+        end_dt: date,
+        window_size: Any,
+        time_increment_value: Any
+    ) -> List[Tuple[date, date]]:
+        """
+        Split an inclusive date range into consecutive windows
+        
+        Windows never change the shape of the result: with time_increment
+        'all_days' the range is never split, and with 'monthly' windows are
+        aligned to calendar months.
+        
+        Args:
+            start_dt: Start date
+            end_dt: End date
+            window_size: Days per window, or 'month'; None/0 disables splitting
+            time_increment_value: time_increment value sent to the API
+            
+        Returns:
+            List of (since, until) tuples covering the whole range
+        """
+        if not window_size or time_increment_value == 'all_days':
+            return [(start_dt, end_dt)]
+        
+        if time_increment_value == 'monthly' and window_size != 'month':
+            window_size = 'month'
+        
+        windows = []
+        window_start = start_dt
+        while window_start <= end_dt:
+            if window_size == 'month':
+                next_month = (window_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+                window_end = min(next_month - timedelta(days=1), end_dt)
+            else:
+                window_end = min(window_start + timedelta(days=int(window_size) - 1), end_dt)
+            windows.append((window_start, window_end))
+            window_start = window_end + timedelta(days=1)
+        return windows
+    
+    def _iter_insights_window(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        since: date,
+        until: date,
+        options: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """
+        Iterate insights rows for a single date window as pages arrive
+        
+        Uses async report runs when the window is above the async thresholds.
+        
+        Args:
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            since: Window start date
+            until: Window end date
+            options: Insights options
+            
+        Yields:
+            AdsInsights objects
+        """
+        window_params = dict(params)
+        window_params['time_range'] = {
+            'since': since.strftime('%Y-%m-%d'),
+            'until': until.strftime('%Y-%m-%d'),
+        }
+        
+        use_async = self._should_use_async_report(level, since, until, params['time_increment'], options)
+        checkpoint = options.get('_checkpoint')
+        
+        if checkpoint is not None:
+            yield from self._iter_window_checkpointed(
+                checkpoint.window(since, until, params.get('filtering')), fields, window_params, since, until, options, use_async
+            )
+        elif use_async:
+            yield from self._fetch_insights_async(fields, window_params, since, until, options)
+        else:
+            window_params['limit'] = options.get('page_size')
+            yield from self.ad_account.get_insights(fields=list(fields), params=window_params)
+    
+    def _iter_window_checkpointed(
+        self,
+        window: WindowCheckpoint,
+        fields: List[str],
+        window_params: Dict[str, Any],
+        since: date,
+        until: date,
+        options: Dict[str, Any],
+        use_async: bool
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate a date window, spooling each page and resuming from earlier attempts
+        
+        Sync windows continue from the paging cursor after the last spooled
+        page. Async report runs can't be resumed half way, so an unfinished
+        async window starts over.
+        
+        Args:
+            window: Checkpoint of the window
+            fields: Fields to request
+            window_params: Insights params for the window
+            since: Window start date
+            until: Window end date
+            options: Insights options
+            use_async: Whether the window is fetched with report runs
+            
+        Yields:
+            Row dicts
+        """
+        if not window.is_current(until):
+            logger.info(
+                f"  Window {since} to {until}: checkpoint fetched on {window.fetched_on} "
+                f"before the window ended, fetching it again"
+            )
+            window.reset()
+        
+        if window.done:
+            logger.info(f"  Window {since} to {until}: {window.rows} records from checkpoint")
+            yield from window.iter_rows()
+            return
+        
+        page_size = options.get('page_size')
+        
+        if use_async:
+            window.reset()
+            page = []
+            for insight in self._fetch_insights_async(fields, window_params, since, until, options):
+                page.append(insight if isinstance(insight, dict) else dict(insight))
+                if len(page) >= page_size:
+                    window.add_page(page, None)
+                    yield from page
+                    page = []
+            window.add_page(page, None, done=True)
+            yield from page
+            return
+        
+        page_after = window.after
+        if window.pages:
+            logger.info(
+                f"  Window {since} to {until}: resuming after page {window.pages} "
+                f"({window.rows} records from checkpoint)"
+            )
+            yield from window.iter_rows()
+            window_params['after'] = page_after
+        
+        window_params['limit'] = page_size
+        cursor = self.ad_account.get_insights(fields=list(fields), params=window_params)
+        while True:
+            page = [cursor[i] if isinstance(cursor[i], dict) else dict(cursor[i]) for i in range(len(cursor))]
+            next_after = cursor.params.get('after')
+            # The cursor keeps its last 'after' once there are no more pages
+            last_page = next_after is None or next_after == page_after
+            
+            window.add_page(page, None if last_page else next_after, done=last_page)
+            yield from page
+            
+            if last_page:
+                return
+            if not cursor.load_next_page():
+                window.complete()
+                return
+            page_after = next_after
+    
+    def _iter_window_adaptive(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        since: date,
+        until: date,
+        options: Dict[str, Any],
+        split_depth: int = 0
+    ) -> Iterator[Any]:
+        """
+        Iterate a date window, splitting it whenever the API reports too much data
+        
+        Daily windows are halved; single days (or non-daily increments) are
+        split into batches of campaigns. A request is only split if the error
+        arrives before any of its rows were yielded, so no row is ever
+        produced twice.
+        
+        Args:
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            since: Window start date
+            until: Window end date
+            options: Insights options
+            split_depth: Splits made so far (limited by retry.reduce_data.max_splits)
+            
+        Yields:
+            AdsInsights objects for the whole window
+        """
+        yielded = False
+        try:
+            for insight in self._iter_insights_window(fields, params, level, since, until, options):
+                yielded = True
+                yield insight
+        except FacebookRequestError as e:
+            if (yielded or not is_reduce_data_error(e)
+                    or split_depth >= retry_policy.setting('reduce_data', 'max_splits')):
+                raise
+            
+            days = (until - since).days + 1
+            if days >= 2 and params['time_increment'] == 1:
+                middle = since + timedelta(days=days // 2 - 1)
+                logger.warning(
+                    f"  Too much data for {since} to {until}, splitting into "
+                    f"{since} to {middle} and {middle + timedelta(days=1)} to {until}"
+                )
+                yield from self._iter_window_adaptive(
+                    fields, params, level, since, middle, options, split_depth + 1
+                )
+                yield from self._iter_window_adaptive(
+                    fields, params, level, middle + timedelta(days=1), until, options, split_depth + 1
+                )
+            elif level in ('campaign', 'adset', 'ad') and not self._campaign_filter(params):
+                # Rows of these levels belong to a single campaign, so campaign batches don't overlap
+                campaign_ids = self._list_campaign_ids()
+                batch_size = int(retry_policy.setting('reduce_data', 'campaign_batch_size'))
+                logger.warning(
+                    f"  Too much data for {since} to {until}, splitting {len(campaign_ids)} "
+                    f"campaigns into batches of {batch_size}"
+                )
+                for start in range(0, len(campaign_ids), batch_size):
+                    yield from self._iter_window_adaptive(
+                        fields, self._with_campaign_filter(params, campaign_ids[start:start + batch_size]),
+                        level, since, until, options, split_depth + 1
+                    )
+            elif len(self._campaign_filter(params)) > 1:
+                campaign_ids = self._campaign_filter(params)
+                middle = len(campaign_ids) // 2
+                logger.warning(
+                    f"  Too much data for {len(campaign_ids)} campaigns ({since} to {until}), "
+                    f"splitting into batches of {middle} and {len(campaign_ids) - middle}"
+                )
+                for batch in (campaign_ids[:middle], campaign_ids[middle:]):
+                    yield from self._iter_window_adaptive(
+                        fields, self._with_campaign_filter(params, batch),
+                        level, since, until, options, split_depth + 1
+                    )
+            else:
+                raise
+    
+    @staticmethod
+    def _campaign_filter(params: Dict[str, Any]) -> List[str]:
+        """Campaign IDs an insights request is restricted to (empty if none)"""
+        for condition in params.get('filtering', []):
+            if condition.get('field') == 'campaign.id' and condition.get('operator') == 'IN':
+                return condition['value']
+        return []
+    
+    @staticmethod
+    def _with_campaign_filter(params: Dict[str, Any], campaign_ids: List[str]) -> Dict[str, Any]:
+        """Copy insights params restricted to a batch of campaigns"""
+        filtering = [
+            condition for condition in params.get('filtering', [])
+            if condition.get('field') != 'campaign.id'
+        ]
+        filtering.append({'field': 'campaign.id', 'operator': 'IN', 'value': list(campaign_ids)})
+        return {**params, 'filtering': filtering}
+    
+    def _list_campaign_ids(self) -> List[str]:
+        """
+        List the IDs of every campaign of the account, including deleted and archived ones
+        
+        Returns:
+            Campaign IDs (cached for the extractor's lifetime)
+        """
+        if self._campaign_ids is None:
+            params = self._dimension_params(Campaign, include_deleted=True)
+            self._campaign_ids = [
+                record['id'] for record in self.ad_account.get_campaigns(fields=['id'], params=params)
+            ]
+        return self._campaign_ids
+    
+    def _fetch_window(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        since: date,
+        until: date,
+        options: Dict[str, Any]
+    ) -> List[Any]:
+        """Fetch a whole date window into a list (used by sharding workers)"""
+        return list(self._iter_window_adaptive(fields, params, level, since, until, options))
+    
+    def _iter_insights_sharded(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        level: str,
+        windows: List[Tuple[date, date]],
+        options: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """
+        Fetch insights for several date windows concurrently
+        
+        Windows are yielded in date order. Only max_workers windows are
+        fetched ahead of the consumer, so memory stays bounded by the
+        window size rather than the whole range.
+        
+        Args:
+            fields: Fields to request
+            params: Base insights params
+            level: Aggregation level
+            windows: (since, until) windows covering the requested range
+            options: Insights options
+            
+        Yields:
+            AdsInsights objects, in window order
+        """
+        max_workers = max(1, min(int(options.get('max_workers') or 1), len(windows)))
+        logger.info(f"  Sharding into {len(windows)} date windows with {max_workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='insights') as executor:
+            pending = list(windows)
+            in_flight = []  # (window, future), in window order
+            
+            while pending or in_flight:
+                while pending and len(in_flight) < max_workers:
+                    since, until = pending.pop(0)
+                    future = executor.submit(self._fetch_window, fields, params, level, since, until, options)
+                    in_flight.append(((since, until), future))
+                
+                (since, until), future = in_flight.pop(0)
+                window_rows = future.result()
+                logger.info(f"  Window {since} to {until}: {len(window_rows)} records")
+                yield from window_rows
+    
+    def _fetch_insights_async(
+        self,
+        fields: List[str],
+        params: Dict[str, Any],
+        start_dt: date,
+        end_dt: date,
+        options: Dict[str, Any]
+    ) -> Iterable[Any]:
+        """
+        Fetch insights through async report runs (AdReportRun)
+        
+        The date range is split into chunks of async_chunk_days, one report run
+        per chunk. At most async_max_jobs runs of this extractor are in flight
+        at any time, across every window, breakdown set and level fetched
+        concurrently; each completed run is paged and its rows yielded before
+        its slot is reused.
+        
+        Args:
+            fields: Fields to request
+            params: Base insights params (level, time_increment, time_range)
+            start_dt: Start date
+            end_dt: End date
+            options: Insights options
+            
+        Yields:
+            AdsInsights objects from the completed report runs
+        """
+        windows = self._build_date_windows(
+            start_dt, end_dt, options.get('async_chunk_days'), params['time_increment']
+        )
+        max_jobs = max(1, int(options.get('async_max_jobs') or 1))
+        poll_interval = options.get('async_poll_interval', 5)
+        timeout = options.get('async_timeout', 3600)
+        page_size = options.get('page_size')
+        
+        logger.info(f"  Async report mode: {len(windows)} report run(s), up to {max_jobs} in flight")
+        
+        pending = list(windows)
+        running = []  # (report_run, window, submitted_at)
+        slots = self._report_run_slots
+        held = 0  # Slots taken by this call (submitting or running)
+        
+        try:
+            while pending or running:
+                # Submit new report runs while there are free slots; wait for one if nothing is running
+                while pending and slots.acquire(max_jobs, blocking=not running):
+                    held += 1
+                    since, until = pending.pop(0)
+                    job_params = dict(params)
+                    job_params['time_range'] = {
+                        'since': since.strftime('%Y-%m-%d'),
+                        'until': until.strftime('%Y-%m-%d'),
+                    }
+                    report_run = self.ad_account.get_insights(
+                        fields=list(fields), params=job_params, is_async=True
+                    )
+                    running.append((report_run, (since, until), time.monotonic()))
+                    logger.info(f"  Submitted report run {report_run.get_id()} for {since} to {until}")
+                
+                time.sleep(poll_interval)
+                
+                # Poll running jobs and drain the completed ones
+                still_running = []
+                for report_run, (since, until), submitted_at in running:
+                    report_run.api_get(fields=[
+                        AdReportRun.Field.async_status,
+                        AdReportRun.Field.async_percent_completion,
+                    ])
+                    status = report_run[AdReportRun.Field.async_status]
+                    percent = report_run[AdReportRun.Field.async_percent_completion]
+                    
+                    if status == 'Job Completed':
+                        logger.info(f"  Report run {report_run.get_id()} completed ({since} to {until})")
+                        for insight in report_run.get_insights(params={'limit': page_size}):
+                            yield insight
+                        slots.release()
+                        held -= 1
+                    elif status in ('Job Failed', 'Job Skipped'):
+                        raise RuntimeError(
+                            f"Async report run {report_run.get_id()} for {since} to {until} ended with status '{status}'"
+                        )
+                    elif time.monotonic() - submitted_at > timeout:
+                        raise TimeoutError(
+                            f"Async report run {report_run.get_id()} for {since} to {until} "
+                            f"did not complete within {timeout}s ({percent}%)"
+                        )
+                    else:
+                        logger.debug(f"  Report run {report_run.get_id()}: {status} ({percent}%)")
+                        still_running.append((report_run, (since, until), submitted_at))
+                running = still_running
+        finally:
+            # Errors and abandoned generators give their slots back
+            slots.release(held)
+    
+    @staticmethod
+    def _insights_table_args(table_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Read extract_insights arguments from an insights table configuration
+        
+        Args:
+            table_config: Table configuration from config file
+            
+        Returns:
+            Keyword arguments for extract_insights
+        """
+        fields = table_config.get('fields', [])
+        return {
+            'level': table_config.get('level', 'account'),
+            'date_range': table_config.get('date_range'),
+            'start_date': table_config.get('start_date'),
+            'end_date': table_config.get('end_date'),
+            'time_increment': table_config.get('time_increment', 'daily'),
+            'fields': fields if fields else None,
+            'options': {
+                key: table_config[key] for key in INSIGHTS_OPTION_DEFAULTS if key in table_config
+            },
+            'breakdowns': table_config.get('breakdowns') or None,
+        }
+    
+    @staticmethod
+    def _dimension_table_args(table_config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the listing arguments for a campaigns, adsets or ads table config
+        
+        Args:
+            table_config: Table configuration (updated_since is set by incremental syncs)
+            
+        Returns:
+            Keyword arguments for the dimension extract and iterate methods
+        """
+        return {
+            'page_size': table_config.get('page_size'),
+            'updated_since': table_config.get('updated_since'),
+            'include_deleted': table_config.get('include_deleted', False),
+        }
+    
+    def extract_table(self, table_config: Dict[str, Any]) -> pd.DataFrame:
+        """
+        Extract data based on table configuration
+        
+        Args:
+            table_config: Table configuration from config file
+            
+        Returns:
+            DataFrame with extracted data
+        """
+        table_name = table_config.get('name')
+        fields = table_config.get('fields', [])
+        
+        dimension_args = self._dimension_table_args(table_config)
+        
+        if table_name == 'campaigns':
+            return self.extract_campaigns(fields=fields if fields else None, **dimension_args)
+        elif table_name == 'adsets':
+            return self.extract_adsets(fields=fields if fields else None, **dimension_args)
+        elif table_name == 'ads':
+            return self.extract_ads(fields=fields if fields else None, **dimension_args)
+        elif table_name == 'insights':
+            # Extract insights with configuration
+            return self.extract_insights(**self._insights_table_args(table_config))
+        else:
+            raise ValueError(f"Unknown table name: {table_name}")
+    
+    @staticmethod
+    def _chunk_records(records: Iterable[Any], chunk_rows: int) -> Iterator[List[Any]]:
+        """
+        Group an iterable of records into lists of at most chunk_rows items
+        
+        Args:
+            records: Records to group
+            chunk_rows: Maximum records per chunk
+            
+        Yields:
+            Lists of records
+        """
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    
+    def iter_table(self, table_config: Dict[str, Any], chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+        """
+        Extract data based on table configuration as bounded DataFrame chunks
+        
+        Rows are read from the API page by page and emitted every chunk_rows
+        rows, so memory depends on the chunk size instead of the account history.
+        
+        Args:
+            table_config: Table configuration from config file
+            chunk_rows: Maximum rows per chunk (None = a single chunk with all rows)
+            
+        Yields:
+            Non-empty DataFrames with extracted data
+        """
+        table_name = table_config.get('name')
+        
+        if not chunk_rows:
+            df = self.extract_table(table_config)
+            if not df.empty:
+                yield df
+            return
+        
+        fields = table_config.get('fields', [])
+        fields = fields if fields else None
+        dimension_iterators = {
+            'campaigns': self._iter_campaigns,
+            'adsets': self._iter_adsets,
+            'ads': self._iter_ads,
+        }
+        
+        try:
+            if table_name in dimension_iterators:
+                logger.info(f"Extracting {table_name} from Facebook Ads in chunks of {chunk_rows} rows...")
+                records = dimension_iterators[table_name](fields, **self._dimension_table_args(table_config))
+                to_dataframe = lambda chunk: apply_field_types(pd.DataFrame(chunk), table_name)
+            elif table_name == 'insights':
+                args = self._insights_table_args(table_config)
+                insights_fields, params = self._prepare_insights_request(
+                    args['level'], args['date_range'], args['start_date'],
+                    args['end_date'], args['time_increment'], args['fields'], args['breakdowns']
+                )
+                insights_fields, derived = self._split_derived_fields(insights_fields, args['options'])
+                date_preset = self._date_preset(args['date_range'], args['start_date'], args['end_date'])
+                records = self._iter_insights(insights_fields, params, args['options'], date_preset)
+                to_dataframe = lambda chunk: add_derived_metrics(self._insights_to_dataframe(chunk), derived)
+            else:
+                raise ValueError(f"Unknown table name: {table_name}")
+            
+            total_rows = 0
+            for chunk_number, chunk in enumerate(self._chunk_records(records, chunk_rows), start=1):
+                df = to_dataframe(chunk)
+                if df.empty:
+                    continue
+                total_rows += len(df)
+                logger.info(f"Extracted chunk {chunk_number} of {table_name}: {len(df)} rows ({total_rows} total)")
+                yield df
+            
+        except Exception as e:
+            logger.error(f"Error extracting {table_name}: {e}")
+            raise
+    
+    def iter_table_chunks(
+        self,
+        table_config: Dict[str, Any],
+        chunk_rows: int = None
+    ) -> Iterator[Tuple[str, pd.DataFrame, Optional[List[str]]]]:
+        """
+        Extract a table configuration into the source tables it produces
+        
+        Plain tables produce themselves; insights_breakdowns produces one table
+        per breakdown set and insights with rollup_levels one extra table per
+        rolled-up level.
+        
+        Args:
+            table_config: Table configuration from config file
+            chunk_rows: Maximum rows per chunk (None = a single chunk per table)
+            
+        Yields:
+            Tuples of (source table name, DataFrame chunk, upsert key columns or None)
+        """
+        table_name = table_config.get('name')
+        
+        if table_name == BREAKDOWNS_TABLE:
+            level = table_config.get('level', 'account')
+            key_columns = {
+                breakdown_table_name(breakdowns): breakdown_key_columns(level, breakdowns)
+                for breakdowns in breakdown_sets(table_config)
+            }
+            for name, df in self.iter_breakdown_tables(table_config, chunk_rows):
+                yield name, df, key_columns[name]
+        elif table_name == 'insights' and table_config.get('rollup_levels'):
+            if table_config.get('breakdowns'):
+                raise ValueError("rollup_levels can't be combined with breakdowns")
+            yield from self._iter_insights_rollup(table_config, chunk_rows)
+        else:
+            for df in self.iter_table(table_config, chunk_rows):
+                yield table_name, df, None
+    
+    def _iter_insights_rollup(
+        self,
+        table_config: Dict[str, Any],
+        chunk_rows: int = None
+    ) -> Iterator[Tuple[str, pd.DataFrame, Optional[List[str]]]]:
+        """
+        Extract insights at the configured level and roll them up to coarser levels
+        
+        Only the finest level is requested in full. Additive metrics of the
+        coarser levels are summed locally, chunk by chunk; non-additive ones
+        (reach, frequency, ratios) are requested per coarser level with only
+        those fields and merged in. With derived_metrics the ratios are
+        computed from the rolled-up counters instead.
+        
+        Args:
+            table_config: Insights table configuration with rollup_levels
+            chunk_rows: Maximum rows per chunk (None = a single chunk per table)
+            
+        Yields:
+            ('insights', chunk, None) for the configured level, then
+            ('insights_<level>', chunk, key columns) for every rolled-up level
+        """
+        args = self._insights_table_args(table_config)
+        level = args['level']
+        
+        rollup_levels = []
+        for rollup_level in table_config.get('rollup_levels') or []:
+            if rollup_level not in INSIGHTS_LEVELS or INSIGHTS_LEVELS.index(rollup_level) >= INSIGHTS_LEVELS.index(level):
+                logger.warning(f"Cannot roll up {level} insights to '{rollup_level}' level, skipping it")
+            elif rollup_level not in rollup_levels:
+                rollup_levels.append(rollup_level)
+        
+        fields, params = self._prepare_insights_request(
+            level, args['date_range'], args['start_date'], args['end_date'],
+            args['time_increment'], args['fields'], args['breakdowns']
+        )
+        # The finest rows carry the IDs and names of every level they are rolled up to
+        for rollup_level in rollup_levels:
+            for column in LEVEL_COLUMNS[rollup_level]:
+                if column not in [str(field) for field in fields]:
+                    fields.append(column)
+        # Derived ratios are computed after the roll-up instead of requested per level
+        fields, derived = self._split_derived_fields(fields, args['options'])
+        
+        identity_fields = {'date_start', 'date_stop', 'account_id', 'account_name', *LEVEL_COLUMNS['ad']}
+        non_additive_fields = [
+            str(field) for field in fields
+            if str(field) not in ADDITIVE_INSIGHTS_FIELDS and str(field) not in identity_fields
+        ]
+        logger.info(
+            f"Rolling up {level} insights to {rollup_levels}; "
+            f"non-additive fields requested per level: {non_additive_fields}"
+        )
+        
+        # Per-chunk partial sums (small: one row per coarser entity and day)
+        partials = {rollup_level: [] for rollup_level in rollup_levels}
+        date_preset = self._date_preset(args['date_range'], args['start_date'], args['end_date'])
+        records = self._iter_insights(fields, params, args['options'], date_preset)
+        for chunk in self._chunk_records(records, chunk_rows or float('inf')):
+            df = add_derived_metrics(self._insights_to_dataframe(chunk), derived)
+            if df.empty:
+                continue
+            for rollup_level in rollup_levels:
+                partials[rollup_level].append(self._rollup_insights(df, rollup_level))
+            yield 'insights', df, None
+        
+        for rollup_level in rollup_levels:
+            if not partials[rollup_level]:
+                continue
+            rolled = self._rollup_insights(pd.concat(partials[rollup_level], ignore_index=True), rollup_level)
+            partials[rollup_level] = None
+            
+            if non_additive_fields:
+                options = dict(args['options'])
+                if options.get('checkpoint_dir'):
+                    # Levels are fetched for the resolved dates; key them on the finest run, not on those dates
+                    run_id = self._insights_run_id(fields, params, options, date_preset)
+                    options['run_id'] = f"{run_id}_{rollup_level}"
+                fetched = self.extract_insights(
+                    level=rollup_level,
+                    date_range=args['date_range'],
+                    start_date=params['time_range']['since'],
+                    end_date=params['time_range']['until'],
+                    time_increment=args['time_increment'],
+                    fields=non_additive_fields,
+                    options=options,
+                )
+                rolled = self._merge_rollup(rolled, fetched, rollup_level)
+            rolled = add_derived_metrics(rolled, derived)
+            
+            name = f"insights_{rollup_level}"
+            logger.info(f"Rolled up {len(rolled)} {name} rows")
+            step = chunk_rows or max(1, len(rolled))
+            for start in range(0, len(rolled), step):
+                yield name, rolled.iloc[start:start + step], rollup_key_columns(rollup_level)
+    
+    @staticmethod
+    def _rollup_insights(df: pd.DataFrame, level: str) -> pd.DataFrame:
+        """
+        Sum the additive metrics of finer-level insights rows per coarser-level row
+        
+        Args:
+            df: Insights DataFrame (or partial sums of an earlier roll-up)
+            level: Level to roll up to
+            
+        Returns:
+            One row per date and level entity with the summed metrics
+        """
+        keys = [
+            column for column in ['account_id', 'date_start', 'date_stop', *LEVEL_COLUMNS[level]]
+            if column in df.columns
+        ]
+        metrics = [
+            column for column in df.columns
+            if column not in keys
+            and (column in ADDITIVE_INSIGHTS_FIELDS or column.startswith(ADDITIVE_COLUMN_PREFIXES))
+            and pd.api.types.is_numeric_dtype(df[column])
+        ]
+        # min_count=1 keeps a metric missing (not 0) when no finer row reported it
+        return (
+            df.groupby(keys, observed=True, dropna=False, sort=False)[metrics]
+            .sum(min_count=1)
+            .reset_index()
+        )
+    
+    @staticmethod
+    def _merge_rollup(rolled: pd.DataFrame, fetched: pd.DataFrame, level: str) -> pd.DataFrame:
+        """
+        Merge non-additive metrics requested at a coarser level into its rolled-up rows
+        
+        Args:
+            rolled: Rolled-up additive metrics
+            fetched: Insights requested at the coarser level (non-additive fields)
+            level: Coarser level
+            
+        Returns:
+            Rolled-up rows with the non-additive metrics added
+        """
+        if fetched.empty:
+            return rolled
+        keys = [
+            column for column in ['date_start', 'date_stop', f"{level}_id"]
+            if column in rolled.columns and column in fetched.columns
+        ]
+        # Metrics requested at this level win over same-named rolled-up columns
+        identity_columns = {'account_id', 'account_name', 'date_start', 'date_stop', *LEVEL_COLUMNS[level]}
+        rolled = rolled.drop(columns=[
+            column for column in fetched.columns
+            if column in rolled.columns and column not in identity_columns
+        ])
+        extra_columns = [column for column in fetched.columns if column not in rolled.columns]
+        return rolled.merge(fetched[keys + extra_columns], on=keys, how='outer')
+    
+    def iter_breakdown_tables(
+        self,
+        table_config: Dict[str, Any],
+        chunk_rows: int = None
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Extract every breakdown set of an insights_breakdowns table in parallel
+        
+        Each set is one job with its own worker thread (and its own date-window
+        shards). Chunks are handed over through a bounded queue, so at most a
+        few chunks per worker are held ahead of the loader.
+        
+        Args:
+            table_config: insights_breakdowns table configuration
+            chunk_rows: Maximum rows per chunk (None = one chunk per set)
+            
+        Yields:
+            Tuples of (source table name, DataFrame chunk), e.g. ('insights_age_gender', df)
+            
+        Raises:
+            RuntimeError: If any set failed, once the other sets are extracted
+        """
+        jobs = [
+            (breakdown_table_name(breakdowns), breakdown_table_config(table_config, breakdowns))
+            for breakdowns in breakdown_sets(table_config)
+        ]
+        if not jobs:
+            logger.warning(f"No breakdowns configured for {table_config.get('name')}")
+            return
+        
+        max_workers = max(1, min(int(table_config.get('breakdown_workers', 3)), len(jobs)))
+        logger.info(
+            f"Extracting {len(jobs)} breakdown sets with {max_workers} workers: "
+            f"{[name for name, _ in jobs]}"
+        )
+        
+        chunks = queue.Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
+        failed = {}  # breakdown table name -> error
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def extract(name: str, config: Dict[str, Any]):
+            try:
+                if stop.is_set():
+                    return
+                for df in self.iter_table(config, chunk_rows):
+                    if not put((name, df)):
+                        return
+            except Exception as e:
+                # One failing set doesn't stop the others
+                logger.error(f"Error extracting breakdown table {name}: {e}")
+                failed[name] = e
+            put((name, None))
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='breakdowns')
+        try:
+            for name, config in jobs:
+                executor.submit(extract, name, config)
+            
+            remaining = len(jobs)
+            while remaining:
+                name, df = chunks.get()
+                if df is None:
+                    remaining -= 1
+                else:
+                    yield name, df
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        if failed:
+            raise RuntimeError(
+                f"Extraction failed for {len(failed)} of {len(jobs)} breakdown sets: "
+                + '; '.join(f"{name}: {error}" for name, error in failed.items())
+            ) from next(iter(failed.values()))
+    
+    def extract_dimensions(
+        self,
+        table_configs: List[Dict[str, Any]],
+        chunk_rows: int = None,
+        max_workers: int = 3
+    ) -> Optional['DimensionPrefetch']:
+        """
+        Start extracting the campaigns, adsets and ads tables concurrently
+        
+        Each table is paged by its own worker thread, so the three dimension
+        tables cost roughly the time of the largest one. Chunks are handed over
+        through bounded queues as they arrive, so memory stays bounded by
+        chunk_rows like a sequential extraction.
+        
+        Args:
+            table_configs: Table configurations (non-dimension tables are ignored)
+            chunk_rows: Default maximum rows per chunk (None = one chunk per table)
+            max_workers: Tables fetched at the same time
+            
+        Returns:
+            DimensionPrefetch to read the tables from (None if no dimension tables)
+        """
+        dimension_configs = [
+            config for config in table_configs if config.get('name') in DIMENSION_TABLES
+        ]
+        if not dimension_configs:
+            return None
+        
+        logger.info(
+            f"Extracting {len(dimension_configs)} dimension tables concurrently: "
+            f"{[config.get('name') for config in dimension_configs]}"
+        )
+        return DimensionPrefetch(self, dimension_configs, chunk_rows, max_workers)
+
+
+class DimensionPrefetch:
+    """
+    Dimension tables extracted by worker threads ahead of the loader
+    
+    Every table has a bounded queue of chunks, so at most queue_chunks chunks
+    per table wait for the loader. Tables must be read with iter_table in the
+    order they were given (the order the workers start them). A table that
+    is not read to the end stops its worker; close() stops the rest.
+    """
+    
+    def __init__(
+        self,
+        extractor: 'FacebookAdsExtractor',
+        table_configs: List[Dict[str, Any]],
+        chunk_rows: int = None,
+        max_workers: int = 3,
+        queue_chunks: int = 2
+    ):
+        """
+        Start the workers
+        
+        Args:
+            extractor: Extractor whose iter_table pages each table
+            table_configs: Dimension table configurations
+            chunk_rows: Default maximum rows per chunk (None = one chunk per table)
+            max_workers: Tables fetched at the same time
+            queue_chunks: Chunks per table held ahead of the loader
+        """
+        self._stop = threading.Event()
+        self._queues: Dict[str, queue.Queue] = {}
+        self._cancelled: Dict[str, threading.Event] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='dimensions')
+        for config in table_configs:
+            name = config.get('name')
+            self._queues[name] = queue.Queue(maxsize=max(1, queue_chunks))
+            self._cancelled[name] = threading.Event()
+            self._executor.submit(
+                self._extract, extractor, config, config.get('chunk_rows', chunk_rows),
+                self._queues[name], self._cancelled[name]
+            )
+    
+    def __contains__(self, table_name: str) -> bool:
+        return table_name in self._queues
+    
+    def _extract(
+        self,
+        extractor: 'FacebookAdsExtractor',
+        config: Dict[str, Any],
+        chunk_rows: int,
+        chunks: queue.Queue,
+        cancelled: threading.Event
+    ):
+        def put(item) -> bool:
+            while not (cancelled.is_set() or self._stop.is_set()):
+                try:
+                    chunks.put(item, timeout=1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        try:
+            if cancelled.is_set() or self._stop.is_set():
+                return
+            for df in extractor.iter_table(config, chunk_rows):
+                if not put(df):
+                    return
+        except Exception as e:
+            # Raised to the reader of this table
+            put(e)
+            return
+        put(None)
+    
+    def iter_table(self, table_name: str) -> Iterator[pd.DataFrame]:
+        """
+        Iterate the chunks of a table as its worker extracts them
+        
+        Args:
+            table_name: Dimension table name
+            
+        Yields:
+            DataFrame chunks
+            
+        Raises:
+            Exception: The error that stopped the table's extraction
+        """
+        chunks = self._queues.pop(table_name)
+        try:
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._cancelled[table_name].set()
+    
+    def close(self):
+        """Stop the workers of tables that were not read and wait for them"""
+        self._stop.set()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def extract_account_table(
+    config: Dict[str, Any],
+    ad_account_id: str,
+    table_config: Dict[str, Any],
+    spool_dir: str,
+    chunk_rows: int = None
+) -> List[Tuple[str, str, Optional[List[str]], int]]:
+    """
+    Extract one table of one ad account (entry point for process pool workers)
+    
+    Chunks are written to spool_dir as they are extracted instead of being
+    returned through the pool, so neither the worker nor the parent process
+    holds more than one chunk of the account in memory.
+    
+    Args:
+        config: Facebook Ads source configuration (credentials, rate limits)
+        ad_account_id: Ad account to extract
+        table_config: Table configuration
+        spool_dir: Directory for the chunk files (read back and removed by the caller)
+        chunk_rows: Maximum rows per chunk (None = a single chunk)
+        
+    Returns:
+        (source table name, chunk file, upsert key columns, rows) tuples from
+        iter_table_chunks, each chunk with an account_id column that is also part of its key
+    """
+    extractor = FacebookAdsExtractor({**config, 'ad_account_id': ad_account_id})
+    account_number = normalize_account_id(ad_account_id)[len('act_'):]
+    
+    chunks = []
+    for table_name, df, key_columns in extractor.iter_table_chunks(table_config, chunk_rows):
+        if 'account_id' not in df.columns:
+            df.insert(0, 'account_id', int(account_number) if account_number.isdigit() else account_number)
+        if key_columns and 'account_id' not in key_columns:
+            key_columns = ['account_id'] + key_columns
+        path = os.path.join(spool_dir, f"{account_number}_{len(chunks):05d}.pkl")
+        df.to_pickle(path)
+        chunks.append((table_name, path, key_columns, len(df)))
+    return chunks
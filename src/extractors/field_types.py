@@ -0,0 +1,174 @@
+"""
+Field Types
+Registry of pandas dtypes for the columns extracted from Facebook Ads
+
+The dtypes decide the MySQL types of new tables: IDs are BIGINT and the
+*_time fields DATETIME (UTC). Existing tables keep their column types, so
+*_time values loaded into an older TEXT column are written in MySQL's
+'YYYY-MM-DD HH:MM:SS' format instead of the Graph API's ISO 8601 strings
+(see the README for the migration).
+"""
+import logging
+from typing import Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Supported type names: 'int64', 'float64', 'float32', 'category', 'datetime'
+FIELD_TYPES: Dict[str, Dict[str, str]] = {
+    'campaigns': {
+        'id': 'int64',
+        'account_id': 'int64',
+        'name': 'category',
+        'status': 'category',
+        'effective_status': 'category',
+        'objective': 'category',
+        'buying_type': 'category',
+        'daily_budget': 'int64',
+        'lifetime_budget': 'int64',
+        'spend_cap': 'int64',
+        'created_time': 'datetime',
+        'updated_time': 'datetime',
+        'start_time': 'datetime',
+        'stop_time': 'datetime',
+    },
+    'adsets': {
+        'id': 'int64',
+        'account_id': 'int64',
+        'campaign_id': 'int64',
+        'name': 'category',
+        'status': 'category',
+        'effective_status': 'category',
+        'optimization_goal': 'category',
+        'billing_event': 'category',
+        'daily_budget': 'int64',
+        'lifetime_budget': 'int64',
+        'bid_amount': 'int64',
+        'created_time': 'datetime',
+        'updated_time': 'datetime',
+        'start_time': 'datetime',
+        'end_time': 'datetime',
+    },
+    'ads': {
+        'id': 'int64',
+        'account_id': 'int64',
+        'campaign_id': 'int64',
+        'adset_id': 'int64',
+        'name': 'category',
+        'status': 'category',
+        'effective_status': 'category',
+        'created_time': 'datetime',
+        'updated_time': 'datetime',
+    },
+    'insights': {
+        'account_id': 'int64',
+        'campaign_id': 'int64',
+        'adset_id': 'int64',
+        'ad_id': 'int64',
+        'account_name': 'category',
+        'campaign_name': 'category',
+        'adset_name': 'category',
+        'ad_name': 'category',
+        'objective': 'category',
+        'date_start': 'datetime',
+        'date_stop': 'datetime',
+        'impressions': 'int64',
+        'clicks': 'int64',
+        'reach': 'int64',
+        'inline_link_clicks': 'int64',
+        'unique_clicks': 'int64',
+        'spend': 'float64',
+        'frequency': 'float64',
+        'ctr': 'float64',
+        'cpc': 'float64',
+        'cpm': 'float64',
+        'cpp': 'float64',
+        'cost_per_inline_link_click': 'float64',
+        'inline_link_click_ctr': 'float64',
+        # Breakdown values
+        'age': 'category',
+        'gender': 'category',
+        'country': 'category',
+        'region': 'category',
+        'dma': 'category',
+        'publisher_platform': 'category',
+        'platform_position': 'category',
+        'device_platform': 'category',
+        'impression_device': 'category',
+    },
+}
+
+# Type of the action_*, cost_per_* and video_* columns created by action expansion
+EXPANDED_FIELD_TYPE = 'float64'
+
+
+def _convert(series: pd.Series, field_type: str) -> pd.Series:
+    """
+    Convert a column to a registered type
+    
+    Args:
+        series: Column to convert
+        field_type: Type name from the registry
+    
+    Returns:
+        Converted column (unparseable values become missing)
+    """
+    if field_type == 'int64':
+        numbers = pd.to_numeric(series, errors='coerce', dtype_backend='numpy_nullable')
+        if series.isna().all() or numbers.isna().all():
+            # No values to infer from (e.g. no ad in the chunk has a bid): keep the integer type
+            return numbers.astype('Int64')
+        if not pd.api.types.is_integer_dtype(numbers.dtype):
+            # Fractional values can't be stored as integers
+            return numbers.astype('float64')
+        return numbers.astype('Int64' if numbers.hasnans else 'int64')
+    if field_type in ('float64', 'float32'):
+        return pd.to_numeric(series, errors='coerce').astype(field_type)
+    if field_type == 'category':
+        return series.astype('category')
+    if field_type == 'datetime':
+        return pd.to_datetime(series, errors='coerce', utc=True).dt.tz_localize(None)
+    raise ValueError(f"Unknown field type: {field_type}")
+
+
+def apply_field_types(
+    df: pd.DataFrame,
+    table_name: str,
+    extra_types: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Convert all registered columns of a DataFrame in one step
+    
+    Columns that are not in the registry keep their dtype.
+    
+    Args:
+        df: Extracted DataFrame
+        table_name: Source table name ('campaigns', 'adsets', 'ads', 'insights')
+        extra_types: Types for columns not in the registry (e.g. expanded actions)
+    
+    Returns:
+        DataFrame with compact dtypes
+    """
+    field_types = {**FIELD_TYPES.get(table_name, {}), **(extra_types or {})}
+    
+    converted = {}
+    for column in df.columns:
+        field_type = field_types.get(column)
+        if field_type is None:
+            continue
+        try:
+            converted[column] = _convert(df[column], field_type)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not convert '{column}' to {field_type}: {e}")
+    
+    if not converted:
+        return df
+    
+    df = df.assign(**converted)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Applied field types to {len(converted)} {table_name} columns "
+            f"({df.memory_usage(deep=True).sum() / 1024 / 1024:.1f} MB)"
+        )
+    return df
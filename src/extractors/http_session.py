@@ -0,0 +1,108 @@
+"""
+HTTP Session
+Sized connection pool, timeouts and timing for Graph API requests
+"""
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Default HTTP settings, overridable with the source's `http` config
+HTTP_DEFAULTS = {
+    'pool_connections': 4,         # Hosts kept in the pool (graph.facebook.com plus report CDNs)
+    'pool_maxsize': 16,            # Connections kept alive per host (>= concurrent workers)
+    'connect_timeout': 10,         # Seconds to open a connection
+    'read_timeout': 300,           # Seconds to wait for a response (large insights pages)
+    'connect_retries': 3,          # Retries of failed connections (never of sent requests)
+    'slow_request_seconds': 30,    # Requests slower than this are logged as warnings
+}
+
+
+class RequestStats:
+    """Thread-safe counters of the HTTP requests made by a session"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.seconds = 0.0
+        self.bytes = 0
+        self.slow_requests = 0
+
+    def record(self, seconds: float, size: int, slow: bool):
+        with self._lock:
+            self.requests += 1
+            self.seconds += seconds
+            self.bytes += size
+            self.slow_requests += int(slow)
+
+    def summary(self) -> str:
+        """One-line summary for logs"""
+        with self._lock:
+            average = self.seconds / self.requests if self.requests else 0.0
+            return (
+                f"{self.requests} requests, {self.seconds:.1f}s total, {average:.2f}s avg, "
+                f"{self.bytes / 1024 / 1024:.1f} MB, {self.slow_requests} slow"
+            )
+
+
+def configure_session(session: Any, options: Optional[Dict[str, Any]] = None) -> RequestStats:
+    """
+    Tune the requests.Session of a FacebookSession
+
+    requests already keeps connections alive and asks for gzip responses; this
+    mounts an adapter whose pool is sized for the concurrent workers (with
+    connection-only retries), sets connect/read timeouts and adds a timing
+    hook to every response.
+
+    Args:
+        session: facebook_business FacebookSession
+        options: Settings from HTTP_DEFAULTS
+
+    Returns:
+        RequestStats updated by the session's requests
+    """
+    options = {**HTTP_DEFAULTS, **(options or {})}
+    http = session.requests
+
+    adapter = HTTPAdapter(
+        pool_connections=int(options['pool_connections']),
+        pool_maxsize=int(options['pool_maxsize']),
+        max_retries=Retry(
+            total=int(options['connect_retries']),
+            connect=int(options['connect_retries']),
+            read=0,
+            status=0,
+            backoff_factor=0.5,
+            raise_on_status=False,
+        ),
+    )
+    http.mount('https://', adapter)
+    http.mount('http://', adapter)
+
+    # FacebookAdsApi.call passes session.timeout to every request
+    session.timeout = (options['connect_timeout'], options['read_timeout'])
+
+    stats = RequestStats()
+    slow_seconds = options['slow_request_seconds']
+
+    def log_timing(response, *args, **kwargs):
+        seconds = response.elapsed.total_seconds()
+        size = len(response.content or b'')
+        slow = seconds >= slow_seconds
+        stats.record(seconds, size, slow)
+
+        path = response.request.path_url.split('?', 1)[0]
+        if slow:
+            logger.warning(f"Slow Graph API request: {response.request.method} {path} took {seconds:.1f}s")
+        elif logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"{response.request.method} {path} -> {response.status_code} "
+                f"in {seconds:.2f}s ({size} bytes)"
+            )
+
+    http.hooks.setdefault('response', []).append(log_timing)
+    return stats
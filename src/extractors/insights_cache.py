@@ -0,0 +1,247 @@
+"""
+Insights Cache
+Local cache of daily insights rows that no longer change
+"""
+import gzip
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from src.core.json_codec import json_dumps, json_loads
+
+logger = logging.getLogger(__name__)
+
+# Request params that don't change which rows a day holds
+_UNKEYED_PARAMS = ('time_range', 'limit')
+
+# Caches shared by every extractor (and thread) in the process, by directory
+_caches: Dict[str, 'InsightsCache'] = {}
+_caches_lock = threading.Lock()
+
+
+def get_insights_cache(directory: str, max_mb: float) -> 'InsightsCache':
+    """
+    Get the process-wide cache for a directory
+
+    Args:
+        directory: Cache directory
+        max_mb: Size limit of the cache in MB
+
+    Returns:
+        InsightsCache instance
+    """
+    path = os.path.abspath(directory)
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = InsightsCache(path, max_mb)
+        elif cache.max_bytes != int(max_mb * 1024 * 1024):
+            cache.resize(max_mb)
+        return cache
+
+
+class InsightsCache:
+    """
+    Stores one gzip JSON-lines file per request and day
+
+    Files are grouped in a directory per request key (account, fields and
+    params such as level and breakdowns). When the cache grows over its
+    size limit the least recently used day files are removed.
+    """
+
+    def __init__(self, directory: str, max_mb: float = 1024):
+        """
+        Initialize insights cache
+
+        Args:
+            directory: Cache directory (created on first write)
+            max_mb: Size limit of the cache in MB
+        """
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._files: Optional['OrderedDict[Path, int]'] = None  # path -> size, least recent first
+        self._total_bytes = 0
+
+    def resize(self, max_mb: float):
+        """
+        Change the size limit, evicting files if needed
+
+        Args:
+            max_mb: Size limit of the cache in MB
+        """
+        with self._lock:
+            self.max_bytes = int(max_mb * 1024 * 1024)
+            self._evict()
+
+    @staticmethod
+    def make_key(account_id: Any, fields: Iterable[str], params: Dict[str, Any]) -> str:
+        """
+        Build the cache key of an insights request
+
+        Args:
+            account_id: Ad account ID
+            fields: Requested fields
+            params: Insights params (time_range and limit are ignored)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        key_params = {
+            name: value for name, value in params.items() if name not in _UNKEYED_PARAMS
+        }
+        payload = json_dumps({
+            'account_id': str(account_id),
+            'fields': sorted(str(field) for field in fields),
+            'params': {name: key_params[name] for name in sorted(key_params)},
+        })
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str, day: date) -> Path:
+        return self.directory / key / f"{day.isoformat()}.jsonl.gz"
+
+    def _index(self) -> 'OrderedDict[Path, int]':
+        """Scan the cache directory once, ordering files by last use"""
+        if self._files is None:
+            entries = []
+            if self.directory.exists():
+                for path in self.directory.glob('*/*.jsonl.gz'):
+                    stat = path.stat()
+                    entries.append((stat.st_mtime, path, stat.st_size))
+            entries.sort()
+            self._files = OrderedDict((path, size) for _, path, size in entries)
+            self._total_bytes = sum(self._files.values())
+        return self._files
+
+    def has(self, key: str, day: date) -> bool:
+        """Check if a day is cached"""
+        with self._lock:
+            return self._path(key, day) in self._index()
+
+    def get(self, key: str, day: date) -> Optional[List[Dict[str, Any]]]:
+        """
+        Read the cached rows of a day
+
+        Args:
+            key: Request key from make_key
+            day: Day to read
+
+        Returns:
+            List of row dicts (possibly empty), or None if the day isn't cached
+        """
+        path = self._path(key, day)
+        with self._lock:
+            files = self._index()
+            if path not in files:
+                return None
+            files.move_to_end(path)
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                rows = [json_loads(line) for line in f if line.strip()]
+            os.utime(path)
+            return rows
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable insights cache file {path}: {e}")
+            self._remove(path)
+            return None
+
+    def writer(self, key: str) -> 'InsightsCacheWriter':
+        """
+        Start writing the days of a request
+
+        Args:
+            key: Request key from make_key
+
+        Returns:
+            Writer context manager; only committed days are stored
+        """
+        return InsightsCacheWriter(self, key)
+
+    def _store(self, path: Path, tmp_path: Path):
+        """Move a finished day file into place and enforce the size limit"""
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+
+        with self._lock:
+            files = self._index()
+            self._total_bytes += size - files.pop(path, 0)
+            files[path] = size
+            self._evict()
+
+    def _evict(self):
+        """Remove least recently used files while over the size limit (lock held)"""
+        files = self._index()
+        while self._total_bytes > self.max_bytes and len(files) > 1:
+            oldest, oldest_size = files.popitem(last=False)
+            self._total_bytes -= oldest_size
+            try:
+                oldest.unlink()
+            except OSError:
+                pass
+            logger.debug(f"Evicted insights cache file {oldest}")
+
+    def _remove(self, path: Path):
+        with self._lock:
+            self._total_bytes -= self._index().pop(path, 0)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+class InsightsCacheWriter:
+    """Writes the rows of several days, storing them only when committed"""
+
+    def __init__(self, cache: InsightsCache, key: str):
+        self.cache = cache
+        self.key = key
+        self._token = f"{os.getpid()}.{id(self)}"
+        self._files: Dict[date, Any] = {}  # day -> (open file, temporary path)
+
+    def __enter__(self) -> 'InsightsCacheWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Anything not committed (errors, abandoned generators) is discarded
+        for f, tmp_path in self._files.values():
+            f.close()
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+        self._files.clear()
+        return False
+
+    def _open(self, day: date):
+        entry = self._files.get(day)
+        if entry is None:
+            path = self.cache._path(self.key, day)
+            tmp_path = path.with_name(f"{path.name}.{self._token}.tmp")
+            tmp_path.parent.mkdir(parents=True, exist_ok=True)
+            entry = self._files[day] = (gzip.open(tmp_path, 'wt', encoding='utf-8'), tmp_path)
+        return entry
+
+    def add(self, day: date, record: Dict[str, Any]):
+        """Append one row to a day"""
+        f, _ = self._open(day)
+        f.write(json_dumps(record))
+        f.write('\n')
+
+    def commit(self, days: Iterable[date]):
+        """
+        Store the given days (days without rows are stored as empty)
+
+        Args:
+            days: Days whose rows are complete
+        """
+        for day in days:
+            self._open(day)
+            f, tmp_path = self._files.pop(day)
+            f.close()
+            self.cache._store(self.cache._path(self.key, day), tmp_path)
@@ -0,0 +1,224 @@
+"""
+Rate Limiter
+Adaptive, process-wide throttling of Facebook Graph API calls
+"""
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from facebook_business.exceptions import FacebookRequestError
+
+logger = logging.getLogger(__name__)
+
+# Default throttling settings, overridable with the source's `rate_limit` config
+RATE_LIMIT_DEFAULTS = {
+    'max_concurrency': 8,      # API calls in flight while usage is low
+    'slow_down_pct': 75,       # Usage (%) at which concurrency starts to shrink
+    'stop_pct': 95,            # Usage (%) at which only one call runs at a time
+    'usage_ttl': 300,          # Seconds a usage reading is trusted without a new one
+}
+
+# Graph API error codes for application, account and business use case throttling
+THROTTLING_ERROR_CODES = frozenset({
+    4, 17, 32, 613,
+    80000, 80001, 80002, 80003, 80004, 80005, 80006, 80008, 80009, 80014,
+})
+
+# Response headers reporting usage as a percentage of the limit
+USAGE_HEADERS = ('x-business-use-case-usage', 'x-ad-account-usage', 'x-app-usage')
+
+# Ad account node in a Graph API path or paging URL
+ACCOUNT_PATH_PATTERN = re.compile(r'(?:^|/)(act_\d+)(?:/|\?|$)')
+
+
+def account_id_from_path(path: Any) -> Optional[str]:
+    """
+    Get the ad account a Graph API call is made on
+
+    Args:
+        path: Path of FacebookAdsApi.call, a tuple of nodes or a URL (e.g. a paging URL)
+
+    Returns:
+        Ad account ID in 'act_<id>' form, or None if the path has no ad account
+    """
+    if isinstance(path, (tuple, list)):
+        return next((str(node) for node in path if str(node).startswith('act_')), None)
+    match = ACCOUNT_PATH_PATTERN.search(str(path or ''))
+    return match.group(1) if match else None
+
+
+def is_throttling_error(error: FacebookRequestError) -> bool:
+    """Check if a Graph API error means the caller is being rate limited"""
+    return error.api_error_code() in THROTTLING_ERROR_CODES
+
+
+class RateLimiter:
+    """
+    Limits concurrent Graph API calls from the usage reported by the API
+
+    Every response updates the usage readings; concurrency shrinks linearly
+    between slow_down_pct and stop_pct. A throttling backoff or a reported
+    time to regain access pauses all callers until it has passed.
+    """
+
+    def __init__(self, **options):
+        """
+        Initialize rate limiter
+
+        Args:
+            **options: Settings from RATE_LIMIT_DEFAULTS
+        """
+        self.options = dict(RATE_LIMIT_DEFAULTS)
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._blocked_until = 0.0
+        self._usage: Dict[str, tuple] = {}
+        self.configure(options)
+
+    def configure(self, options: Optional[Dict[str, Any]] = None):
+        """
+        Update throttling settings (shared by every extractor in the process)
+
+        Args:
+            options: Settings from RATE_LIMIT_DEFAULTS (None keeps the current ones)
+        """
+        if not options:
+            return
+        with self._condition:
+            self.options.update({
+                key: value for key, value in options.items() if key in RATE_LIMIT_DEFAULTS
+            })
+            self._condition.notify_all()
+
+    def usage_pct(self) -> float:
+        """Highest recent usage reported by the API, in percent"""
+        with self._condition:
+            return self._current_usage(time.monotonic())
+
+    def allowed_concurrency(self) -> int:
+        """Number of API calls allowed in flight at the current usage"""
+        with self._condition:
+            return self._allowed_concurrency(time.monotonic())
+
+    def _current_usage(self, now: float) -> float:
+        ttl = self.options['usage_ttl']
+        return max(
+            (pct for pct, seen_at in self._usage.values() if now - seen_at <= ttl),
+            default=0.0
+        )
+
+    def _allowed_concurrency(self, now: float) -> int:
+        max_concurrency = max(1, int(self.options['max_concurrency']))
+        slow_down_pct = self.options['slow_down_pct']
+        stop_pct = self.options['stop_pct']
+
+        usage = self._current_usage(now)
+        if usage <= slow_down_pct:
+            return max_concurrency
+        if usage >= stop_pct:
+            return 1
+
+        remaining = (stop_pct - usage) / (stop_pct - slow_down_pct)
+        return max(1, int(max_concurrency * remaining))
+
+    @contextmanager
+    def slot(self):
+        """Wait until a call is allowed and hold its slot for the duration of the block"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    self._condition.wait(self._blocked_until - now)
+                elif self._in_flight >= self._allowed_concurrency(now):
+                    # Readings expire, so re-check periodically
+                    self._condition.wait(1.0)
+                else:
+                    break
+            self._in_flight += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def update_from_headers(self, headers: Optional[Dict[str, Any]], account_id: Optional[str] = None):
+        """
+        Record the usage reported in Graph API response headers
+
+        Args:
+            headers: Response headers (x-business-use-case-usage, x-ad-account-usage, x-app-usage)
+            account_id: Ad account the call was made on (x-ad-account-usage is per account)
+        """
+        if not headers:
+            return
+
+        headers = {str(name).lower(): value for name, value in headers.items()}
+        readings = {}
+        block_seconds = 0.0
+
+        for header in USAGE_HEADERS:
+            raw = headers.get(header)
+            if not raw:
+                continue
+            try:
+                usage = json.loads(raw) if isinstance(raw, str) else raw
+            except ValueError:
+                logger.debug(f"Could not parse {header}: {raw}")
+                continue
+
+            if header == 'x-business-use-case-usage':
+                for business_id, entries in usage.items():
+                    for entry in entries or []:
+                        key = f"{header}:{business_id}:{entry.get('type')}"
+                        readings[key] = max(
+                            float(entry.get(metric) or 0)
+                            for metric in ('call_count', 'total_cputime', 'total_time')
+                        )
+                        regain_minutes = float(entry.get('estimated_time_to_regain_access') or 0)
+                        block_seconds = max(block_seconds, regain_minutes * 60)
+            elif header == 'x-ad-account-usage':
+                key = f"{header}:{account_id}" if account_id else header
+                readings[key] = float(usage.get('acc_id_util_pct') or 0)
+                if readings[key] >= 100:
+                    block_seconds = max(block_seconds, float(usage.get('reset_time_duration') or 0))
+            else:
+                readings[header] = max(
+                    float(usage.get(metric) or 0)
+                    for metric in ('call_count', 'total_cputime', 'total_time')
+                )
+
+        if not readings and not block_seconds:
+            return
+
+        with self._condition:
+            now = time.monotonic()
+            for key, pct in readings.items():
+                self._usage[key] = (pct, now)
+            if block_seconds:
+                self._block(now + block_seconds)
+                logger.warning(f"Graph API access blocked for {block_seconds:.0f}s by usage limits")
+            self._condition.notify_all()
+
+    def pause(self, seconds: float):
+        """
+        Pause all callers, e.g. after a throttling error
+
+        Args:
+            seconds: Seconds before calls resume
+        """
+        with self._condition:
+            self._block(time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    def _block(self, until: float):
+        self._blocked_until = max(self._blocked_until, until)
+
+
+# Shared by every extractor (and thread) in the process
+rate_limiter = RateLimiter()
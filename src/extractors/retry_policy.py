@@ -0,0 +1,209 @@
+"""
+Retry Policy
+Per-error-class retries for Facebook Graph API calls
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import requests
+from facebook_business.api import FacebookAdsApi
+from facebook_business.exceptions import FacebookRequestError
+
+from .rate_limiter import account_id_from_path, is_throttling_error, rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Default retry settings per error class, overridable with the source's `retry` config
+RETRY_POLICY_DEFAULTS = {
+    # 5xx responses, unknown/temporary API errors, dropped connections and timeouts
+    'transient': {'max_retries': 3, 'backoff_base': 1.0, 'backoff_max': 30},
+    # Rate limiting (codes 4, 17, 32, 613, 80000-80014); pauses every caller in the process
+    'throttling': {'max_retries': 5, 'backoff_base': 2.0, 'backoff_max': 300},
+    # "Please reduce the amount of data": the request is split instead of retried
+    'reduce_data': {'max_splits': 10, 'campaign_batch_size': 50},
+}
+
+# Graph API codes for "unknown error" and "service temporarily unavailable"
+TRANSIENT_ERROR_CODES = frozenset({1, 2})
+
+
+def is_reduce_data_error(error: Exception) -> bool:
+    """
+    Check whether an API error asks to reduce the amount of requested data
+
+    Args:
+        error: Exception raised by the API call
+
+    Returns:
+        True for "reduce the amount of data" errors
+    """
+    if not isinstance(error, FacebookRequestError):
+        return False
+    message = (error.api_error_message() or '').lower()
+    return 'reduce the amount of data' in message or (
+        error.api_error_code() == 1 and 'please reduce' in message
+    )
+
+
+def classify_error(error: Exception) -> Optional[str]:
+    """
+    Get the retry class of an error
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        'throttling', 'reduce_data', 'transient' or None (not retryable)
+    """
+    if isinstance(error, FacebookRequestError):
+        if is_throttling_error(error):
+            return 'throttling'
+        if is_reduce_data_error(error):
+            return 'reduce_data'
+        if (error.api_transient_error() or (error.http_status() or 0) >= 500
+                or error.api_error_code() in TRANSIENT_ERROR_CODES):
+            return 'transient'
+        return None
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return 'transient'
+    return None
+
+
+class RetryPolicy:
+    """Retry limits and backoff delays per error class"""
+
+    def __init__(self, options: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize retry policy
+
+        Args:
+            options: Per-class overrides of RETRY_POLICY_DEFAULTS
+        """
+        self._lock = threading.Lock()
+        self.options = {name: dict(settings) for name, settings in RETRY_POLICY_DEFAULTS.items()}
+        self.configure(options)
+
+    def configure(self, options: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Update retry settings (shared by every extractor in the process)
+
+        Args:
+            options: Per-class overrides, e.g. {'transient': {'max_retries': 5}}
+        """
+        if not options:
+            return
+        with self._lock:
+            for error_class, settings in options.items():
+                if error_class in self.options and isinstance(settings, dict):
+                    self.options[error_class].update(settings)
+
+    def setting(self, error_class: str, name: str) -> Any:
+        """Get one setting of an error class"""
+        with self._lock:
+            return self.options[error_class][name]
+
+    def should_retry(self, error_class: Optional[str], attempt: int) -> bool:
+        """
+        Check if a failed call should be retried
+
+        Args:
+            error_class: Class from classify_error
+            attempt: Retries already made for this call
+
+        Returns:
+            True if the call should be retried
+        """
+        if error_class not in ('transient', 'throttling'):
+            return False
+        return attempt < self.setting(error_class, 'max_retries')
+
+    def backoff(self, error_class: str, attempt: int) -> float:
+        """
+        Get the delay before a retry
+
+        Args:
+            error_class: 'transient' or 'throttling'
+            attempt: Retries already made for this call (0 for the first retry)
+
+        Returns:
+            Seconds to wait, with jitter
+        """
+        with self._lock:
+            settings = self.options[error_class]
+            ceiling = min(settings['backoff_max'], settings['backoff_base'] * 2 ** attempt)
+        # Equal jitter: keep at least half the backoff, randomize the rest
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+
+
+# Shared by every extractor (and thread) in the process
+retry_policy = RetryPolicy()
+
+
+class ThrottledFacebookAdsApi(FacebookAdsApi):
+    """FacebookAdsApi whose calls go through the rate limiter and retry policy"""
+
+    def call(
+        self,
+        method,
+        path,
+        params=None,
+        headers=None,
+        files=None,
+        url_override=None,
+        api_version=None,
+    ):
+        """
+        Make an API call, waiting for a slot and retrying failed calls
+
+        Only the failed request is repeated, so the pages a cursor already
+        returned are kept. Transient errors are only retried for GET requests;
+        throttled requests were rejected before being processed, so they are
+        retried for every method.
+        """
+        attempts = {}  # error class -> retries made
+        account_id = account_id_from_path(path)
+        while True:
+            with rate_limiter.slot():
+                try:
+                    response = super().call(
+                        method, path, params=params, headers=headers, files=files,
+                        url_override=url_override, api_version=api_version
+                    )
+                except FacebookRequestError as e:
+                    rate_limiter.update_from_headers(e.http_headers(), account_id)
+                    error, error_class = e, classify_error(e)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error, error_class = e, classify_error(e)
+                else:
+                    rate_limiter.update_from_headers(response.headers(), account_id)
+                    return response
+
+                if error_class == 'transient' and method != 'GET':
+                    # The request may have been processed (e.g. a report run created), only repeat reads
+                    error_class = None
+
+                attempt = attempts.get(error_class, 0)
+                if not retry_policy.should_retry(error_class, attempt):
+                    raise error
+
+            delay = retry_policy.backoff(error_class, attempt)
+            attempts[error_class] = attempt + 1
+            logger.warning(
+                f"Graph API {error_class} error ({_describe(error)}), retry {attempt + 1}/"
+                f"{retry_policy.setting(error_class, 'max_retries')} in {delay:.1f}s"
+            )
+
+            if error_class == 'throttling':
+                rate_limiter.pause(delay)
+            else:
+                time.sleep(delay)
+
+
+def _describe(error: Exception) -> str:
+    """Short description of an API error for logs"""
+    if isinstance(error, FacebookRequestError):
+        return f"code {error.api_error_code()}: {error.api_error_message()}"
+    return f"{type(error).__name__}: {error}"
@@ -1,4 +1,11 @@
 """Loaders module initialization"""
-from .mysql_loader import MySQLLoader
 
 __all__ = ['MySQLLoader']
+
+
+def __getattr__(name):
+    # Imported on first use: the loader pulls in pandas and the MySQL driver
+    if name == 'MySQLLoader':
+        from .mysql_loader import MySQLLoader
+        return MySQLLoader
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
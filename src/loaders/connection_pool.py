@@ -0,0 +1,350 @@
+"""
+Connection Pool
+Process-wide pools of MySQL connections shared by loaders and API requests
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional, Tuple
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+logger = logging.getLogger(__name__)
+
+# Default pool settings, overridable with the destination's `pool` config
+POOL_DEFAULTS = {
+    'enabled': True,               # False opens a new connection on every connect()
+    'max_size': 10,                # Connections open at once (borrowed + idle)
+    'acquire_timeout': 30,         # Seconds to wait for a free connection before failing
+    'idle_timeout': 300,           # Idle connections older than this are closed
+    'health_check_interval': 30,   # Idle connections are pinged before reuse after this many seconds
+}
+
+# Connection settings that identify a pool (same server, credentials and options)
+CONNECTION_KEYS = ('host', 'port', 'user', 'password', 'database', 'allow_local_infile')
+
+
+def _as_bool(value: Any) -> bool:
+    return value if isinstance(value, bool) else str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def pool_enabled(options: Optional[Dict[str, Any]]) -> bool:
+    """Check if a destination's `pool` config enables pooling (the default)"""
+    value = (options or {}).get('enabled')
+    return POOL_DEFAULTS['enabled'] if value is None else _as_bool(value)
+
+
+class PoolStats:
+    """Thread-safe counters of a pool's connections and borrows"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.created = 0
+        self.closed = 0
+        self.borrowed = 0
+        self.returned = 0
+        self.reused = 0
+        self.health_check_failures = 0
+        self.evicted = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_seconds += seconds
+            self.max_wait_seconds = max(self.max_wait_seconds, seconds)
+
+    def as_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'created': self.created,
+                'closed': self.closed,
+                'borrowed': self.borrowed,
+                'returned': self.returned,
+                'reused': self.reused,
+                'health_check_failures': self.health_check_failures,
+                'evicted': self.evicted,
+                'avg_wait_ms': round(self.wait_seconds / self.borrowed * 1000, 2) if self.borrowed else 0.0,
+                'max_wait_ms': round(self.max_wait_seconds * 1000, 2),
+            }
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections for one server/user/database
+
+    Borrowers wait up to acquire_timeout for a connection when max_size are
+    in use. Idle connections are reused most-recently-used first, pinged when
+    they have been idle longer than health_check_interval and closed after
+    idle_timeout. Returned connections have any open transaction rolled back.
+    """
+
+    def __init__(self, connection_config: Dict[str, Any], **options):
+        """
+        Initialize connection pool
+
+        Args:
+            connection_config: Arguments for mysql.connector.connect
+            **options: Settings from POOL_DEFAULTS
+        """
+        self.connection_config = dict(connection_config)
+        self.options = dict(POOL_DEFAULTS)
+        self.stats = PoolStats()
+        self.pid = os.getpid()
+        self._condition = threading.Condition()
+        self._idle: deque = deque()   # (connection, returned_at), most recently returned last
+        self._open = 0
+        self.configure(options)
+
+    def configure(self, options: Optional[Dict[str, Any]] = None):
+        """
+        Update pool settings (e.g. a destination config raising max_size)
+
+        Values from environment-substituted configs may be strings and are converted.
+
+        Args:
+            options: Settings from POOL_DEFAULTS (None keeps the current ones)
+        """
+        if not options:
+            return
+        updates = {}
+        for key, value in options.items():
+            if key not in POOL_DEFAULTS or value is None:
+                continue
+            if key == 'enabled':
+                updates[key] = _as_bool(value)
+            elif key == 'max_size':
+                updates[key] = max(1, int(value))
+            else:
+                updates[key] = float(value)
+        with self._condition:
+            self.options.update(updates)
+            # Waiting borrowers may fit under a larger max_size
+            self._condition.notify_all()
+
+    @property
+    def name(self) -> str:
+        config = self.connection_config
+        return f"{config.get('user')}@{config.get('host')}:{config.get('port')}/{config.get('database')}"
+
+    def acquire(self):
+        """
+        Borrow a connection (reusing an idle one when possible)
+
+        Returns:
+            Open MySQL connection, to be given back with release()
+
+        Raises:
+            PoolError: If no connection frees up within acquire_timeout
+            Error: If a new connection can't be opened
+        """
+        started = time.monotonic()
+        deadline = started + self.options['acquire_timeout']
+        expired = []
+        connection, returned_at, slot = None, None, False
+
+        with self._condition:
+            while True:
+                expired.extend(self._evict_idle(time.monotonic()))
+                if self._idle:
+                    connection, returned_at = self._idle.pop()
+                    break
+                if self._open < self.options['max_size']:
+                    self._open += 1
+                    slot = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+        # Sockets are closed outside the lock so other borrowers aren't held up
+        for stale in expired:
+            self._close(stale)
+        if connection is None and not slot:
+            raise PoolError(
+                f"No MySQL connection available in pool {self.name} "
+                f"after {self.options['acquire_timeout']}s ({self.options['max_size']} in use)"
+            )
+
+        waited = time.monotonic() - started
+        self.stats.record_wait(waited)
+        if waited > 1:
+            logger.warning(f"Waited {waited:.1f}s for a MySQL connection from pool {self.name}")
+
+        if connection is not None and time.monotonic() - returned_at > self.options['health_check_interval']:
+            if not self._is_healthy(connection):
+                self.stats.add(health_check_failures=1)
+                logger.info(f"Dropping stale MySQL connection from pool {self.name}")
+                self._close(connection)
+                connection = None
+
+        if connection is None:
+            try:
+                connection = mysql.connector.connect(**self.connection_config)
+            except Error:
+                self._discard_slot()
+                raise
+            self.stats.add(created=1)
+            logger.info(f"Connected to MySQL database: {self.connection_config.get('database')}")
+        else:
+            self.stats.add(reused=1)
+
+        self.stats.add(borrowed=1)
+        return connection
+
+    def release(self, connection):
+        """
+        Give a borrowed connection back to the pool
+
+        Args:
+            connection: Connection returned by acquire()
+        """
+        self.stats.add(returned=1)
+        try:
+            if connection.unread_result:
+                connection.consume_results()
+            if connection.in_transaction:
+                connection.rollback()
+        except Error as e:
+            logger.info(f"Closing MySQL connection that could not be reset: {e}")
+            self._close(connection)
+            self._discard_slot()
+            return
+
+        with self._condition:
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def discard(self, connection):
+        """
+        Close a borrowed connection instead of returning it (e.g. after a lost connection)
+
+        Args:
+            connection: Connection returned by acquire()
+        """
+        self.stats.add(returned=1)
+        self._close(connection)
+        self._discard_slot()
+
+    def close_all(self):
+        """Close every idle connection (borrowed ones return to the pool as usual)"""
+        with self._condition:
+            idle, self._idle = list(self._idle), deque()
+            self._open -= len(idle)
+            self._condition.notify_all()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def status(self) -> Dict[str, Any]:
+        """Pool size, usage and counters"""
+        with self._condition:
+            open_connections, idle = self._open, len(self._idle)
+        return {
+            'pool': self.name,
+            'max_size': self.options['max_size'],
+            'open': open_connections,
+            'in_use': open_connections - idle,
+            'idle': idle,
+            **self.stats.as_dict(),
+        }
+
+    def _evict_idle(self, now: float) -> list:
+        """
+        Take connections idle longer than idle_timeout out of the pool (caller holds the condition)
+
+        Returns:
+            Evicted connections, to be closed by the caller once the condition is released
+        """
+        idle_timeout = self.options['idle_timeout']
+        evicted = []
+        # The oldest connections are at the left end
+        while self._idle and now - self._idle[0][1] > idle_timeout:
+            connection, _ = self._idle.popleft()
+            self._open -= 1
+            evicted.append(connection)
+        if evicted:
+            self.stats.add(evicted=len(evicted))
+            # Freed slots can be used by waiting borrowers
+            self._condition.notify_all()
+        return evicted
+
+    def _discard_slot(self):
+        """Free the slot of a connection that was closed or never opened"""
+        with self._condition:
+            self._open -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, connection) -> bool:
+        try:
+            connection.ping(reconnect=False)
+            return True
+        except Error:
+            return False
+
+    def _close(self, connection):
+        self.stats.add(closed=1)
+        try:
+            connection.close()
+        except Error:
+            pass
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_config: Dict[str, Any], options: Optional[Dict[str, Any]] = None) -> ConnectionPool:
+    """
+    Get the process-wide pool for a connection config, creating it on first use
+
+    Loaders and API requests with the same server, credentials, database and
+    connection options share one pool. Options given for an existing pool
+    update it, so a destination config raising max_size takes effect without
+    a restart. Forked processes get their own pools.
+
+    Args:
+        connection_config: Arguments for mysql.connector.connect
+        options: Settings from POOL_DEFAULTS (unset ones keep their current value)
+
+    Returns:
+        Connection pool
+    """
+    key = tuple(connection_config.get(name) for name in CONNECTION_KEYS)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            pool = _pools[key] = ConnectionPool(connection_config, **(options or {}))
+            logger.debug(f"Created MySQL connection pool {pool.name} (max {pool.options['max_size']})")
+        else:
+            pool.configure(options)
+        return pool
+
+
+def pool_status() -> list:
+    """Status of every pool in this process"""
+    with _pools_lock:
+        pools = [pool for pool in _pools.values() if pool.pid == os.getpid()]
+    return [pool.status() for pool in pools]
+
+
+def close_pools():
+    """Close the idle connections of every pool in this process"""
+    with _pools_lock:
+        pools = [pool for pool in _pools.values() if pool.pid == os.getpid()]
+    for pool in pools:
+        pool.close_all()
+
+
+# Close idle connections cleanly instead of leaving the server to time them out
+atexit.register(close_pools)
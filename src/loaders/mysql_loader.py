@@ -3,14 +3,52 @@ MySQL Loader Module
 Handles connection and data loading to MySQL database
 """
 import logging
+import os
+import tempfile
+import time
+import zlib
 import mysql.connector
 from mysql.connector import Error
 from typing import List, Dict, Any, Optional
+import numpy as np
 import pandas as pd
-from datetime import datetime
+
+from .connection_pool import get_pool, pool_enabled
 
 logger = logging.getLogger(__name__)
 
+# Default load settings, overridable from the destination config
+LOADER_OPTION_DEFAULTS = {
+    'load_method': 'insert',         # 'insert' (executemany) or 'load_data' (LOAD DATA LOCAL INFILE)
+    'bulk_min_rows': 1000,           # Smaller frames use 'insert' even with load_method 'load_data'
+    'bulk_dir': None,                # Directory for the temporary TSV files; None = system temp dir
+    'batch_rows': 5000,              # Rows per multi-row INSERT statement
+    'batch_bytes': 1024 * 1024,      # Approximate size limit per INSERT (keep under max_allowed_packet)
+    'commit_every': 10,              # Commit after this many batches; 0 = one commit per load
+}
+
+# Errors meaning the server or client doesn't allow LOAD DATA LOCAL INFILE
+LOCAL_INFILE_DISABLED_ERRNOS = {1148, 2068, 3948, 3950}
+
+# Rows converted to TSV at a time when writing a bulk load file
+BULK_FILE_CHUNK_ROWS = 100000
+
+# Rows sampled to estimate the size of a row in an INSERT statement
+BATCH_SAMPLE_ROWS = 1000
+
+# ALTER TABLE algorithms tried in order for schema changes (cheapest first)
+ALTER_ALGORITHMS = ('INSTANT', 'INPLACE', 'COPY')
+
+# Errors meaning an ALTER can't run with the requested algorithm (unknown
+# algorithm, operation or table not supported, too many instant row versions)
+ER_UNKNOWN_ALTER_ALGORITHM = 1800
+ALTER_ALGORITHM_ERRNOS = {ER_UNKNOWN_ALTER_ALGORITHM, 1845, 1846, 4080, 4092}
+
+# Marker for NULL in LOAD DATA files, and escapes for the default ESCAPED BY '\\'
+TSV_NULL = '\\N'
+TSV_SPECIAL_CHARS = '\\\t\n\r\0'
+TSV_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
 
 class MySQLLoader:
     """Manages MySQL connections and data loading operations"""
@@ -24,43 +62,95 @@ class MySQLLoader:
         """
         self.config = config
         self.connection = None
+        # Pool the current connection was borrowed from (None for a direct connection)
+        self._pool = None
+        self.options = {
+            key: config.get(key, default) for key, default in LOADER_OPTION_DEFAULTS.items()
+        }
+        if self.options['load_method'] not in ('insert', 'load_data'):
+            raise ValueError(f"Invalid load_method '{self.options['load_method']}' (expected 'insert' or 'load_data')")
+        # Cleared when the server refuses LOAD DATA LOCAL INFILE
+        self._bulk_load_enabled = self.options['load_method'] == 'load_data'
+        # Table name -> {'columns': {name: type}, 'indexes': {index names}}
+        self._schema_cache: Dict[str, Dict[str, Any]] = {}
+        # Algorithms the server knows (INSTANT is dropped on MySQL 5.7 and older MariaDB)
+        self._alter_algorithms = list(ALTER_ALGORITHMS)
         
     def connect(self):
-        """Establish connection to MySQL database"""
+        """
+        Establish connection to MySQL database
+        
+        The connection is borrowed from the process-wide pool for this
+        destination (see connection_pool) unless the destination config sets
+        `pool: {enabled: false}`.
+        """
+        if self.connection is not None:
+            self.disconnect()
+        
+        connection_config = {
+            'host': self.config.get('host'),
+            'port': self.config.get('port', 3306),
+            'user': self.config.get('user'),
+            'password': self.config.get('password'),
+            'database': self.config.get('database'),
+            'allow_local_infile': self.options['load_method'] == 'load_data',
+        }
+        pool_options = self.config.get('pool') or {}
+        
         try:
-            self.connection = mysql.connector.connect(
-                host=self.config.get('host'),
-                port=self.config.get('port', 3306),
-                user=self.config.get('user'),
-                password=self.config.get('password'),
-                database=self.config.get('database')
-            )
-            logger.info(f"Connected to MySQL database: {self.config.get('database')}")
+            if pool_enabled(pool_options):
+                self._pool = get_pool(connection_config, pool_options)
+                self.connection = self._pool.acquire()
+            else:
+                self.connection = mysql.connector.connect(**connection_config)
+                logger.info(f"Connected to MySQL database: {self.config.get('database')}")
         except Error as e:
+            self._pool = None
             logger.error(f"Error connecting to MySQL: {e}")
             raise
     
     def disconnect(self):
-        """Close MySQL connection"""
-        if self.connection and self.connection.is_connected():
+        """Close MySQL connection (or give it back to its pool)"""
+        if self.connection is None:
+            return
+        
+        if self._pool is not None:
+            self._pool.release(self.connection)
+            logger.debug("MySQL connection returned to the pool")
+        elif self.connection.is_connected():
             self.connection.close()
             logger.info("MySQL connection closed")
+        
+        self.connection = None
+        self._pool = None
     
     def ensure_connection(self):
         """Ensure database connection is active"""
-        if not self.connection or not self.connection.is_connected():
+        if self.connection is not None and not self.connection.is_connected():
+            # Lost connection: don't give it back to the pool
+            if self._pool is not None:
+                self._pool.discard(self.connection)
+            self.connection = None
+            self._pool = None
+        
+        if self.connection is None:
             self.connect()
     
     def create_table_if_not_exists(self, table_name: str, schema: Dict[str, str]):
         """
         Create table if it doesn't exist
         
+        Tables already in the schema cache are known to exist and are skipped.
+        
         Args:
             table_name: Name of the table
             schema: Dictionary mapping column names to SQL types
         """
         self.ensure_connection()
         
+        if table_name in self._schema_cache:
+            return
+        
         columns = []
         for col_name, col_type in schema.items():
             columns.append(f"`{col_name}` {col_type}")
@@ -81,11 +171,59 @@ class MySQLLoader:
             cursor.execute(create_query)
             self.connection.commit()
             cursor.close()
+            
+            # Read the columns and indexes of the (new or existing) table once
+            self._table_schema(table_name)
             logger.info(f"Table '{table_name}' is ready")
         except Error as e:
             logger.error(f"Error creating table '{table_name}': {e}")
             raise
     
+    def invalidate_schema_cache(self, table_name: Optional[str] = None):
+        """
+        Forget cached table metadata so it is read again on next use
+        
+        Args:
+            table_name: Table to forget, or None for every table
+        """
+        if table_name is None:
+            self._schema_cache.clear()
+        else:
+            self._schema_cache.pop(table_name, None)
+    
+    def _table_schema(self, table_name: str) -> Dict[str, Any]:
+        """
+        Get the columns and indexes of a table from the schema cache
+        
+        The first call for a table reads them with SHOW COLUMNS and SHOW INDEX;
+        after that the loader's own DDL keeps the cache up to date.
+        
+        Args:
+            table_name: Table name
+            
+        Returns:
+            Dictionary with 'columns' (column name -> SQL type) and 'indexes' (index names)
+        """
+        cached = self._schema_cache.get(table_name)
+        if cached is not None:
+            return cached
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SHOW COLUMNS FROM `{table_name}`")
+            columns = {
+                row[0]: row[1].decode() if isinstance(row[1], (bytes, bytearray)) else row[1]
+                for row in cursor.fetchall()
+            }
+            cursor.execute(f"SHOW INDEX FROM `{table_name}`")
+            indexes = {row[2] for row in cursor.fetchall()}
+        finally:
+            cursor.close()
+        
+        cached = self._schema_cache[table_name] = {'columns': columns, 'indexes': indexes}
+        logger.debug(f"Cached schema of '{table_name}': {len(columns)} columns, {len(indexes)} indexes")
+        return cached
+    
     def load_dataframe(self, df: pd.DataFrame, table_name: str, mode: str = 'append'):
         """
         Load pandas DataFrame into MySQL table
@@ -102,15 +240,18 @@ class MySQLLoader:
         self.ensure_connection()
         
         try:
+            # Infer schema from the typed DataFrame (cleaning converts values to objects)
+            schema = self._infer_schema_from_dataframe(df)
+            
             # Clean DataFrame: remove NaN column names and columns with invalid names
+            typed_df = df
             df = self._clean_dataframe(df)
             
             if df.empty or len(df.columns) == 0:
                 logger.warning(f"DataFrame has no valid columns after cleaning")
                 return
             
-            # Infer schema from DataFrame
-            schema = self._infer_schema_from_dataframe(df)
+            schema = {col: schema[col] for col in df.columns}
             self.create_table_if_not_exists(table_name, schema)
             
             # Remove invalid columns from MySQL table (like 'nan')
@@ -121,8 +262,6 @@ class MySQLLoader:
             
             # Prepare data for insertion
             columns = list(df.columns)
-            placeholders = ", ".join(["%s"] * len(columns))
-            columns_str = ", ".join([f"`{col}`" for col in columns])
             
             # Log DataFrame info for debugging
             logger.info(f"DataFrame columns before INSERT: {columns}")
@@ -135,19 +274,14 @@ class MySQLLoader:
                 cursor.execute(f"TRUNCATE TABLE `{table_name}`")
                 cursor.close()
             
-            # Insert data
-            insert_query = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
-            
-            cursor = self.connection.cursor()
-            
-            # Convert DataFrame to list of tuples
-            data = [tuple(row) for row in df.values]
+            if self._use_bulk_load(df):
+                rows_inserted = self._bulk_load(typed_df[list(df.columns)], table_name)
+                if rows_inserted is not None:
+                    logger.info(f"Loaded {rows_inserted} rows into '{table_name}'")
+                    return
             
-            cursor.executemany(insert_query, data)
-            self.connection.commit()
-            
-            rows_inserted = cursor.rowcount
-            cursor.close()
+            # Insert data in multi-row batches
+            rows_inserted = self._insert_batches(df, table_name)
             
             logger.info(f"Loaded {rows_inserted} rows into '{table_name}'")
             
@@ -155,6 +289,8 @@ class MySQLLoader:
             logger.error(f"Error loading data to '{table_name}': {e}")
             if self.connection:
                 self.connection.rollback()
+            # The table may have been changed outside the loader
+            self.invalidate_schema_cache(table_name)
             raise
     
     def upsert_dataframe(self, df: pd.DataFrame, table_name: str, key_columns: List[str]):
@@ -173,15 +309,24 @@ class MySQLLoader:
         self.ensure_connection()
         
         try:
+            # Infer schema from the typed DataFrame (cleaning converts values to objects)
+            schema = self._infer_schema_from_dataframe(df)
+            
             # Clean DataFrame: remove NaN column names and columns with invalid names
+            typed_df = df
             df = self._clean_dataframe(df)
             
             if df.empty or len(df.columns) == 0:
                 logger.warning(f"DataFrame has no valid columns after cleaning")
                 return
             
-            # Infer schema and create table
-            schema = self._infer_schema_from_dataframe(df)
+            # Create table
+            schema = {col: schema[col] for col in df.columns}
+            
+            # TEXT can't be part of a unique key, so text key columns (e.g. breakdown values) are VARCHAR
+            for col in key_columns:
+                if schema.get(col) == "TEXT":
+                    schema[col] = "VARCHAR(255)"
             
             # Add unique key constraint
             self.create_table_if_not_exists(table_name, schema)
@@ -194,28 +339,15 @@ class MySQLLoader:
             
             self._ensure_unique_key(table_name, key_columns)
             
-            # Prepare upsert query
-            columns = list(df.columns)
-            columns_str = ", ".join([f"`{col}`" for col in columns])
-            placeholders = ", ".join(["%s"] * len(columns))
-            
-            # Update clause for non-key columns
-            update_columns = [col for col in columns if col not in key_columns]
-            update_str = ", ".join([f"`{col}` = VALUES(`{col}`)" for col in update_columns])
+            if self._use_bulk_load(df):
+                rows_affected = self._bulk_load(typed_df[list(df.columns)], table_name, key_columns)
+                if rows_affected is not None:
+                    logger.info(f"Upserted {rows_affected} rows into '{table_name}'")
+                    return
             
-            upsert_query = f"""
-            INSERT INTO `{table_name}` ({columns_str})
-            VALUES ({placeholders})
-            ON DUPLICATE KEY UPDATE {update_str}
-            """
-            
-            cursor = self.connection.cursor()
-            data = [tuple(row) for row in df.values]
-            cursor.executemany(upsert_query, data)
-            self.connection.commit()
-            
-            rows_affected = cursor.rowcount
-            cursor.close()
+            # Upsert in multi-row batches, updating the non-key columns
+            update_columns = [col for col in df.columns if col not in key_columns]
+            rows_affected = self._insert_batches(df, table_name, update_columns)
             
             logger.info(f"Upserted {rows_affected} rows into '{table_name}'")
             
@@ -223,8 +355,252 @@ class MySQLLoader:
             logger.error(f"Error upserting data to '{table_name}': {e}")
             if self.connection:
                 self.connection.rollback()
+            # The table may have been changed outside the loader
+            self.invalidate_schema_cache(table_name)
             raise
     
+    def _insert_batches(self, df: pd.DataFrame, table_name: str,
+                        update_columns: Optional[List[str]] = None) -> int:
+        """
+        Insert a cleaned DataFrame with one multi-row INSERT per batch
+        
+        Batches hold up to batch_rows rows and about batch_bytes of SQL, and the
+        transaction is committed every commit_every batches, so neither the
+        statement nor the undo log grows with the DataFrame. Rows are read
+        from the DataFrame batch by batch.
+        
+        Args:
+            df: Cleaned DataFrame (NULLs as None)
+            table_name: Target table name
+            update_columns: Columns updated on duplicate keys (upsert); an empty
+                list skips duplicates; None inserts plainly
+            
+        Returns:
+            Rows affected
+        """
+        columns = list(df.columns)
+        columns_str = ", ".join([f"`{col}`" for col in columns])
+        row_placeholders = f"({', '.join(['%s'] * len(columns))})"
+        
+        if update_columns is None:
+            head, tail = f"INSERT INTO `{table_name}`", ""
+        elif update_columns:
+            update_str = ", ".join([f"`{col}` = VALUES(`{col}`)" for col in update_columns])
+            head, tail = f"INSERT INTO `{table_name}`", f" ON DUPLICATE KEY UPDATE {update_str}"
+        else:
+            head, tail = f"INSERT IGNORE INTO `{table_name}`", ""
+        
+        batch_size = self._batch_size(df)
+        total_batches = -(-len(df) // batch_size)
+        commit_every = self.options['commit_every'] or 0
+        rows_affected = 0
+        started = time.perf_counter()
+        
+        cursor = self.connection.cursor()
+        try:
+            for batch, start in enumerate(range(0, len(df), batch_size), start=1):
+                chunk = df.iloc[start:start + batch_size]
+                values_str = ", ".join([row_placeholders] * len(chunk))
+                cursor.execute(
+                    f"{head} ({columns_str}) VALUES {values_str}{tail}",
+                    chunk.to_numpy().ravel().tolist()
+                )
+                rows_affected += cursor.rowcount
+                
+                if commit_every and batch % commit_every == 0:
+                    self.connection.commit()
+                
+                rows_done = start + len(chunk)
+                elapsed = time.perf_counter() - started
+                logger.info(
+                    f"'{table_name}': batch {batch}/{total_batches}, {rows_done}/{len(df)} rows "
+                    f"({rows_done / elapsed if elapsed else 0:,.0f} rows/s)"
+                )
+            
+            self.connection.commit()
+        finally:
+            cursor.close()
+        
+        return rows_affected
+    
+    def _batch_size(self, df: pd.DataFrame) -> int:
+        """Rows per INSERT batch, within batch_rows and the estimated batch_bytes"""
+        batch_rows = max(1, int(self.options['batch_rows']))
+        batch_bytes = self.options['batch_bytes']
+        if not batch_bytes:
+            return batch_rows
+        
+        # Estimate the row size from rows spread over the DataFrame (quotes and separator per value)
+        sample = df.iloc[::max(1, len(df) // BATCH_SAMPLE_ROWS)]
+        sample_bytes = sum(len(str(value)) + 3 for value in sample.to_numpy().ravel().tolist())
+        row_bytes = max(1.0, sample_bytes / max(1, len(sample)))
+        return max(1, min(batch_rows, int(batch_bytes // row_bytes)))
+    
+    def _use_bulk_load(self, df: pd.DataFrame) -> bool:
+        """Whether a DataFrame is loaded with LOAD DATA LOCAL INFILE"""
+        return self._bulk_load_enabled and len(df) >= self.options['bulk_min_rows']
+    
+    def _bulk_load(self, df: pd.DataFrame, table_name: str,
+                   key_columns: Optional[List[str]] = None) -> Optional[int]:
+        """
+        Load a DataFrame with LOAD DATA LOCAL INFILE
+        
+        Without key columns the rows are appended to the table. With key columns
+        they are loaded into a temporary staging table (later rows replacing
+        earlier ones with the same key) and merged with a single
+        INSERT ... SELECT ... ON DUPLICATE KEY UPDATE.
+        
+        Args:
+            df: Typed DataFrame with the cleaned columns
+            table_name: Target table name
+            key_columns: Columns of the table's unique key (upsert), or None (append)
+            
+        Returns:
+            Rows affected, or None if LOAD DATA LOCAL INFILE isn't allowed
+            (the caller then falls back to INSERT)
+        """
+        columns = list(df.columns)
+        columns_str = ", ".join([f"`{col}`" for col in columns])
+        staging_table = None
+        
+        started = time.perf_counter()
+        path = self._write_load_file(df)
+        written = time.perf_counter()
+        
+        cursor = self.connection.cursor()
+        try:
+            if key_columns is None:
+                rows_affected = self._load_data_infile(cursor, path, table_name, columns)
+            else:
+                # Identifiers are limited to 64 characters; temporary tables are per connection
+                staging_table = f"_elt_stage_{table_name}"[:64]
+                cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{staging_table}`")
+                cursor.execute(f"CREATE TEMPORARY TABLE `{staging_table}` LIKE `{table_name}`")
+                self._load_data_infile(cursor, path, staging_table, columns, replace=True)
+                
+                update_columns = [col for col in columns if col not in key_columns]
+                if update_columns:
+                    update_str = ", ".join([f"`{col}` = VALUES(`{col}`)" for col in update_columns])
+                    merge_query = (
+                        f"INSERT INTO `{table_name}` ({columns_str}) "
+                        f"SELECT {columns_str} FROM `{staging_table}` "
+                        f"ON DUPLICATE KEY UPDATE {update_str}"
+                    )
+                else:
+                    merge_query = (
+                        f"INSERT IGNORE INTO `{table_name}` ({columns_str}) "
+                        f"SELECT {columns_str} FROM `{staging_table}`"
+                    )
+                cursor.execute(merge_query)
+                rows_affected = cursor.rowcount
+            
+            self.connection.commit()
+            logger.info(
+                f"LOAD DATA into '{table_name}': {len(df)} rows, file written in {written - started:.2f}s, "
+                f"loaded in {time.perf_counter() - written:.2f}s"
+            )
+            return rows_affected
+        except Error as e:
+            if e.errno not in LOCAL_INFILE_DISABLED_ERRNOS:
+                raise
+            self.connection.rollback()
+            self._bulk_load_enabled = False
+            logger.warning(f"LOAD DATA LOCAL INFILE is not allowed ({e}), falling back to INSERT")
+            return None
+        finally:
+            if staging_table:
+                try:
+                    cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{staging_table}`")
+                except Error as e:
+                    logger.warning(f"Could not drop staging table '{staging_table}': {e}")
+            cursor.close()
+            os.remove(path)
+    
+    def _load_data_infile(self, cursor, path: str, table_name: str, columns: List[str],
+                          replace: bool = False) -> int:
+        """
+        Run LOAD DATA LOCAL INFILE for a file written by _write_load_file
+        
+        Args:
+            cursor: Open cursor
+            path: TSV file path
+            table_name: Target table name
+            columns: Column of each TSV field, in order
+            replace: Replace rows with a duplicate key instead of skipping them
+            
+        Returns:
+            Rows loaded
+        """
+        columns_str = ", ".join([f"`{col}`" for col in columns])
+        cursor.execute(
+            f"LOAD DATA LOCAL INFILE %s {'REPLACE ' if replace else ''}INTO TABLE `{table_name}` "
+            r"CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' "
+            f"({columns_str})",
+            (path,)
+        )
+        rows_loaded = cursor.rowcount
+        
+        # LOCAL loads turn data errors into warnings (truncated values, bad numbers)
+        if cursor.warning_count:
+            cursor.execute("SHOW WARNINGS LIMIT 5")
+            warnings = [row[2] for row in cursor.fetchall()]
+            logger.warning(f"LOAD DATA into '{table_name}' raised {cursor.warning_count} warnings, e.g. {warnings}")
+        
+        return rows_loaded
+    
+    def _write_load_file(self, df: pd.DataFrame) -> str:
+        """
+        Write a DataFrame to a temporary TSV file for LOAD DATA
+        
+        Uses the LOAD DATA defaults: tab-separated fields, newline-terminated
+        lines, backslash escapes and \\N for NULL.
+        
+        Args:
+            df: Typed DataFrame (before cleaning) with the columns to load
+            
+        Returns:
+            Path of the file (removed by the caller)
+        """
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', suffix='.tsv',
+                                         prefix='elt_load_', dir=self.options['bulk_dir'],
+                                         delete=False) as f:
+            for start in range(0, len(df), BULK_FILE_CHUNK_ROWS):
+                chunk = df.iloc[start:start + BULK_FILE_CHUNK_ROWS]
+                fields = [self._tsv_column(chunk.iloc[:, i]) for i in range(chunk.shape[1])]
+                f.write('\n'.join(map('\t'.join, zip(*fields))))
+                f.write('\n')
+            return f.name
+    
+    @staticmethod
+    def _tsv_column(values: pd.Series) -> np.ndarray:
+        """
+        Format a column as LOAD DATA field values
+        
+        Numbers are formatted from their typed arrays, booleans as 1/0 and
+        datetimes in MySQL format. Text is only escaped when the column holds a
+        tab, newline, backslash or NUL.
+        """
+        nulls = values.isna().to_numpy()
+        dtype = values.dtype
+        
+        if pd.api.types.is_bool_dtype(dtype):
+            text = np.where(values.to_numpy(dtype=bool, na_value=False), '1', '0').astype(object)
+        elif pd.api.types.is_integer_dtype(dtype):
+            text = values.to_numpy(dtype='int64', na_value=0).astype(str).astype(object)
+        elif pd.api.types.is_float_dtype(dtype):
+            text = values.to_numpy(dtype='float64', na_value=np.nan).astype(str).astype(object)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            text = values.dt.strftime('%Y-%m-%d %H:%M:%S.%f').to_numpy(dtype=object)
+        else:
+            text = values.astype(str).to_numpy(dtype=object)
+            # One scan over the joined column instead of checking every value
+            joined = ''.join(text)
+            if any(char in joined for char in TSV_SPECIAL_CHARS):
+                text = np.array([value.translate(TSV_ESCAPES) for value in text], dtype=object)
+        
+        text[nulls] = TSV_NULL
+        return text
+    
     def _ensure_unique_key(self, table_name: str, key_columns: List[str]):
         """
         Ensure unique key exists on the table
@@ -233,120 +609,158 @@ class MySQLLoader:
             table_name: Table name
             key_columns: Columns for unique key
         """
+        key_name = f"uk_{'_'.join(key_columns)}"
+        # Index names are limited to 64 characters (long breakdown keys get a hashed suffix)
+        if len(key_name) > 64:
+            key_name = f"{key_name[:55]}_{zlib.crc32(key_name.encode()):08x}"
+        
         try:
-            cursor = self.connection.cursor()
-            key_name = f"uk_{'_'.join(key_columns)}"
-            key_columns_str = ", ".join([f"`{col}`" for col in key_columns])
-            
-            # Check if key exists
-            cursor.execute(f"""
-                SELECT COUNT(*) FROM information_schema.statistics 
-                WHERE table_schema = '{self.config.get('database')}' 
-                AND table_name = '{table_name}' 
-                AND index_name = '{key_name}'
-            """)
-            
-            if cursor.fetchone()[0] == 0:
-                # Create unique key
-                alter_query = f"ALTER TABLE `{table_name}` ADD UNIQUE KEY `{key_name}` ({key_columns_str})"
-                cursor.execute(alter_query)
-                self.connection.commit()
-                logger.info(f"Created unique key '{key_name}' on '{table_name}'")
+            table = self._table_schema(table_name)
+            if key_name in table['indexes']:
+                return
             
+            # Create unique key
+            key_columns_str = ", ".join([f"`{col}`" for col in key_columns])
+            alter_query = f"ALTER TABLE `{table_name}` ADD UNIQUE KEY `{key_name}` ({key_columns_str})"
+            cursor = self.connection.cursor()
+            cursor.execute(alter_query)
+            self.connection.commit()
             cursor.close()
+            table['indexes'].add(key_name)
+            logger.info(f"Created unique key '{key_name}' on '{table_name}'")
         except Error as e:
             logger.warning(f"Could not ensure unique key on '{table_name}': {e}")
+            self.invalidate_schema_cache(table_name)
     
     def _add_missing_columns(self, table_name: str, schema: Dict[str, str]):
         """
         Add missing columns to existing table
         
+        All missing columns are added in one ALTER TABLE (a single metadata
+        change or rebuild instead of one per column). If that fails, they are
+        added one by one so a single bad column doesn't block the rest.
+        
         Args:
             table_name: Table name
             schema: Dictionary mapping column names to SQL types
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Get existing columns using SHOW COLUMNS (safer than DESC)
-            cursor.execute(f"SHOW COLUMNS FROM `{table_name}`")
-            existing_columns = {row[0] for row in cursor.fetchall()}
+            existing_columns = self._table_schema(table_name)['columns']
             
             logger.info(f"Table '{table_name}' has {len(existing_columns)} existing columns")
             logger.info(f"DataFrame has {len(schema)} columns to check")
             
             # Find missing columns
-            missing_columns = set(schema.keys()) - existing_columns
+            missing_columns = [col for col in schema if col not in existing_columns]
             
             if missing_columns:
                 logger.info(f"Found {len(missing_columns)} missing columns to add")
             else:
                 logger.info(f"No missing columns to add")
+                return
             
-            # Add missing columns
-            for col_name in missing_columns:
-                col_type = schema[col_name]
-                alter_query = f"ALTER TABLE `{table_name}` ADD COLUMN `{col_name}` {col_type}"
+            cursor = self.connection.cursor()
+            try:
+                started = time.perf_counter()
+                add_str = ", ".join([f"ADD COLUMN `{col}` {schema[col]}" for col in missing_columns])
+                algorithm = self._alter_table(cursor, table_name, add_str)
+                for col_name in missing_columns:
+                    existing_columns[col_name] = schema[col_name]
+                logger.info(
+                    f"✅ Added {len(missing_columns)} columns to table '{table_name}' in "
+                    f"{time.perf_counter() - started:.2f}s (ALGORITHM={algorithm}): {missing_columns}"
+                )
+            except Error as e:
+                logger.warning(f"Could not add columns to '{table_name}' in one ALTER ({e}), adding them one by one")
                 
-                try:
-                    cursor.execute(alter_query)
-                    self.connection.commit()
-                    logger.info(f"✅ Added column '{col_name}' ({col_type}) to table '{table_name}'")
-                except Error as e:
-                    logger.warning(f"❌ Could not add column '{col_name}' to '{table_name}': {e}")
-            
-            cursor.close()
+                for col_name in missing_columns:
+                    col_type = schema[col_name]
+                    try:
+                        started = time.perf_counter()
+                        algorithm = self._alter_table(cursor, table_name, f"ADD COLUMN `{col_name}` {col_type}")
+                        existing_columns[col_name] = col_type
+                        logger.info(
+                            f"✅ Added column '{col_name}' ({col_type}) to table '{table_name}' in "
+                            f"{time.perf_counter() - started:.2f}s (ALGORITHM={algorithm})"
+                        )
+                    except Error as e:
+                        logger.warning(f"❌ Could not add column '{col_name}' to '{table_name}': {e}")
+                        self.invalidate_schema_cache(table_name)
+            finally:
+                cursor.close()
         except Error as e:
             logger.error(f"Could not check for missing columns on '{table_name}': {e}")
+            self.invalidate_schema_cache(table_name)
+    
+    def _alter_table(self, cursor, table_name: str, alter_spec: str) -> str:
+        """
+        Run ALTER TABLE with the cheapest algorithm the server accepts
+        
+        Tries ALGORITHM=INSTANT (metadata only, no rebuild), then INPLACE, then
+        COPY. An algorithm the server doesn't know is not tried again.
+        
+        Args:
+            cursor: Open cursor
+            table_name: Table name
+            alter_spec: Comma-separated alter operations (e.g. "ADD COLUMN `a` TEXT, ...")
+            
+        Returns:
+            Algorithm used
+            
+        Raises:
+            Error: If the ALTER fails for a reason other than the algorithm
+        """
+        error = None
+        for algorithm in list(self._alter_algorithms):
+            try:
+                cursor.execute(f"ALTER TABLE `{table_name}` {alter_spec}, ALGORITHM={algorithm}")
+                self.connection.commit()
+                return algorithm
+            except Error as e:
+                if e.errno not in ALTER_ALGORITHM_ERRNOS:
+                    raise
+                if e.errno == ER_UNKNOWN_ALTER_ALGORITHM:
+                    self._alter_algorithms.remove(algorithm)
+                logger.debug(f"ALTER TABLE '{table_name}' can't use ALGORITHM={algorithm}: {e}")
+                error = e
+        raise error
     
     def _remove_invalid_columns(self, table_name: str):
         """
         Remove columns with invalid names (like 'nan', 'none', etc.)
-        Uses information_schema to avoid direct table access
+        Uses the schema cache instead of querying the table
         
         Args:
             table_name: Table name
         """
         try:
-            cursor = self.connection.cursor()
-            
-            # Get database name
-            cursor.execute("SELECT DATABASE()")
-            db_name = cursor.fetchone()[0]
+            existing_columns = self._table_schema(table_name)['columns']
             
             # List of invalid column names to remove
             invalid_names = ['nan', 'none', 'nat', 'null', 'undefined']
+            columns_to_drop = [col for col in existing_columns if str(col).lower() in invalid_names]
             
-            # Get columns with invalid names using information_schema
-            query = """
-                SELECT COLUMN_NAME 
-                FROM information_schema.COLUMNS 
-                WHERE TABLE_SCHEMA = %s 
-                AND TABLE_NAME = %s 
-                AND LOWER(COLUMN_NAME) IN (%s)
-            """ % (
-                f"'{db_name}'",
-                f"'{table_name}'",
-                ', '.join([f"'{name}'" for name in invalid_names])
-            )
-            
-            cursor.execute(query)
-            columns_to_drop = [row[0] for row in cursor.fetchall()]
+            if not columns_to_drop:
+                return
             
             # Drop invalid columns
+            cursor = self.connection.cursor()
             for col_name in columns_to_drop:
                 try:
                     alter_query = f"ALTER TABLE `{table_name}` DROP COLUMN `{col_name}`"
                     cursor.execute(alter_query)
                     self.connection.commit()
+                    existing_columns.pop(col_name, None)
                     logger.info(f"Removed invalid column '{col_name}' from table '{table_name}'")
                 except Error as e:
                     logger.warning(f"Could not remove column '{col_name}': {e}")
+                    self.invalidate_schema_cache(table_name)
             
             cursor.close()
             
         except Exception as e:
             logger.warning(f"Could not remove invalid columns from '{table_name}': {e}")
+            self.invalidate_schema_cache(table_name)
     
     def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -390,8 +804,9 @@ class MySQLLoader:
             
             # Replace all NaN, None, and pd.NA values with None (SQL NULL)
             # This is crucial to avoid "Unknown column 'nan'" errors
-            df = df.replace({pd.NA: None, pd.NaT: None, float('nan'): None})
-            df = df.where(pd.notna(df), None)
+            # Casting to object first keeps categorical and nullable columns from
+            # turning None back into NaN/<NA>
+            df = df.astype(object).where(pd.notna(df), None)
             
             logger.info(f"DataFrame cleaned: {len(valid_cols)} valid columns, NaN values replaced with NULL")
             
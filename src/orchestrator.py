@@ -2,17 +2,36 @@
 ELT Pipeline Orchestrator
 Coordinates extraction, loading, and transformation operations
 """
+from __future__ import annotations
+
 import logging
-from typing import Dict, Any, List
-from datetime import datetime
-import pandas as pd
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, Any, List, Iterator, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+
+from src.core import ConfigManager, StateStore
 
-from src.core import ConfigManager
-from src.extractors import FacebookAdsExtractor
-from src.loaders import MySQLLoader
+if TYPE_CHECKING:
+    import pandas as pd
+    from src.extractors.facebook_ads_extractor import DimensionPrefetch
+
+# pandas, the Facebook SDK and the MySQL driver are imported on first use of an
+# extractor or loader, so the CLI and the web API start without them
 
 logger = logging.getLogger(__name__)
 
+# Rows per extracted chunk when neither the table nor the sync config sets chunk_rows
+DEFAULT_CHUNK_ROWS = 50000
+
+# Where incremental sync watermarks are kept when sync.state_file is not set
+DEFAULT_STATE_FILE = 'state/sync_state.json'
+
+# Source and destination types with an extractor / loader
+SOURCE_TYPES = ('facebook_ads',)
+DESTINATION_TYPES = ('mysql',)
+
 
 class Pipeline:
     """Orchestrates the ELT pipeline for a single source-destination pair"""
@@ -30,16 +49,38 @@ class Pipeline:
         self.source_name = source_config.get('name')
         self.source_type = source_config.get('type')
         self.destination_name = destination_config.get('name')
+        self._account_ids = None
         
-        # Initialize extractor based on source type
-        self.extractor = self._create_extractor()
+        # Unsupported types fail here; the extractor and loader are created on first use
+        if self.source_type not in SOURCE_TYPES:
+            raise ValueError(f"Unsupported source type: {self.source_type}")
+        if destination_config.get('type') not in DESTINATION_TYPES:
+            raise ValueError(f"Unsupported destination type: {destination_config.get('type')}")
+        self._extractor = None
+        self._loader = None
         
-        # Initialize loader based on destination type
-        self.loader = self._create_loader()
+        # Watermarks for incremental dimension syncs
+        sync_config = source_config.get('sync', {})
+        self.state_store = StateStore(sync_config.get('state_file', DEFAULT_STATE_FILE))
+    
+    @property
+    def extractor(self):
+        """Source extractor (created, with its SDK imported, on first use)"""
+        if self._extractor is None:
+            self._extractor = self._create_extractor()
+        return self._extractor
+    
+    @property
+    def loader(self):
+        """Destination loader (created, with its driver imported, on first use)"""
+        if self._loader is None:
+            self._loader = self._create_loader()
+        return self._loader
     
     def _create_extractor(self):
         """Create appropriate extractor based on source type"""
         if self.source_type == 'facebook_ads':
+            from src.extractors import FacebookAdsExtractor
             return FacebookAdsExtractor(self.source_config.get('config', {}))
         else:
             raise ValueError(f"Unsupported source type: {self.source_type}")
@@ -49,50 +90,332 @@ class Pipeline:
         dest_type = self.destination_config.get('type')
         
         if dest_type == 'mysql':
+            from src.loaders import MySQLLoader
             return MySQLLoader(self.destination_config.get('config', {}))
         else:
             raise ValueError(f"Unsupported destination type: {dest_type}")
     
+    @property
+    def multi_account(self) -> bool:
+        """Whether the source lists several ad accounts or a business to discover them from"""
+        config = self.source_config.get('config', {})
+        return bool(config.get('ad_account_ids') or config.get('business_id'))
+    
+    def _get_account_ids(self) -> List[str]:
+        """
+        Get the ad accounts of a multi-account source (discovered once per pipeline)
+        
+        Returns:
+            Ad account IDs from ad_account_ids, or owned and client accounts of business_id
+        """
+        if self._account_ids is None:
+            config = self.source_config.get('config', {})
+            account_ids = config.get('ad_account_ids')
+            if not account_ids:
+                account_ids = self.extractor.discover_ad_accounts(config.get('business_id'))
+            elif isinstance(account_ids, str):
+                account_ids = [account_id.strip() for account_id in account_ids.split(',') if account_id.strip()]
+            self._account_ids = list(account_ids)
+        return self._account_ids
+    
+    def _iter_account_chunks(
+        self,
+        table_config: Dict[str, Any]
+    ) -> Iterator[Tuple[str, pd.DataFrame, Optional[List[str]]]]:
+        """
+        Extract a table from every ad account across a process pool
+        
+        Each worker process opens its own API session for one account and
+        spools its chunks to a temporary directory (sync.spool_dir). Only
+        account_workers accounts are extracted ahead of the loader, and chunks
+        are read back one at a time.
+        
+        Args:
+            table_config: Table configuration
+            
+        Yields:
+            (source table name, chunk, upsert key columns) tuples, chunks tagged
+            with account_id, in account order
+            
+        Raises:
+            RuntimeError: If any account failed, once the other accounts are loaded
+                (so the table's incremental watermark is not advanced)
+        """
+        from src.extractors.facebook_ads_extractor import extract_account_table
+        
+        account_ids = self._get_account_ids()
+        if not account_ids:
+            logger.warning(f"No ad accounts to extract for source '{self.source_name}'")
+            return
+        
+        import pandas as pd
+        
+        config = self.source_config.get('config', {})
+        sync_config = self.source_config.get('sync', {})
+        chunk_rows = self._get_chunk_rows(table_config)
+        max_workers = max(1, min(sync_config.get('account_workers', 4), len(account_ids)))
+        table_name = table_config.get('name')
+        logger.info(f"Extracting {table_name} from {len(account_ids)} ad accounts with {max_workers} processes")
+        
+        with tempfile.TemporaryDirectory(prefix=f"accounts_{table_name}_", dir=sync_config.get('spool_dir')) as spool, \
+                ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = list(account_ids)
+            in_flight = []  # (account_id, future), in account order
+            failed = {}  # account_id -> error
+            
+            while pending or in_flight:
+                while pending and len(in_flight) < max_workers:
+                    account_id = pending.pop(0)
+                    future = executor.submit(
+                        extract_account_table, config, account_id, table_config, tempfile.mkdtemp(dir=spool), chunk_rows
+                    )
+                    in_flight.append((account_id, future))
+                
+                account_id, future = in_flight.pop(0)
+                try:
+                    chunks = future.result()
+                except Exception as e:
+                    # One failing account doesn't stop the others
+                    logger.error(f"Error extracting {table_name} for account {account_id}: {e}")
+                    failed[account_id] = e
+                    continue
+                logger.info(f"  {account_id}: {sum(rows for _, _, _, rows in chunks)} {table_name} rows")
+                for chunk_table, path, key_columns, _ in chunks:
+                    df = pd.read_pickle(path)
+                    os.remove(path)
+                    yield chunk_table, df, key_columns
+        
+        if failed:
+            raise RuntimeError(
+                f"{table_name} extraction failed for {len(failed)} of {len(account_ids)} ad accounts: "
+                + '; '.join(f"{account_id}: {error}" for account_id, error in failed.items())
+            ) from next(iter(failed.values()))
+    
+    def _get_chunk_rows(self, table_config: Dict[str, Any]) -> int:
+        """
+        Get the extraction chunk size for a table
+        
+        Args:
+            table_config: Table configuration
+            
+        Returns:
+            Rows per chunk (0 or None loads the whole table at once)
+        """
+        sync_config = self.source_config.get('sync', {})
+        return table_config.get('chunk_rows', sync_config.get('chunk_rows', DEFAULT_CHUNK_ROWS))
+    
+    def _prefetch_dimensions(self, tables: List[Dict[str, Any]]) -> Optional[DimensionPrefetch]:
+        """
+        Start extracting the dimension tables concurrently, ahead of loading
+        
+        Args:
+            tables: Table configurations to sync
+            
+        Returns:
+            DimensionPrefetch streaming each table's chunks (None if disabled or failed)
+        """
+        sync_config = self.source_config.get('sync', {})
+        if not sync_config.get('parallel_dimensions', True) or self.multi_account:
+            # Multi-account sources already extract in parallel across accounts
+            return None
+        
+        try:
+            return self.extractor.extract_dimensions(
+                tables,
+                chunk_rows=sync_config.get('chunk_rows', DEFAULT_CHUNK_ROWS),
+                max_workers=sync_config.get('dimension_workers', 3)
+            )
+        except Exception as e:
+            # Fall back to extracting each table on its own
+            logger.warning(f"Concurrent dimension extraction failed, extracting tables one by one: {e}")
+            return None
+    
+    def _state_key(self, table_name: str) -> str:
+        """Key of a table's sync state in the state store"""
+        return f"{self.source_name}.{table_name}"
+    
+    def _apply_incremental_state(self, tables: List[Dict[str, Any]], sync_started: datetime) -> List[Dict[str, Any]]:
+        """
+        Limit dimension tables to objects updated since their last sync
+        
+        A table without a watermark, or whose last full sync is older than
+        sync.full_refresh_hours, is read in full to reconcile deleted and
+        archived objects that an updated_time filter can miss.
+        
+        Args:
+            tables: Table configurations to sync
+            sync_started: Start of this run (naive UTC)
+            
+        Returns:
+            Table configurations with updated_since set where applicable
+        """
+        sync_config = self.source_config.get('sync', {})
+        if not sync_config.get('incremental', False):
+            return tables
+        
+        from src.extractors.facebook_ads_extractor import DIMENSION_TABLES
+        
+        full_refresh = timedelta(hours=sync_config.get('full_refresh_hours', 24))
+        overlap = timedelta(seconds=sync_config.get('watermark_overlap_seconds', 300))
+        
+        prepared = []
+        for table_config in tables:
+            table_name = table_config.get('name')
+            if table_name not in DIMENSION_TABLES:
+                prepared.append(table_config)
+                continue
+            
+            state = self.state_store.get(self._state_key(table_name), {})
+            watermark = state.get('watermark')
+            last_full_sync = state.get('last_full_sync')
+            
+            # Deleted and archived objects are only returned when asked for
+            table_config = {**table_config, 'include_deleted': table_config.get('include_deleted', True)}
+            fields = table_config.get('fields')
+            if fields and 'updated_time' not in fields:
+                # The next watermark is taken from the loaded updated_time values
+                # (the default field lists of every dimension table include it)
+                table_config['fields'] = list(fields) + ['updated_time']
+            if (
+                watermark and last_full_sync and
+                sync_started - datetime.fromisoformat(last_full_sync) < full_refresh
+            ):
+                table_config['updated_since'] = (datetime.fromisoformat(watermark) - overlap).isoformat()
+                logger.info(f"Incremental sync of '{table_name}' since {table_config['updated_since']}")
+            else:
+                table_config['updated_since'] = None
+                logger.info(f"Full reconciliation of '{table_name}'")
+            prepared.append(table_config)
+        
+        return prepared
+    
+    def _save_incremental_state(self, table_config: Dict[str, Any], max_updated_time: Any, sync_started: datetime):
+        """
+        Persist the watermark of a successfully synced dimension table
+        
+        Args:
+            table_config: Table configuration as returned by _apply_incremental_state
+            max_updated_time: Latest updated_time loaded (None if no rows)
+            sync_started: Start of this run (naive UTC)
+        """
+        if 'updated_since' not in table_config:
+            return
+        
+        import pandas as pd
+        
+        key = self._state_key(table_config.get('name'))
+        state = dict(self.state_store.get(key, {}))
+        
+        if max_updated_time is not None and not pd.isna(max_updated_time):
+            state['watermark'] = pd.Timestamp(max_updated_time).isoformat()
+        elif not state.get('watermark'):
+            # Nothing was returned: later objects are newer than this run
+            state['watermark'] = sync_started.isoformat()
+        
+        if table_config.get('updated_since') is None:
+            state['last_full_sync'] = sync_started.isoformat()
+        
+        self.state_store.set(key, state)
+    
+    @staticmethod
+    def _max_updated_time(df: pd.DataFrame, current: Any) -> Any:
+        """Latest updated_time seen so far across the loaded chunks"""
+        if 'updated_time' not in df.columns:
+            return current
+        
+        import pandas as pd
+        
+        chunk_max = pd.to_datetime(df['updated_time'], errors='coerce').max()
+        if pd.isna(chunk_max):
+            return current
+        return chunk_max if current is None else max(current, chunk_max)
+    
+    def _iter_chunks(
+        self,
+        table_config: Dict[str, Any],
+        prefetched: Optional[DimensionPrefetch]
+    ) -> Iterator[Tuple[str, pd.DataFrame, Optional[List[str]]]]:
+        """
+        Iterate the extracted chunks of a table
+        
+        Args:
+            table_config: Table configuration
+            prefetched: Dimension tables being extracted by _prefetch_dimensions
+            
+        Yields:
+            Tuples of (source table name, DataFrame chunk, upsert key columns or None);
+            breakdown sets and rolled-up levels are tables of their own
+        """
+        table_name = table_config.get('name')
+        if prefetched is not None and table_name in prefetched:
+            for df in prefetched.iter_table(table_name):
+                yield table_name, df, None
+        elif self.multi_account:
+            yield from self._iter_account_chunks(table_config)
+        else:
+            yield from self.extractor.iter_table_chunks(table_config, self._get_chunk_rows(table_config))
+    
+    def _load_chunk(self, df: pd.DataFrame, table_name: str, key_columns: Optional[List[str]] = None):
+        """
+        Load one extracted chunk into its destination table
+        
+        Args:
+            df: Extracted data
+            table_name: Source table name
+            key_columns: Upsert key (default: 'id' when present, otherwise append)
+        """
+        target_table = f"{self.source_type}_{table_name}"
+        
+        if key_columns:
+            self.loader.upsert_dataframe(df, target_table, key_columns=key_columns)
+        # Use upsert for tables with IDs, otherwise append
+        elif 'id' in df.columns:
+            self.loader.upsert_dataframe(df, target_table, key_columns=['id'])
+        else:
+            self.loader.load_dataframe(df, target_table, mode='append')
+    
     def run(self):
         """Execute the ELT pipeline"""
         logger.info(f"Starting ELT pipeline: {self.source_name} -> {self.destination_name}")
         
         start_time = datetime.now()
         total_rows = 0
+        prefetched = None
         
         try:
             # Connect to destination
             self.loader.connect()
             
             # Get tables to sync from configuration
+            sync_started = datetime.now(timezone.utc).replace(tzinfo=None)
             tables = self.source_config.get('sync', {}).get('tables', [])
+            tables = self._apply_incremental_state(tables, sync_started)
+            prefetched = self._prefetch_dimensions(tables)
             
             for table_config in tables:
                 table_name = table_config.get('name')
                 
+                table_rows = 0
                 try:
                     logger.info(f"Processing table: {table_name}")
                     
-                    # Extract data
-                    df = self.extractor.extract_table(table_config)
+                    # Extract and load chunk by chunk as API pages arrive
+                    max_updated_time = None
+                    for chunk_table, df, key_columns in self._iter_chunks(table_config, prefetched):
+                        self._load_chunk(df, chunk_table, key_columns)
+                        table_rows += len(df)
+                        total_rows += len(df)
+                        max_updated_time = self._max_updated_time(df, max_updated_time)
                     
-                    if df.empty:
+                    self._save_incremental_state(table_config, max_updated_time, sync_started)
+                    
+                    if table_rows == 0:
                         logger.warning(f"No data extracted for table '{table_name}'")
                         continue
                     
-                    # Load data
-                    target_table = f"{self.source_type}_{table_name}"
-                    
-                    # Use upsert for tables with IDs, otherwise append
-                    if 'id' in df.columns:
-                        self.loader.upsert_dataframe(df, target_table, key_columns=['id'])
-                    else:
-                        self.loader.load_dataframe(df, target_table, mode='append')
-                    
-                    total_rows += len(df)
-                    
                 except Exception as e:
-                    logger.error(f"Error processing table '{table_name}': {e}")
+                    # Chunks loaded before the error are kept
+                    logger.error(f"Error processing table '{table_name}' after loading {table_rows} rows: {e}")
                     continue
             
             # Disconnect from destination
@@ -100,6 +423,8 @@ class Pipeline:
             
             duration = (datetime.now() - start_time).total_seconds()
             logger.info(f"Pipeline completed successfully in {duration:.2f}s. Total rows: {total_rows}")
+            if getattr(self._extractor, 'http_stats', None):
+                logger.info(f"Graph API HTTP: {self.extractor.http_stats.summary()}")
             
             return {
                 'success': True,
@@ -120,6 +445,10 @@ class Pipeline:
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            # Stop dimension workers whose tables were not read
+            if prefetched is not None:
+                prefetched.close()
     
     def run_with_progress(self, progress_callback=None):
         """Execute the ELT pipeline with progress callbacks"""
@@ -127,6 +456,7 @@ class Pipeline:
         
         start_time = datetime.now()
         total_rows = 0
+        prefetched = None
         
         if progress_callback:
             progress_callback("🚀 Iniciando sincronización...", 0)
@@ -138,50 +468,52 @@ class Pipeline:
             self.loader.connect()
             
             # Get tables to sync from configuration
+            sync_started = datetime.now(timezone.utc).replace(tzinfo=None)
             tables = self.source_config.get('sync', {}).get('tables', [])
+            tables = self._apply_incremental_state(tables, sync_started)
             total_tables = len(tables)
             
             if progress_callback:
                 progress_callback(f"📋 {total_tables} tablas por sincronizar", 10)
             
+            prefetched = self._prefetch_dimensions(tables)
+            
             for idx, table_config in enumerate(tables):
                 table_name = table_config.get('name')
                 progress_pct = 10 + (idx / total_tables) * 70  # 10-80% para las tablas
                 
+                table_rows = 0
                 try:
                     if progress_callback:
                         progress_callback(f"📥 Extrayendo: {table_name}...", progress_pct)
                     
                     logger.info(f"Processing table: {table_name}")
                     
-                    # Extract data
-                    df = self.extractor.extract_table(table_config)
+                    # Extract and load chunk by chunk as API pages arrive
+                    max_updated_time = None
+                    for chunk_table, df, key_columns in self._iter_chunks(table_config, prefetched):
+                        if progress_callback:
+                            progress_callback(f"💾 Cargando {len(df)} registros de {chunk_table}...", progress_pct + 10)
+                        
+                        self._load_chunk(df, chunk_table, key_columns)
+                        table_rows += len(df)
+                        total_rows += len(df)
+                        max_updated_time = self._max_updated_time(df, max_updated_time)
+                    
+                    self._save_incremental_state(table_config, max_updated_time, sync_started)
                     
-                    if df.empty:
+                    if table_rows == 0:
                         logger.warning(f"No data extracted for table '{table_name}'")
                         if progress_callback:
                             progress_callback(f"⚠️  {table_name}: Sin datos", progress_pct + 5)
                         continue
                     
                     if progress_callback:
-                        progress_callback(f"💾 Cargando {len(df)} registros de {table_name}...", progress_pct + 10)
-                    
-                    # Load data
-                    target_table = f"{self.source_type}_{table_name}"
-                    
-                    # Use upsert for tables with IDs, otherwise append
-                    if 'id' in df.columns:
-                        self.loader.upsert_dataframe(df, target_table, key_columns=['id'])
-                    else:
-                        self.loader.load_dataframe(df, target_table, mode='append')
-                    
-                    total_rows += len(df)
-                    
-                    if progress_callback:
-                        progress_callback(f"✅ {table_name}: {len(df)} registros", progress_pct + 15)
+                        progress_callback(f"✅ {table_name}: {table_rows} registros", progress_pct + 15)
                     
                 except Exception as e:
-                    logger.error(f"Error processing table '{table_name}': {e}")
+                    # Chunks loaded before the error are kept
+                    logger.error(f"Error processing table '{table_name}' after loading {table_rows} rows: {e}")
                     if progress_callback:
                         progress_callback(f"❌ Error en {table_name}: {str(e)[:50]}", progress_pct)
                     continue
@@ -193,6 +525,8 @@ class Pipeline:
             
             duration = (datetime.now() - start_time).total_seconds()
             logger.info(f"Pipeline completed successfully in {duration:.2f}s. Total rows: {total_rows}")
+            if getattr(self._extractor, 'http_stats', None):
+                logger.info(f"Graph API HTTP: {self.extractor.http_stats.summary()}")
             
             if progress_callback:
                 progress_callback(f"🎉 Completado: {total_rows} registros en {duration:.1f}s", 100)
@@ -219,6 +553,10 @@ class Pipeline:
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            # Stop dimension workers whose tables were not read
+            if prefetched is not None:
+                prefetched.close()
 
 
 class Orchestrator:
@@ -0,0 +1,78 @@
+"""
+Test that a failing ad account doesn't advance the incremental watermark of a multi-account sync
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.core import StateStore
+from src.extractors import facebook_ads_extractor
+from src.orchestrator import Pipeline
+
+
+class MockAccount:
+    """Ad account returning one campaign (act_2 fails)"""
+
+    def __init__(self, account_id):
+        self.account_id = account_id
+
+    def get_campaigns(self, fields, params=None):
+        if self.account_id == 'act_2':
+            raise RuntimeError('Service temporarily unavailable')
+        number = self.account_id[len('act_'):]
+        return iter([{'id': f"{number}0", 'name': f"Campaign {number}", 'updated_time': '2025-01-0%sT00:00:00+0000' % number}])
+
+
+def mock_initialize_api(self):
+    self.api = None
+    self.ad_account = MockAccount(facebook_ads_extractor.normalize_account_id(self.config['ad_account_id']))
+
+
+class MockLoader:
+    def __init__(self):
+        self.rows = []
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def upsert_dataframe(self, df, table_name, key_columns):
+        self.rows.extend(df['account_id'].tolist())
+
+
+def run_pipeline(account_ids, state_file):
+    source_config = {
+        'name': 'facebook_ads_main',
+        'type': 'facebook_ads',
+        'config': {'access_token': 'test', 'ad_account_ids': account_ids},
+        'sync': {
+            'incremental': True,
+            'state_file': str(state_file),
+            'account_workers': 2,
+            'tables': [{'name': 'campaigns', 'fields': ['id', 'name']}],
+        },
+    }
+    pipeline = Pipeline(source_config, {'name': 'mysql_main', 'type': 'mysql', 'config': {}})
+    pipeline._loader = MockLoader()
+    result = pipeline.run()
+    return pipeline, result
+
+
+def test_failed_account_keeps_watermark(tmp_path, monkeypatch):
+    monkeypatch.setattr(facebook_ads_extractor.FacebookAdsExtractor, '_initialize_api', mock_initialize_api)
+    state_file = tmp_path / 'sync_state.json'
+
+    # The other accounts are still loaded, but no watermark is saved
+    pipeline, result = run_pipeline(['act_1', 'act_2', 'act_3'], state_file)
+    assert result['success']
+    assert sorted(pipeline.loader.rows) == [1, 3]
+    assert StateStore(str(state_file)).get(pipeline._state_key('campaigns')) is None
+
+    # Once every account succeeds the watermark advances
+    pipeline, result = run_pipeline(['act_1', 'act_3'], state_file)
+    assert sorted(pipeline.loader.rows) == [1, 3]
+    state = StateStore(str(state_file)).get(pipeline._state_key('campaigns'))
+    assert state['watermark'].startswith('2025-01-03')
@@ -0,0 +1,97 @@
+"""
+Test that async report runs stay within async_max_jobs when date windows are fetched in parallel
+"""
+import sys
+import threading
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+from src.extractors.facebook_ads_extractor import FacebookAdsExtractor
+
+
+class MockReportRun:
+    """AdReportRun completing after a few status checks"""
+
+    def __init__(self, account, run_id, since):
+        self.account = account
+        self.run_id = run_id
+        self.since = since
+        self.polls = 0
+        self.status = {}
+
+    def get_id(self):
+        return self.run_id
+
+    def api_get(self, fields):
+        self.polls += 1
+        done = self.polls >= 3
+        self.status = {'async_status': 'Job Completed' if done else 'Job Running',
+                       'async_percent_completion': 100 if done else 50}
+
+    def __getitem__(self, field):
+        return self.status[field]
+
+    def get_insights(self, params):
+        with self.account.lock:
+            self.account.in_flight -= 1
+        return iter([{'date_start': self.since, 'date_stop': self.since, 'impressions': '100'}])
+
+
+class MockAccount:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.submitted = 0
+
+    def get_insights(self, fields, params, is_async=False):
+        assert is_async
+        with self.lock:
+            self.submitted += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            return MockReportRun(self, str(self.submitted), params['time_range']['since'])
+
+
+def mock_initialize_api(self):
+    self.api = None
+    self.ad_account = MockAccount()
+
+
+@pytest.fixture
+def extractor(monkeypatch):
+    monkeypatch.setattr(FacebookAdsExtractor, '_initialize_api', mock_initialize_api)
+    return FacebookAdsExtractor({'access_token': 'test', 'ad_account_id': 'act_1'})
+
+
+def test_report_runs_in_flight_are_shared_across_windows(extractor):
+    options = {
+        'async_mode': 'always', 'async_chunk_days': 1, 'async_max_jobs': 2, 'async_poll_interval': 0.01,
+        'window_size': 2, 'max_workers': 4,
+    }
+    df = extractor.extract_insights(
+        level='account', start_date='2025-01-01', end_date='2025-01-12', fields=['impressions'], options=options
+    )
+    assert len(df) == 12
+    assert extractor.ad_account.submitted == 12
+    # 4 windows in parallel, but never more than async_max_jobs runs for the extractor
+    assert extractor.ad_account.peak == 2
+    assert extractor._report_run_slots.in_flight == 0
+
+
+def test_failed_report_run_gives_its_slots_back(extractor, monkeypatch):
+    def failing_api_get(self, fields):
+        self.status = {'async_status': 'Job Failed', 'async_percent_completion': 0}
+
+    monkeypatch.setattr(MockReportRun, 'api_get', failing_api_get)
+    with pytest.raises(RuntimeError, match='Job Failed'):
+        list(extractor._fetch_insights_async(
+            ['impressions'], {'level': 'account', 'time_increment': 1},
+            date(2025, 1, 1), date(2025, 1, 3),
+            {'async_chunk_days': 1, 'async_max_jobs': 3, 'async_poll_interval': 0},
+        ))
+    assert extractor._report_run_slots.in_flight == 0
@@ -0,0 +1,184 @@
+"""
+Test the process-wide MySQL connection pool with fake connections (no MySQL server needed)
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+from mysql.connector import Error
+from mysql.connector.errors import PoolError
+
+from src.loaders import connection_pool
+from src.loaders.connection_pool import ConnectionPool, get_pool
+
+
+class FakeConnection:
+    """Connection recording what the pool does with it"""
+
+    def __init__(self, pool_ref):
+        self.pool_ref = pool_ref
+        self.in_transaction = False
+        self.unread_result = False
+        self.healthy = True
+        self.rolled_back = 0
+        self.closed = False
+        self.closed_under_lock = None
+
+    def ping(self, reconnect=False):
+        if not self.healthy:
+            raise Error('MySQL server has gone away')
+
+    def rollback(self):
+        self.rolled_back += 1
+        self.in_transaction = False
+
+    def consume_results(self):
+        self.unread_result = False
+
+    def close(self):
+        self.closed = True
+        pool = self.pool_ref.get('pool')
+        self.closed_under_lock = pool is not None and pool._condition._is_owned()
+
+
+class Opened(list):
+    """Connections opened by the fake connect, in order"""
+
+
+@pytest.fixture
+def fake_connect(monkeypatch):
+    """Replace mysql.connector.connect; returns the list of opened connections"""
+    pool_ref = {}
+    opened = Opened()
+
+    def connect(**config):
+        connection = FakeConnection(pool_ref)
+        opened.append(connection)
+        return connection
+
+    monkeypatch.setattr(connection_pool.mysql.connector, 'connect', connect)
+    opened.pool_ref = pool_ref
+    return opened
+
+
+def make_pool(fake_connect, **options):
+    pool = ConnectionPool({'host': 'db', 'user': 'etl', 'database': 'ads'}, **options)
+    fake_connect.pool_ref['pool'] = pool
+    return pool
+
+
+def test_reuses_connections_up_to_max_size(fake_connect):
+    pool = make_pool(fake_connect, max_size=2, acquire_timeout=0.2)
+    first, second = pool.acquire(), pool.acquire()
+    assert len(fake_connect) == 2
+
+    # Exhausted: a third borrower waits acquire_timeout, then fails
+    started = time.monotonic()
+    with pytest.raises(PoolError):
+        pool.acquire()
+    assert time.monotonic() - started >= 0.2
+
+    pool.release(first)
+    assert pool.acquire() is first
+    assert len(fake_connect) == 2
+    assert pool.status()['in_use'] == 2
+    assert pool.status()['reused'] == 1
+
+
+def test_waiting_borrower_gets_released_connection(fake_connect):
+    pool = make_pool(fake_connect, max_size=1, acquire_timeout=5)
+    connection = pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    pool.release(connection)
+    waiter.join(2)
+    assert borrowed == [connection]
+
+
+def test_raising_max_size_from_config_unblocks_borrowers(fake_connect):
+    pool = make_pool(fake_connect, max_size=1, acquire_timeout=5)
+    pool.acquire()
+    borrowed = []
+    waiter = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.1)
+    # Values substituted from environment variables arrive as strings
+    pool.configure({'max_size': '3'})
+    waiter.join(2)
+    assert len(borrowed) == 1
+    assert pool.options['max_size'] == 3
+
+
+def test_get_pool_shares_and_updates_one_pool_per_destination(fake_connect):
+    config = {'host': 'db-shared', 'port': 3306, 'user': 'etl', 'password': 'x', 'database': 'ads'}
+    pool = get_pool(config, {'max_size': 4})
+    assert get_pool(dict(config)) is pool
+    assert pool.options['max_size'] == 4
+    assert get_pool(config, {'max_size': 20}) is pool
+    assert pool.options['max_size'] == 20
+    assert get_pool({**config, 'database': 'other'}) is not pool
+
+
+def test_release_rolls_back_open_transactions(fake_connect):
+    pool = make_pool(fake_connect)
+    connection = pool.acquire()
+    connection.in_transaction = True
+    connection.unread_result = True
+    pool.release(connection)
+    assert connection.rolled_back == 1
+    assert not connection.unread_result
+    assert pool.status()['idle'] == 1
+
+
+def test_stale_connection_is_replaced_after_failed_ping(fake_connect):
+    pool = make_pool(fake_connect, health_check_interval=0)
+    connection = pool.acquire()
+    pool.release(connection)
+    connection.healthy = False
+
+    replacement = pool.acquire()
+    assert replacement is not connection
+    assert connection.closed
+    assert pool.status()['health_check_failures'] == 1
+    assert pool.status()['open'] == 1
+
+
+def test_idle_connections_are_evicted_outside_the_lock(fake_connect):
+    pool = make_pool(fake_connect, idle_timeout=0.05)
+    connection = pool.acquire()
+    pool.release(connection)
+    time.sleep(0.1)
+
+    replacement = pool.acquire()
+    assert replacement is not connection
+    assert connection.closed
+    assert connection.closed_under_lock is False
+    assert pool.status()['evicted'] == 1
+    assert pool.status()['open'] == 1
+
+
+def test_discarded_connection_frees_its_slot(fake_connect):
+    pool = make_pool(fake_connect, max_size=1, acquire_timeout=0.1)
+    connection = pool.acquire()
+    pool.discard(connection)
+    assert connection.closed
+    assert pool.acquire() is not connection
+    assert pool.status()['open'] == 1
+
+
+def test_failed_connect_frees_its_slot(fake_connect, monkeypatch):
+    pool = make_pool(fake_connect, max_size=1, acquire_timeout=0.1)
+
+    def refuse(**config):
+        raise Error("Can't connect to MySQL server")
+
+    monkeypatch.setattr(connection_pool.mysql.connector, 'connect', refuse)
+    with pytest.raises(Error):
+        pool.acquire()
+    assert pool.status()['open'] == 0
@@ -0,0 +1,84 @@
+"""
+Test that concurrently extracted dimension tables stream to the loader with bounded memory
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd
+import pytest
+
+from src.extractors.facebook_ads_extractor import FacebookAdsExtractor
+
+CHUNKS = 20
+
+
+class MockExtractor(FacebookAdsExtractor):
+    """Extractor paging dimension tables from memory (no API)"""
+
+    def __init__(self, failing_table=None):
+        self.failing_table = failing_table
+        self.produced = {}
+        self._lock = threading.Lock()
+
+    def iter_table(self, table_config, chunk_rows=None):
+        name = table_config['name']
+        for index in range(CHUNKS):
+            if name == self.failing_table and index == 3:
+                raise RuntimeError('Service temporarily unavailable')
+            with self._lock:
+                self.produced[name] = index + 1
+            yield pd.DataFrame({'id': [index]})
+
+
+def configs(*names):
+    return [{'name': name} for name in names]
+
+
+def test_chunks_stream_through_bounded_queues():
+    extractor = MockExtractor()
+    prefetch = extractor.extract_dimensions(configs('campaigns', 'adsets', 'ads', 'insights'), max_workers=3)
+    try:
+        assert 'insights' not in prefetch
+        time.sleep(0.3)
+        # Nothing is read yet: each worker is blocked after filling its queue
+        assert max(extractor.produced.values()) <= 3
+
+        for name in ('campaigns', 'adsets', 'ads'):
+            seen = 0
+            for df in prefetch.iter_table(name):
+                seen += 1
+                # The worker never runs more than the queue size (+1 in hand) ahead
+                assert extractor.produced[name] - seen <= 3
+            assert seen == CHUNKS
+    finally:
+        prefetch.close()
+
+
+def test_failed_table_raises_to_its_reader():
+    extractor = MockExtractor(failing_table='adsets')
+    prefetch = extractor.extract_dimensions(configs('campaigns', 'adsets', 'ads'), max_workers=1)
+    try:
+        assert len(list(prefetch.iter_table('campaigns'))) == CHUNKS
+        with pytest.raises(RuntimeError, match='temporarily unavailable'):
+            list(prefetch.iter_table('adsets'))
+        assert len(list(prefetch.iter_table('ads'))) == CHUNKS
+    finally:
+        prefetch.close()
+
+
+def test_abandoned_table_frees_its_worker():
+    extractor = MockExtractor()
+    prefetch = extractor.extract_dimensions(configs('campaigns', 'ads'), max_workers=1)
+    try:
+        # A load error stops reading campaigns after one chunk
+        chunks = prefetch.iter_table('campaigns')
+        next(chunks)
+        chunks.close()
+        # ads still runs on the only worker
+        assert len(list(prefetch.iter_table('ads'))) == CHUNKS
+    finally:
+        prefetch.close()
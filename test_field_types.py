@@ -0,0 +1,66 @@
+"""
+Test the dtypes applied to extracted columns and the MySQL types they map to
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd
+
+from src.extractors.field_types import apply_field_types
+from src.loaders.mysql_loader import MySQLLoader
+
+
+def test_dimension_dtypes():
+    df = pd.DataFrame({
+        'id': ['120210000000000001', '120210000000000002'],
+        'campaign_id': ['10', '10'],
+        'adset_id': ['20', None],
+        'name': ['Ad A', 'Ad B'],
+        'status': ['ACTIVE', 'PAUSED'],
+        'created_time': ['2025-01-01T08:00:00+0000', '2025-01-02T09:30:00-0300'],
+        'tracking_specs': ['[]', '[]'],
+    })
+    out = apply_field_types(df, 'ads')
+    assert out['id'].dtype == 'int64'
+    assert out['id'].tolist() == [120210000000000001, 120210000000000002]
+    assert out['campaign_id'].dtype == 'int64'
+    # A missing value keeps the column integer (nullable), not float
+    assert out['adset_id'].dtype == 'Int64'
+    assert out['name'].dtype == 'category'
+    # Converted to UTC, without time zone
+    assert out['created_time'].tolist() == [pd.Timestamp('2025-01-01 08:00:00'), pd.Timestamp('2025-01-02 12:30:00')]
+    # Unregistered columns are untouched
+    assert out['tracking_specs'].dtype == object
+
+
+def test_all_null_integer_column_stays_integer():
+    df = pd.DataFrame({'id': ['1', '2'], 'bid_amount': [None, None], 'daily_budget': [float('nan')] * 2})
+    out = apply_field_types(df, 'adsets')
+    assert out['bid_amount'].dtype == 'Int64'
+    assert out['daily_budget'].dtype == 'Int64'
+    assert out['bid_amount'].isna().all()
+
+
+def test_unparseable_values_become_missing():
+    df = pd.DataFrame({'impressions': ['100', 'n/a'], 'spend': ['1.5', ''], 'date_start': ['2025-01-01', 'soon']})
+    out = apply_field_types(df, 'insights')
+    assert out['impressions'].dtype == 'Int64'
+    assert out['spend'].dtype == 'float64'
+    assert out['spend'].isna().tolist() == [False, True]
+    assert out['date_start'].isna().tolist() == [False, True]
+
+
+def test_fractional_ids_fall_back_to_float():
+    out = apply_field_types(pd.DataFrame({'account_id': ['1.5', '2']}), 'campaigns')
+    assert out['account_id'].dtype == 'float64'
+
+
+def test_mysql_types_of_new_tables():
+    df = apply_field_types(pd.DataFrame({
+        'id': ['1', '2'], 'spend_cap': [None, None], 'name': ['A', 'B'],
+        'updated_time': ['2025-01-01T08:00:00+0000', None],
+    }), 'campaigns')
+    schema = MySQLLoader({})._infer_schema_from_dataframe(df)
+    assert schema == {'id': 'BIGINT', 'spend_cap': 'BIGINT', 'name': 'TEXT', 'updated_time': 'DATETIME'}
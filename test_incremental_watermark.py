@@ -0,0 +1,81 @@
+"""
+Test that incremental dimension syncs move their watermark forward with the default field lists
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from src.core import StateStore
+from src.extractors import facebook_ads_extractor
+from src.orchestrator import Pipeline
+
+# Ads in the account: id -> updated_time
+ADS = {}
+
+
+class MockAccount:
+    """Ad account returning only the requested fields, like the Graph API"""
+
+    def __init__(self):
+        self.filters = []
+
+    def _records(self, fields, params):
+        self.filters.append([f for f in params.get('filtering', []) if f['field'] == 'updated_time'])
+        requested = [str(field) for field in fields]
+        for ad_id, updated_time in ADS.items():
+            record = {'id': ad_id, 'name': f"Ad {ad_id}", 'status': 'ACTIVE', 'adset_id': '20',
+                      'campaign_id': '10', 'updated_time': updated_time}
+            yield {field: value for field, value in record.items() if field in requested}
+
+    get_campaigns = get_ad_sets = get_ads = _records
+
+
+ACCOUNT = MockAccount()
+
+
+def mock_initialize_api(self):
+    self.api = None
+    self.ad_account = ACCOUNT
+
+
+class MockLoader:
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def upsert_dataframe(self, df, table_name, key_columns):
+        pass
+
+
+def run_pipeline(state_file):
+    source_config = {
+        'name': 'facebook_ads_main',
+        'type': 'facebook_ads',
+        'config': {'access_token': 'test', 'ad_account_id': 'act_1'},
+        'sync': {'incremental': True, 'state_file': str(state_file), 'tables': [{'name': 'ads'}]},
+    }
+    pipeline = Pipeline(source_config, {'name': 'mysql_main', 'type': 'mysql', 'config': {}})
+    pipeline._loader = MockLoader()
+    assert pipeline.run()['success']
+    return StateStore(str(state_file)).get(pipeline._state_key('ads'))
+
+
+def test_watermark_moves_forward(tmp_path, monkeypatch):
+    monkeypatch.setattr(facebook_ads_extractor.FacebookAdsExtractor, '_initialize_api', mock_initialize_api)
+    state_file = tmp_path / 'sync_state.json'
+
+    ADS.clear()
+    ADS.update({'100': '2025-01-01T08:00:00+0000', '101': '2025-01-02T09:30:00+0000'})
+    state = run_pipeline(state_file)
+    assert state['watermark'].startswith('2025-01-02T09:30:00')
+    assert ACCOUNT.filters[-1] == []
+
+    # Only the ad updated since the first run is new; the watermark follows it
+    ADS['102'] = '2025-01-05T12:00:00+0000'
+    state = run_pipeline(state_file)
+    assert state['watermark'].startswith('2025-01-05T12:00:00')
+    (updated_filter,) = ACCOUNT.filters[-1]
+    assert updated_filter['operator'] == 'GREATER_THAN'
@@ -0,0 +1,123 @@
+"""
+Test the local cache of settled daily insights
+"""
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+from src.extractors.facebook_ads_extractor import INSIGHTS_OPTION_DEFAULTS, FacebookAdsExtractor
+from src.extractors.insights_cache import InsightsCache
+
+FIELDS = ['date_start', 'date_stop', 'campaign_id', 'impressions']
+PARAMS = {'level': 'campaign', 'time_increment': 1,
+          'time_range': {'since': '2025-01-01', 'until': '2025-01-31'}, 'limit': 500}
+
+
+def row(day, campaign_id='10'):
+    return {'date_start': day.isoformat(), 'date_stop': day.isoformat(),
+            'campaign_id': campaign_id, 'impressions': '100'}
+
+
+def store(cache, key, day, rows):
+    with cache.writer(key) as writer:
+        for record in rows:
+            writer.add(day, record)
+        writer.commit([day])
+
+
+def test_hit_and_miss_per_day(tmp_path):
+    cache = InsightsCache(str(tmp_path))
+    key = cache.make_key('act_1', FIELDS, PARAMS)
+    store(cache, key, date(2025, 1, 1), [row(date(2025, 1, 1))])
+    store(cache, key, date(2025, 1, 2), [])
+
+    assert cache.get(key, date(2025, 1, 1)) == [row(date(2025, 1, 1))]
+    # A day without rows is cached as empty, not missing
+    assert cache.get(key, date(2025, 1, 2)) == []
+    assert cache.get(key, date(2025, 1, 3)) is None
+    assert not cache.has(key, date(2025, 1, 3))
+
+    # A new instance finds the days stored on disk
+    assert InsightsCache(str(tmp_path)).has(key, date(2025, 1, 1))
+
+
+def test_key_ignores_time_range_and_limit():
+    key = InsightsCache.make_key('act_1', FIELDS, PARAMS)
+    other_range = {**PARAMS, 'time_range': {'since': '2024-06-01', 'until': '2024-06-30'}, 'limit': 100}
+    assert InsightsCache.make_key('act_1', reversed(FIELDS), other_range) == key
+    assert InsightsCache.make_key('act_1', FIELDS, {**PARAMS, 'level': 'ad'}) != key
+    assert InsightsCache.make_key('act_1', FIELDS, {**PARAMS, 'breakdowns': ['age']}) != key
+    assert InsightsCache.make_key('act_1', FIELDS + ['reach'], PARAMS) != key
+    assert InsightsCache.make_key('act_2', FIELDS, PARAMS) != key
+
+
+def test_least_recently_used_days_are_evicted(tmp_path):
+    cache = InsightsCache(str(tmp_path))
+    key = cache.make_key('act_1', FIELDS, PARAMS)
+    days = [date(2025, 1, 1) + timedelta(days=offset) for offset in range(3)]
+    for day in days:
+        store(cache, key, day, [row(day, str(n)) for n in range(50)])
+    file_size = max(path.stat().st_size for path in tmp_path.glob('*/*.jsonl.gz'))
+
+    # Reading the first day makes the second one the least recently used
+    assert cache.get(key, days[0]) is not None
+    cache.resize((2 * file_size + file_size // 2) / (1024 * 1024))
+    assert [cache.has(key, day) for day in days] == [True, False, True]
+    assert not any(path.name.startswith(days[1].isoformat()) for path in tmp_path.glob('*/*'))
+
+
+def test_uncommitted_days_are_discarded(tmp_path):
+    cache = InsightsCache(str(tmp_path))
+    key = cache.make_key('act_1', FIELDS, PARAMS)
+    with pytest.raises(RuntimeError):
+        with cache.writer(key) as writer:
+            writer.add(date(2025, 1, 1), row(date(2025, 1, 1)))
+            writer.add(date(2025, 1, 2), row(date(2025, 1, 2)))
+            raise RuntimeError('connection dropped')
+    assert not cache.has(key, date(2025, 1, 1))
+    assert list(tmp_path.glob('*/*')) == []
+
+
+class MockExtractor(FacebookAdsExtractor):
+    """Extractor whose API calls return one row per day, failing after fail_after rows"""
+
+    def __init__(self, fail_after=None):
+        self.config = {'ad_account_id': 'act_1'}
+        self.fail_after = fail_after
+        self.fetched = []
+
+    def _iter_insights_range(self, fields, params, level, start_dt, end_dt, options):
+        day = start_dt
+        while day <= end_dt:
+            if self.fail_after is not None and len(self.fetched) >= self.fail_after:
+                raise RuntimeError('Service temporarily unavailable')
+            self.fetched.append(day)
+            yield row(day)
+            day += timedelta(days=1)
+
+
+def extract_cached(extractor, cache, start_dt, end_dt):
+    options = {**INSIGHTS_OPTION_DEFAULTS, 'cache_settling_days': 0}
+    return list(extractor._iter_insights_cached(cache, FIELDS, PARAMS, 'campaign', start_dt, end_dt, options))
+
+
+def test_partly_fetched_range_is_not_cached(tmp_path):
+    cache = InsightsCache(str(tmp_path))
+    start_dt, end_dt = date(2025, 1, 1), date(2025, 1, 5)
+    with pytest.raises(RuntimeError):
+        extract_cached(MockExtractor(fail_after=3), cache, start_dt, end_dt)
+    key = cache.make_key('act_1', FIELDS, PARAMS)
+    assert not any(cache.has(key, start_dt + timedelta(days=offset)) for offset in range(5))
+
+    # The retry fetches the whole range, then a third run is served from the cache
+    extractor = MockExtractor()
+    assert len(extract_cached(extractor, cache, start_dt, end_dt)) == 5
+    assert len(extractor.fetched) == 5
+    extractor = MockExtractor()
+    assert [record['date_start'] for record in extract_cached(extractor, cache, start_dt, end_dt)] == \
+        [(start_dt + timedelta(days=offset)).isoformat() for offset in range(5)]
+    assert extractor.fetched == []
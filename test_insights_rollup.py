@@ -0,0 +1,98 @@
+"""
+Test that rolling insights up to coarser levels keeps every requested field
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd
+
+from src.extractors.facebook_ads_extractor import FacebookAdsExtractor
+
+# List fields that are not expanded into per-action columns
+LIST_FIELDS = [
+    'action_values', 'conversions', 'conversion_values', 'outbound_clicks',
+    'video_p25_watched_actions', 'video_p50_watched_actions', 'video_p75_watched_actions',
+    'video_p100_watched_actions', 'video_thruplay_watched_actions',
+]
+FIELDS = ['impressions', 'clicks', 'spend', 'actions', 'reach'] + LIST_FIELDS
+
+
+def ad_row(ad_id, impressions, leads):
+    row = {
+        'date_start': '2025-01-01', 'date_stop': '2025-01-01', 'account_id': '1',
+        'campaign_id': '10', 'campaign_name': 'Campaign',
+        'adset_id': '20', 'adset_name': 'Adset', 'ad_id': ad_id, 'ad_name': f"Ad {ad_id}",
+        'impressions': str(impressions), 'clicks': '5', 'spend': '1.50', 'reach': str(impressions - 10),
+        'actions': [{'action_type': 'lead', 'value': str(leads)}],
+    }
+    for field in LIST_FIELDS:
+        row[field] = [{'action_type': 'offsite_conversion.fb_pixel_purchase', 'value': '2'}]
+    return row
+
+
+class MockExtractor(FacebookAdsExtractor):
+    """Extractor answering insights requests from canned rows (no API)"""
+
+    def __init__(self):
+        self.level_requests = []
+
+    def _iter_insights(self, fields, params, options=None, date_preset=None):
+        return iter([ad_row('100', 1000, 3), ad_row('101', 500, 1)])
+
+    def extract_insights(self, level, fields=None, **kwargs):
+        self.level_requests.append((level, list(fields)))
+        row = {'date_start': '2025-01-01', 'date_stop': '2025-01-01', 'campaign_id': '10', 'reach': '1400'}
+        for field in LIST_FIELDS:
+            row[field] = [{'action_type': 'offsite_conversion.fb_pixel_purchase', 'value': '4'}]
+        return self._insights_to_dataframe([row])
+
+
+def test_rollup_keeps_unexpanded_list_fields():
+    extractor = MockExtractor()
+    table_config = {
+        'name': 'insights', 'level': 'ad', 'start_date': '2025-01-01', 'end_date': '2025-01-01',
+        'fields': FIELDS, 'rollup_levels': ['campaign'],
+    }
+    tables = {}
+    for name, df, _ in extractor._iter_insights_rollup(table_config):
+        tables.setdefault(name, []).append(df)
+    campaign = pd.concat(tables['insights_campaign'], ignore_index=True)
+
+    # Unexpanded list fields are requested at the campaign level with the non-additive ones
+    (level, requested), = extractor.level_requests
+    assert level == 'campaign'
+    assert set(LIST_FIELDS) | {'reach'} <= set(requested)
+    assert not {'impressions', 'clicks', 'spend', 'actions'} & set(requested)
+
+    assert len(campaign) == 1
+    row = campaign.iloc[0]
+    assert row['impressions'] == 1500
+    assert row['action_lead'] == 4
+    assert row['spend'] == 3.0
+    assert row['reach'] == 1400
+    for field in LIST_FIELDS:
+        assert json.loads(row[field]) == [{'action_type': 'offsite_conversion.fb_pixel_purchase', 'value': '4'}], field
+
+
+def test_merge_rollup_prefers_fields_requested_per_level():
+    rolled = pd.DataFrame({
+        'date_start': ['2025-01-01'], 'date_stop': ['2025-01-01'], 'campaign_id': [10],
+        'campaign_name': ['Campaign'], 'impressions': [1500], 'video_p25_watched_actions': [float('nan')],
+    })
+    fetched = pd.DataFrame({
+        'date_start': ['2025-01-01'], 'date_stop': ['2025-01-01'], 'campaign_id': [10],
+        'video_p25_watched_actions': ['[{"action_type": "video_view", "value": "7"}]'],
+    })
+    merged = FacebookAdsExtractor._merge_rollup(rolled, fetched, 'campaign')
+    assert merged['video_p25_watched_actions'].tolist() == ['[{"action_type": "video_view", "value": "7"}]']
+    assert merged['campaign_name'].tolist() == ['Campaign']
+    assert merged['impressions'].tolist() == [1500]
+
+
+if __name__ == "__main__":
+    test_rollup_keeps_unexpanded_list_fields()
+    test_merge_rollup_prefers_fields_requested_per_level()
+    print("✅ Roll-up keeps every requested field")
@@ -0,0 +1,27 @@
+"""
+Test that the JSON codec gives the same output with and without orjson
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+from src.core import json_codec
+
+pytest.importorskip('orjson')
+
+VALUES = [
+    {'account_id': 'act_1', 'fields': ['date_start', 'impressions'], 'params': {'level': 'ad', 'limit': 500}},
+    {'campaign_name': 'Campaña de verano – 50% 🎉', 'spend': 12.5, 'reach': None, 'active': True},
+    [{'action_type': 'lead', 'value': '3'}, {'action_type': 'link_click', 'value': '12'}],
+]
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_fallback_matches_orjson(value, monkeypatch):
+    with_orjson = json_codec.json_dumps(value)
+    monkeypatch.setattr(json_codec, 'orjson', None)
+    assert json_codec.json_dumps(value) == with_orjson
+    assert json_codec.json_loads(with_orjson) == value
@@ -0,0 +1,261 @@
+"""
+Test the MySQL loader against a fake connection (no MySQL server needed)
+"""
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+from mysql.connector import Error
+
+from src.loaders.mysql_loader import MySQLLoader
+
+
+class FakeServer:
+    """Tables and statements seen by the fake connections"""
+
+    def __init__(self):
+        self.tables = {}  # name -> {'columns': {name: type}, 'indexes': set()}
+        self.statements = []  # (sql, params)
+        self.load_files = []  # lines of each LOAD DATA file
+        self.alter_errors = {}  # algorithm -> errno raised by ALTER ... ALGORITHM=<algorithm>
+        self.fail_on = None  # (statement prefix, errno)
+        self.commits = 0
+
+    def sql(self, prefix=''):
+        return [sql for sql, _ in self.statements if sql.startswith(prefix)]
+
+
+class FakeCursor:
+    def __init__(self, server):
+        self.server = server
+        self.rowcount = 0
+        self.warning_count = 0
+        self._rows = []
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        server = self.server
+        server.statements.append((sql, params))
+        if server.fail_on and sql.startswith(server.fail_on[0]):
+            raise Error(msg='Forced failure', errno=server.fail_on[1])
+
+        if sql.startswith('SHOW COLUMNS FROM'):
+            table = server.tables[re.search(r'`([^`]+)`', sql).group(1)]
+            self._rows = [(name, col_type.encode()) for name, col_type in table['columns'].items()]
+        elif sql.startswith('SHOW INDEX FROM'):
+            name = re.search(r'`([^`]+)`', sql).group(1)
+            self._rows = [(name, 0, index) for index in server.tables[name]['indexes']]
+        elif sql.startswith('CREATE TABLE IF NOT EXISTS'):
+            name = re.search(r'`([^`]+)`', sql).group(1)
+            columns = dict(re.findall(r'`([^`]+)` ([A-Z]+(?:\(\d+\))?)', sql.split('(', 1)[1]))
+            server.tables.setdefault(name, {'columns': columns, 'indexes': {'PRIMARY'}})
+        elif sql.startswith('ALTER TABLE'):
+            name = re.search(r'`([^`]+)`', sql).group(1)
+            algorithm = re.search(r'ALGORITHM=(\w+)', sql)
+            if algorithm and algorithm.group(1) in server.alter_errors:
+                raise Error(msg='Algorithm not supported', errno=server.alter_errors[algorithm.group(1)])
+            table = server.tables[name]
+            table['columns'].update(re.findall(r'ADD COLUMN `([^`]+)` ([A-Z]+(?:\(\d+\))?)', sql))
+            table['indexes'].update(re.findall(r'ADD UNIQUE KEY `([^`]+)`', sql))
+        elif sql.startswith('LOAD DATA LOCAL INFILE'):
+            with open(params[0], encoding='utf-8') as f:
+                lines = f.read().split('\n')[:-1]
+            server.load_files.append(lines)
+            self.rowcount = len(lines)
+        elif sql.startswith(('INSERT', 'REPLACE')):
+            self.rowcount = sql.count('), (') + 1
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+
+    def cursor(self):
+        return FakeCursor(self.server)
+
+    def commit(self):
+        self.server.commits += 1
+
+    def rollback(self):
+        pass
+
+    def is_connected(self):
+        return True
+
+
+@pytest.fixture
+def server():
+    return FakeServer()
+
+
+def make_loader(server, **options):
+    loader = MySQLLoader({'database': 'ads', **options})
+    loader.connection = FakeConnection(server)
+    return loader
+
+
+def campaigns(count=3):
+    return pd.DataFrame({
+        'id': np.arange(1, count + 1, dtype='int64'),
+        'name': [f"Campaign {n}" for n in range(1, count + 1)],
+        'spend': np.linspace(0.5, 10, count),
+    })
+
+
+def test_tsv_column_escapes_special_characters_and_nulls():
+    text = pd.Series(['plain', 'tab\there', 'line\nbreak', 'back\\slash', 'cr\rnul\0', None])
+    assert MySQLLoader._tsv_column(text).tolist() == [
+        'plain', 'tab\\there', 'line\\nbreak', 'back\\\\slash', 'cr\\rnul\\0', '\\N',
+    ]
+
+    ints = pd.Series([1, None, 3], dtype='Int64')
+    assert MySQLLoader._tsv_column(ints).tolist() == ['1', '\\N', '3']
+    floats = pd.Series([1.5, np.nan])
+    assert MySQLLoader._tsv_column(floats).tolist() == ['1.5', '\\N']
+    flags = pd.Series([True, False])
+    assert MySQLLoader._tsv_column(flags).tolist() == ['1', '0']
+    times = pd.Series(pd.to_datetime(['2025-01-01 08:00:00', None]))
+    assert MySQLLoader._tsv_column(times).tolist() == ['2025-01-01 08:00:00.000000', '\\N']
+    # Columns without special characters are passed through as they are
+    assert MySQLLoader._tsv_column(pd.Series(['a', 'b'])).tolist() == ['a', 'b']
+
+
+def test_bulk_upsert_merges_through_a_staging_table(server):
+    loader = make_loader(server, load_method='load_data', bulk_min_rows=1)
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+
+    stage = '_elt_stage_facebook_ads_campaigns'
+    statements = [sql for sql in server.sql() if not sql.startswith('SHOW')]
+    assert statements[-5:] == [
+        f"DROP TEMPORARY TABLE IF EXISTS `{stage}`",
+        f"CREATE TEMPORARY TABLE `{stage}` LIKE `facebook_ads_campaigns`",
+        f"LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE `{stage}` CHARACTER SET utf8mb4 "
+        r"FIELDS TERMINATED BY '\t' ESCAPED BY '\\' LINES TERMINATED BY '\n' (`id`, `name`, `spend`)",
+        "INSERT INTO `facebook_ads_campaigns` (`id`, `name`, `spend`) SELECT `id`, `name`, `spend` "
+        f"FROM `{stage}` ON DUPLICATE KEY UPDATE `name` = VALUES(`name`), `spend` = VALUES(`spend`)",
+        f"DROP TEMPORARY TABLE IF EXISTS `{stage}`",
+    ]
+    assert server.load_files == [['1\tCampaign 1\t0.5', '2\tCampaign 2\t5.25', '3\tCampaign 3\t10.0']]
+
+
+def test_bulk_upsert_of_key_columns_only_skips_duplicates(server):
+    loader = make_loader(server, load_method='load_data', bulk_min_rows=1)
+    loader.upsert_dataframe(campaigns()[['id']], 'facebook_ads_campaigns', ['id'])
+    assert server.sql('INSERT IGNORE INTO `facebook_ads_campaigns` (`id`) SELECT `id` FROM')
+
+
+def test_refused_local_infile_falls_back_to_insert(server):
+    loader = make_loader(server, load_method='load_data', bulk_min_rows=1)
+    server.fail_on = ('LOAD DATA', 3948)
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    assert not loader._bulk_load_enabled
+    (insert,) = server.sql('INSERT INTO')
+    assert insert.endswith('ON DUPLICATE KEY UPDATE `name` = VALUES(`name`), `spend` = VALUES(`spend`)')
+    assert server.sql('DROP TEMPORARY TABLE')[-1].startswith('DROP TEMPORARY TABLE IF EXISTS `_elt_stage_')
+
+
+def test_insert_batches_split_by_rows(server):
+    loader = make_loader(server, batch_rows=3, batch_bytes=0, commit_every=2)
+    df = loader._clean_dataframe(campaigns(10))
+    server.tables['t'] = {'columns': {}, 'indexes': set()}
+    loader._insert_batches(df, 't')
+
+    inserts = [(sql, params) for sql, params in server.statements if sql.startswith('INSERT')]
+    assert [len(params) // 3 for _, params in inserts] == [3, 3, 3, 1]
+    assert inserts[0][1][:3] == [1, 'Campaign 1', 0.5]
+    # One commit every 2 batches, plus the final one
+    assert server.commits == 3
+
+
+def test_insert_batches_split_by_bytes(server):
+    loader = make_loader(server, batch_rows=1000, batch_bytes=200)
+    df = loader._clean_dataframe(pd.DataFrame({'id': range(20), 'name': ['x' * 40] * 20}))
+    # About 50 bytes per row: 4 rows fit in 200 bytes
+    assert loader._batch_size(df) == 4
+    loader._insert_batches(df, 't', update_columns=[])
+    inserts = server.sql('INSERT IGNORE INTO `t`')
+    assert len(inserts) == 5
+
+
+def test_schema_is_read_once_and_kept_up_to_date_by_ddl(server):
+    loader = make_loader(server)
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    assert len(server.sql('SHOW COLUMNS')) == 1
+    assert 'uk_id' in loader._schema_cache['facebook_ads_campaigns']['indexes']
+
+    # A new column is added with one ALTER and recorded without reading the schema again
+    df = campaigns().assign(objective=['OUTCOME_LEADS'] * 3)
+    loader.upsert_dataframe(df, 'facebook_ads_campaigns', ['id'])
+    assert len(server.sql('SHOW COLUMNS')) == 1
+    assert server.sql('ALTER TABLE `facebook_ads_campaigns` ADD COLUMN `objective` TEXT, ALGORITHM=INSTANT')
+    assert loader._schema_cache['facebook_ads_campaigns']['columns']['objective'] == 'TEXT'
+
+
+def test_schema_cache_is_dropped_after_a_load_error(server):
+    loader = make_loader(server)
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    server.fail_on = ('INSERT', 1054)
+    with pytest.raises(Error):
+        loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    assert 'facebook_ads_campaigns' not in loader._schema_cache
+
+    server.fail_on = None
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    assert len(server.sql('SHOW COLUMNS')) == 2
+
+
+def test_schema_cache_is_dropped_after_a_failed_ddl(server):
+    loader = make_loader(server)
+    loader.upsert_dataframe(campaigns(), 'facebook_ads_campaigns', ['id'])
+    server.fail_on = ('ALTER TABLE', 1118)
+    loader.upsert_dataframe(campaigns().assign(objective=['OUTCOME_LEADS'] * 3), 'facebook_ads_campaigns', ['id'])
+    # The one-by-one retry failed too, so the real columns were read again
+    assert len(server.sql('SHOW COLUMNS')) == 2
+    assert 'objective' not in loader._schema_cache['facebook_ads_campaigns']['columns']
+
+
+def test_alter_falls_back_from_instant_to_inplace_to_copy(server):
+    loader = make_loader(server)
+    server.tables['t'] = {'columns': {'id': 'BIGINT'}, 'indexes': set()}
+    cursor = loader.connection.cursor()
+
+    server.alter_errors = {'INSTANT': 1846}
+    assert loader._alter_table(cursor, 't', 'ADD COLUMN `a` TEXT') == 'INPLACE'
+    server.alter_errors = {'INSTANT': 4092, 'INPLACE': 1846}
+    assert loader._alter_table(cursor, 't', 'ADD COLUMN `b` TEXT') == 'COPY'
+    assert [sql.rsplit('=', 1)[1] for sql in server.sql('ALTER')] == ['INSTANT', 'INPLACE', 'INSTANT', 'INPLACE', 'COPY']
+    assert server.tables['t']['columns'] == {'id': 'BIGINT', 'a': 'TEXT', 'b': 'TEXT'}
+
+
+def test_unknown_algorithm_is_not_tried_again(server):
+    loader = make_loader(server)
+    server.tables['t'] = {'columns': {}, 'indexes': set()}
+    cursor = loader.connection.cursor()
+
+    # MySQL 5.7 doesn't know ALGORITHM=INSTANT
+    server.alter_errors = {'INSTANT': 1800}
+    assert loader._alter_table(cursor, 't', 'ADD COLUMN `a` TEXT') == 'INPLACE'
+    server.statements.clear()
+    assert loader._alter_table(cursor, 't', 'ADD COLUMN `b` TEXT') == 'INPLACE'
+    assert server.sql() == ['ALTER TABLE `t` ADD COLUMN `b` TEXT, ALGORITHM=INPLACE']
+
+
+def test_alter_errors_unrelated_to_the_algorithm_are_raised(server):
+    loader = make_loader(server)
+    server.tables['t'] = {'columns': {}, 'indexes': set()}
+    server.fail_on = ('ALTER TABLE', 1060)  # Duplicate column name
+    with pytest.raises(Error):
+        loader._alter_table(loader.connection.cursor(), 't', 'ADD COLUMN `a` TEXT')
+    assert len(server.sql('ALTER')) == 1
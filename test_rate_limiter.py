@@ -0,0 +1,134 @@
+"""
+Test the adaptive rate limiter with fake Graph API usage headers
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+from src.extractors.rate_limiter import RateLimiter, account_id_from_path
+
+
+def business_usage(call_count, cputime=0, regain_minutes=0):
+    return json.dumps({'1234': [{
+        'type': 'ads_insights', 'call_count': call_count, 'total_cputime': cputime,
+        'total_time': 0, 'estimated_time_to_regain_access': regain_minutes,
+    }]})
+
+
+def account_usage(util_pct, reset_seconds=0):
+    return json.dumps({'acc_id_util_pct': util_pct, 'reset_time_duration': reset_seconds})
+
+
+@pytest.mark.parametrize('path, expected', [
+    (('act_123', 'insights'), 'act_123'),
+    (('1234567',), None),
+    ('https://graph.facebook.com/v19.0/act_123/insights?after=abc', 'act_123'),
+    ('act_123/ads', 'act_123'),
+    ('https://graph.facebook.com/v19.0/998877/insights', None),
+    (None, None),
+])
+def test_account_id_from_path(path, expected):
+    assert account_id_from_path(path) == expected
+
+
+def test_business_use_case_usage_takes_the_highest_metric():
+    limiter = RateLimiter()
+    limiter.update_from_headers({'X-Business-Use-Case-Usage': business_usage(call_count=10, cputime=42)})
+    assert limiter.usage_pct() == 42
+
+
+def test_ad_account_usage_is_tracked_per_account():
+    limiter = RateLimiter()
+    limiter.update_from_headers({'x-ad-account-usage': account_usage(90)}, 'act_1')
+    limiter.update_from_headers({'x-ad-account-usage': account_usage(20)}, 'act_2')
+    # A quiet account doesn't overwrite the reading of a busy one
+    assert limiter.usage_pct() == 90
+    limiter.update_from_headers({'x-ad-account-usage': account_usage(30)}, 'act_1')
+    assert limiter.usage_pct() == 30
+
+
+def test_unparseable_headers_are_ignored():
+    limiter = RateLimiter()
+    limiter.update_from_headers({'x-app-usage': 'not json', 'content-type': 'application/json'})
+    limiter.update_from_headers(None)
+    assert limiter.usage_pct() == 0
+
+
+def test_readings_expire_after_usage_ttl():
+    limiter = RateLimiter(usage_ttl=0.05)
+    limiter.update_from_headers({'x-app-usage': json.dumps({'call_count': 99})})
+    assert limiter.allowed_concurrency() == 1
+    time.sleep(0.1)
+    assert limiter.allowed_concurrency() == limiter.options['max_concurrency']
+
+
+@pytest.mark.parametrize('usage, expected', [(0, 8), (75, 8), (80, 6), (85, 4), (94, 1), (95, 1), (100, 1)])
+def test_concurrency_shrinks_between_thresholds(usage, expected):
+    limiter = RateLimiter(max_concurrency=8, slow_down_pct=75, stop_pct=95)
+    limiter.update_from_headers({'x-app-usage': json.dumps({'call_count': usage})})
+    assert limiter.allowed_concurrency() == expected
+
+
+def test_time_to_regain_access_blocks_new_calls():
+    limiter = RateLimiter()
+    limiter.update_from_headers({'x-ad-account-usage': account_usage(100, reset_seconds=0.2)}, 'act_1')
+    started = time.monotonic()
+    with limiter.slot():
+        pass
+    assert time.monotonic() - started >= 0.2
+
+
+def test_slot_limits_calls_in_flight():
+    limiter = RateLimiter(max_concurrency=3)
+    lock = threading.Lock()
+    state = {'in_flight': 0, 'peak': 0}
+
+    def call():
+        with limiter.slot():
+            with lock:
+                state['in_flight'] += 1
+                state['peak'] = max(state['peak'], state['in_flight'])
+            time.sleep(0.05)
+            with lock:
+                state['in_flight'] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert state['peak'] == 3
+
+
+def test_high_usage_serializes_calls_and_released_slots_wake_waiters():
+    limiter = RateLimiter(max_concurrency=4)
+    limiter.update_from_headers({'x-business-use-case-usage': business_usage(call_count=97)})
+    entered = []
+
+    def call():
+        with limiter.slot():
+            entered.append(True)
+
+    with limiter.slot():
+        waiter = threading.Thread(target=call)
+        waiter.start()
+        time.sleep(0.1)
+        # Usage above stop_pct: a second call waits for the first to finish
+        assert entered == []
+    waiter.join(2)
+    assert entered == [True]
+
+
+def test_pause_blocks_every_caller():
+    limiter = RateLimiter()
+    limiter.pause(0.2)
+    started = time.monotonic()
+    with limiter.slot():
+        pass
+    assert time.monotonic() - started >= 0.2
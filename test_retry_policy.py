@@ -0,0 +1,112 @@
+"""
+Test error classification and retries of Graph API calls (no API calls are made)
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+import requests
+from facebook_business.api import FacebookAdsApi
+from facebook_business.exceptions import FacebookRequestError
+
+from src.extractors import retry_policy as retry_module
+from src.extractors.retry_policy import RetryPolicy, ThrottledFacebookAdsApi, classify_error
+
+
+def api_error(code, message='Error', http_status=400, is_transient=False):
+    body = json.dumps({'error': {'code': code, 'message': message, 'is_transient': is_transient}})
+    return FacebookRequestError(message, {'method': 'GET', 'path': '/act_1/insights'}, http_status, {}, body)
+
+
+class MockResponse:
+    def headers(self):
+        return {}
+
+
+@pytest.mark.parametrize('error, expected', [
+    (api_error(17, 'User request limit reached'), 'throttling'),
+    (api_error(80000, 'Too many calls to this ad account'), 'throttling'),
+    (api_error(1, 'Please reduce the amount of data you are asking for'), 'reduce_data'),
+    (api_error(2, 'Service temporarily unavailable'), 'transient'),
+    (api_error(1, 'An unknown error occurred'), 'transient'),
+    (api_error(100, 'Internal error', http_status=500), 'transient'),
+    (api_error(100, 'Retry later', is_transient=True), 'transient'),
+    (api_error(100, 'Invalid parameter'), None),
+    (api_error(190, 'Invalid OAuth access token'), None),
+    (requests.ConnectionError('Connection reset by peer'), 'transient'),
+    (requests.Timeout('Read timed out'), 'transient'),
+    (ValueError('bad value'), None),
+])
+def test_classify_error(error, expected):
+    assert classify_error(error) == expected
+
+
+def test_backoff_grows_with_jitter_up_to_the_cap():
+    policy = RetryPolicy({'transient': {'backoff_base': 1.0, 'backoff_max': 5}})
+    for attempt, ceiling in [(0, 1), (1, 2), (2, 4), (3, 5), (10, 5)]:
+        for _ in range(20):
+            assert ceiling / 2 <= policy.backoff('transient', attempt) <= ceiling
+    assert policy.should_retry('transient', 2)
+    assert not policy.should_retry('transient', 3)
+    assert not policy.should_retry('reduce_data', 0)
+    assert not policy.should_retry(None, 0)
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """API whose underlying calls fail with the queued errors, recording the delays slept"""
+    failures = []
+    calls, sleeps, pauses = [], [], []
+
+    def call(self, method, path, **kwargs):
+        calls.append(method)
+        if failures:
+            raise failures.pop(0)
+        return MockResponse()
+
+    monkeypatch.setattr(FacebookAdsApi, 'call', call)
+    monkeypatch.setattr(retry_module.time, 'sleep', sleeps.append)
+    monkeypatch.setattr(retry_module.rate_limiter, 'pause', pauses.append)
+    monkeypatch.setattr(retry_module, 'retry_policy', RetryPolicy())
+    api = ThrottledFacebookAdsApi(None)
+    api.failures, api.calls, api.sleeps, api.pauses = failures, calls, sleeps, pauses
+    return api
+
+
+def test_transient_get_is_retried(api):
+    api.failures.extend([api_error(2, 'Service temporarily unavailable', http_status=503),
+                         requests.ConnectionError('Connection reset by peer')])
+    assert isinstance(api.call('GET', ('act_1', 'insights')), MockResponse)
+    assert api.calls == ['GET'] * 3
+    assert len(api.sleeps) == 2
+    assert 0.5 <= api.sleeps[0] <= 1 and 1 <= api.sleeps[1] <= 2
+
+
+def test_transient_post_is_not_retried(api):
+    # A 5xx may come after the report run was created; a retry would start a second one
+    api.failures.append(api_error(2, 'Service temporarily unavailable', http_status=503))
+    with pytest.raises(FacebookRequestError):
+        api.call('POST', ('act_1', 'insights'))
+    api.failures.append(requests.Timeout('Read timed out'))
+    with pytest.raises(requests.Timeout):
+        api.call('POST', ('act_1', 'insights'))
+    assert api.calls == ['POST', 'POST']
+    assert api.sleeps == []
+
+
+def test_throttled_post_is_retried_after_a_pause(api):
+    api.failures.append(api_error(17, 'User request limit reached'))
+    assert isinstance(api.call('POST', ('act_1', 'insights')), MockResponse)
+    assert api.calls == ['POST', 'POST']
+    assert len(api.pauses) == 1 and api.sleeps == []
+
+
+def test_retries_stop_at_max_retries(api):
+    api.failures.extend([api_error(1, 'An unknown error occurred')] * 10)
+    with pytest.raises(FacebookRequestError):
+        api.call('GET', ('act_1', 'insights'))
+    assert len(api.calls) == 4
+    assert len(api.sleeps) == 3